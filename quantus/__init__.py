@@ -8,7 +8,7 @@
 __version__ = "0.4.3"
 
 # Expose quantus.evaluate to the user.
-from quantus.evaluation import evaluate
+from quantus.evaluation import evaluate, evaluate_stream
 
 # Expose quantus.explain to the user.
 from quantus.functions.explanation_func import explain
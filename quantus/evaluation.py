@@ -5,8 +5,10 @@
 # Quantus is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
 # You should have received a copy of the GNU Lesser General Public License along with Quantus. If not, see <https://www.gnu.org/licenses/>.
 # Quantus project URL: <https://github.com/understandable-machine-intelligence-lab/Quantus>.
+import os
+import re
 import warnings
-from typing import Union, Callable, Dict, Optional, List
+from typing import Any, Union, Callable, Dict, Iterable, Optional, List
 
 import numpy as np
 
@@ -28,6 +30,7 @@ def evaluate(
     progress: bool = False,
     explain_func_kwargs: Optional[dict] = None,
     call_kwargs: Union[Dict, Dict[str, Dict]] = None,
+    checkpoint_dir: Optional[str] = None,
     **kwargs,
 ) -> Optional[dict]:
     """
@@ -60,6 +63,12 @@ def evaluate(
         Keyword arguments to be passed to explain_func on call. Pass None if using Dict[str, Dict] type for xai_methods.
     call_kwargs: Dict[str, Dict]
         Keyword arguments for the call of the metrics, keys are names for arg set and values are argument dictionaries.
+    checkpoint_dir: string, optional
+        A directory to which each evaluation, i.e., each combination of explanation method, metric and call
+        parameters, saves a checkpoint once it is completed, see Metric.evaluate_stream. On a repeated call,
+        completed evaluations are skipped. Each evaluation is one call of the metric on the whole x_batch,
+        so the scores equal those without checkpoints. To resume within an evaluation, use evaluate_stream.
+        If None, no checkpoints are saved, default=None.
     kwargs: optional
         Deprecated keyword arguments for the call of the metrics.
     Returns
@@ -159,21 +168,192 @@ def evaluate(
                         f"Evaluating {method} explanations on {metric} metric on set of call parameters {call_kwarg_str}..."
                     )
 
-                results[method][metric][call_kwarg_str] = agg_func(
-                    metric_func(
-                        model=model,
+                metric_kwargs = {
+                    "model": model,
+                    "explain_func": explain_funcs[method],
+                    "explain_func_kwargs": {
+                        **explain_func_kwargs,
+                        **{"method": method},
+                    },
+                    **call_kwarg,
+                    **kwargs,
+                }
+
+                if checkpoint_dir is None:
+                    scores = metric_func(
                         x_batch=x_batch,
                         y_batch=y_batch,
                         a_batch=a_batch,
                         s_batch=s_batch,
-                        explain_func=explain_funcs[method],
-                        explain_func_kwargs={
-                            **explain_func_kwargs,
-                            **{"method": method},
+                        **metric_kwargs,
+                    )
+                else:
+                    scores = metric_func.evaluate_stream(
+                        data={
+                            "x_batch": x_batch,
+                            "y_batch": y_batch,
+                            "a_batch": a_batch,
+                            "s_batch": s_batch,
                         },
+                        # One chunk, such that the scores equal those of the call without checkpoints.
+                        chunk_size=len(x_batch),
+                        checkpoint_path=_get_checkpoint_path(
+                            checkpoint_dir, method, metric, call_kwarg_str
+                        ),
+                        **metric_kwargs,
+                    )
+
+                results[method][metric][call_kwarg_str] = agg_func(scores)
+
+    return results
+
+
+def evaluate_stream(
+    metrics: Dict,
+    xai_methods: Union[Dict[str, Callable], Dict[str, Dict], Dict[str, np.ndarray]],
+    model: ModelInterface,
+    data: Union[Dict[str, Any], Iterable[Any]],
+    chunk_size: int = 256,
+    agg_func: Callable = lambda x: x,
+    progress: bool = False,
+    explain_func_kwargs: Optional[dict] = None,
+    call_kwargs: Union[Dict, Dict[str, Dict]] = None,
+    checkpoint_dir: Optional[str] = None,
+) -> Optional[dict]:
+    """
+    A method to evaluate some explanation methods given some metrics, on a data set that is streamed chunk
+    by chunk instead of being held in memory as a whole. See Metric.evaluate_stream.
+
+    Parameters
+    ----------
+    metrics: dict
+        A dictionary with intialised metrics.
+    xai_methods: dict, list
+        Pass the different explanation methods as:
+        1) Dict[str, np.ndarray] where values are pre-calculcated attributions (e.g., np.memmap) of the whole
+        data set, or
+        2) Dict[str, Dict] where the keys are the name of the Quantus build-in explanation methods,
+        and the values are the explain function keyword arguments as a dictionary, or
+        3) Dict[str, Callable] where the keys are the name of explanation methods,
+        and the values a callable explanation function.
+        Explanations of methods 2) and 3) are generated chunk by chunk.
+    model: torch.nn.Module, tf.keras.Model
+        A torch or tensorflow model e.g., torchvision.models that is subject to explanation.
+    data: dict, iterable
+        The data set, see utils.iterate_batches: a dictionary of arrays, np.memmap or .npy paths with the
+        keys "x_batch", "y_batch" and optionally "s_batch", or an iterable of batches that can be iterated
+        over repeatedly, e.g., a torch DataLoader or a tf.data.Dataset.
+    chunk_size: integer
+        The number of instances per chunk when slicing arrays, default=256.
+    agg_func: callable
+        Indicates how to aggregates scores e.g., pass np.mean.
+    progress: boolean
+        Indicates if progress should be printed to std, or not.
+    explain_func_kwargs: dict, optional
+        Keyword arguments to be passed to explain_func on call. Pass None if using Dict[str, Dict] type for xai_methods.
+    call_kwargs: Dict[str, Dict]
+        Keyword arguments for the call of the metrics, keys are names for arg set and values are argument dictionaries.
+    checkpoint_dir: string, optional
+        A directory to which each evaluation saves a checkpoint, see Metric.evaluate_stream. On a repeated
+        call, completed evaluations are skipped and interrupted ones resume. If None, no checkpoints are
+        saved, default=None.
+
+    Returns
+    -------
+    results: dict
+        A dictionary with the results.
+    """
+    if not isinstance(data, dict) and iter(data) is data:
+        raise TypeError(
+            "The data set is iterated over once per explanation method and metric, pass a data set that "
+            "can be iterated over repeatedly (e.g., a DataLoader or a list) instead of an iterator."
+        )
+
+    if call_kwargs is None:
+        call_kwargs = {"call_kwargs_empty": {}}
+    elif not isinstance(call_kwargs, Dict):
+        raise TypeError("xai_methods type is not Dict[str, Dict].")
+
+    results: Dict[str, dict] = {}
+
+    for method, value in xai_methods.items():
+
+        results[method] = {}
+        a_batch = None
+
+        if callable(value):
+            asserts.assert_explain_func(explain_func=value)
+            explain_func = value
+            method_kwargs = {**(explain_func_kwargs or {}), **{"method": method}}
+
+        elif isinstance(value, Dict):
+            explain_func = explain
+            method_kwargs = value
+
+        elif isinstance(value, np.ndarray):
+            explain_func = explain
+            method_kwargs = {**(explain_func_kwargs or {}), **{"method": method}}
+            a_batch = value
+
+        else:
+            raise TypeError(
+                "xai_methods type is not in: Dict[str, Callable], Dict[str, Dict], Dict[str, np.ndarray]."
+            )
+
+        for (metric, metric_func) in metrics.items():
+
+            results[method][metric] = {}
+
+            for (call_kwarg_str, call_kwarg) in call_kwargs.items():
+
+                if progress:
+                    print(
+                        f"Evaluating {method} explanations on {metric} metric on set of call parameters {call_kwarg_str}..."
+                    )
+
+                results[method][metric][call_kwarg_str] = agg_func(
+                    metric_func.evaluate_stream(
+                        model=model,
+                        data=utils.iterate_batches(
+                            data=data, chunk_size=chunk_size, a_batch=a_batch
+                        ),
+                        explain_func=explain_func,
+                        explain_func_kwargs=method_kwargs,
+                        checkpoint_path=None
+                        if checkpoint_dir is None
+                        else _get_checkpoint_path(
+                            checkpoint_dir, method, metric, call_kwarg_str
+                        ),
                         **call_kwarg,
-                        **kwargs,
                     )
                 )
 
     return results
+
+
+def _get_checkpoint_path(
+    checkpoint_dir: str, method: str, metric: str, call_kwarg_str: str
+) -> str:
+    """
+    Get the checkpoint file of the evaluation of an explanation method on a metric with a set of call
+    parameters, and create the checkpoint directory if needed.
+
+    Parameters
+    ----------
+    checkpoint_dir: string
+        The checkpoint directory.
+    method: string
+        The name of the explanation method.
+    metric: string
+        The name of the metric.
+    call_kwarg_str: string
+        The name of the set of call parameters.
+
+    Returns
+    -------
+    string
+        The checkpoint file.
+    """
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    name = re.sub(r"[^\w.-]", "_", f"{method}-{metric}-{call_kwarg_str}")
+    return os.path.join(checkpoint_dir, f"{name}.pkl")
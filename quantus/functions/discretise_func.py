@@ -94,3 +94,114 @@ def rank(a: np.array, **kwargs) -> float:
     """
     discretized_arr = np.argsort(a)[::-1]
     return hash(bytes(discretized_arr))
+
+
+def _hash_rows(discretized_arr: np.ndarray) -> np.ndarray:
+    """
+    Hashes each row of a discretised batch, as the single-array functions hash their result.
+
+    Parameters
+    ----------
+    discretized_arr: np.ndarray
+         Numpy array with shape (batch, x).
+
+    Returns
+    -------
+    np.ndarray
+        Returns the hash value of each row.
+    """
+    return np.array([hash(row.tobytes()) for row in discretized_arr])
+
+
+def batch_floating_points(a: np.array, **kwargs) -> np.ndarray:
+    """
+    Rounds each array of a batch to have n floating-points representation.
+
+    Parameters
+    ----------
+    a: np.ndarray
+         Numpy array with shape (batch, x).
+    kwargs: optional
+            Keyword arguments.
+        n: integer
+        Number of floating point digits.
+
+    Returns
+    -------
+    np.ndarray
+        Returns the hash value of each resulting array, equal to those of floating_points.
+    """
+    n = kwargs.get("n", 2)
+    discretized_arr = a.round(decimals=n)
+    return _hash_rows(discretized_arr)
+
+
+def batch_sign(a: np.array, **kwargs) -> np.ndarray:
+    """
+    Calculates element-wise signs of each array of a batch.
+
+    Parameters
+    ----------
+    a: np.ndarray
+         Numpy array with shape (batch, x).
+    kwargs: optional
+            Keyword arguments.
+
+    Returns
+    -------
+    np.ndarray
+        Returns the hash value of each resulting array, equal to those of sign.
+    """
+    discretized_arr = np.sign(a)
+    return _hash_rows(discretized_arr)
+
+
+def batch_top_n_sign(a: np.array, **kwargs) -> np.ndarray:
+    """
+    Calculates top n element-wise signs of each array of a batch.
+
+    Parameters
+    ----------
+    a: np.ndarray
+         Numpy array with shape (batch, x).
+    kwargs: optional
+            Keyword arguments.
+        n: integer
+        Number of floating point digits.
+
+    Returns
+    -------
+    np.ndarray
+        Returns the hash value of each resulting array, equal to those of top_n_sign.
+    """
+    n = kwargs.get("n", 5)
+    discretized_arr = np.sign(a[:, :n])
+    return _hash_rows(discretized_arr)
+
+
+def batch_rank(a: np.array, **kwargs) -> np.ndarray:
+    """
+    Calculates indices that would sort each array of a batch in order of importance.
+
+    Parameters
+    ----------
+    a: np.ndarray
+         Numpy array with shape (batch, x).
+    kwargs: optional
+            Keyword arguments.
+
+    Returns
+    -------
+    np.ndarray
+        Returns the hash value of each resulting array, equal to those of rank.
+    """
+    discretized_arr = np.argsort(a, axis=1)[:, ::-1]
+    return _hash_rows(discretized_arr)
+
+
+BATCH_DISCRETISE_FUNCS = {
+    floating_points: batch_floating_points,
+    sign: batch_sign,
+    top_n_sign: batch_top_n_sign,
+    rank: batch_rank,
+}
@@ -8,13 +8,16 @@
 
 
 import copy
+import hashlib
 import random
+import threading
 import warnings
+from collections import OrderedDict
 from typing import Any, Callable, Sequence, Tuple, Union, Optional
 import cv2
 import numpy as np
-from scipy.sparse import lil_matrix, csc_matrix
-from scipy.sparse.linalg import spsolve
+from scipy.sparse import coo_matrix, csc_matrix
+from scipy.sparse.linalg import SuperLU, spsolve, splu
 
 from quantus.helpers.utils import (
     get_baseline_value,
@@ -450,6 +453,238 @@ def translation_y_direction(
     return arr_perturbed
 
 
+# Neighbour offsets and weights of the noisy linear imputation.
+_NOISY_LINEAR_IMPUTATION_OFFSET_WEIGHTS = [
+    ((1, 1), 1 / 12),
+    ((0, 1), 1 / 6),
+    ((-1, 1), 1 / 12),
+    ((1, -1), 1 / 12),
+    ((0, -1), 1 / 6),
+    ((-1, -1), 1 / 12),
+    ((1, 0), 1 / 6),
+    ((-1, 0), 1 / 6),
+]
+
+# Cache of factorised noisy linear imputation systems, keyed by image shape and index set. It holds at
+# most NOISY_LINEAR_IMPUTATION_CACHE_SIZE factorisations of NOISY_LINEAR_IMPUTATION_CACHE_BYTES bytes
+# in total, least recently used first out. Setting either limit to 0 disables the cache. The lock guards
+# the cache against concurrent lookups and evictions of thread workers.
+_NOISY_LINEAR_IMPUTATION_CACHE: OrderedDict = OrderedDict()
+_NOISY_LINEAR_IMPUTATION_CACHE_LOCK = threading.Lock()
+NOISY_LINEAR_IMPUTATION_CACHE_SIZE = 8
+NOISY_LINEAR_IMPUTATION_CACHE_BYTES = 256 * 2**20
+
+
+def _noisy_linear_imputation_indices(
+    indices: Union[Sequence[int], Tuple[np.array]], img_shape: Tuple[int, ...]
+) -> np.ndarray:
+    """
+    Return the flat (height x width) indices of the variables of the noisy linear imputation.
+
+    Parameters
+    ----------
+    indices: sequence, tuple
+        Flat (height x width) indices, or a tuple of (row, column) index arrays.
+    img_shape: tuple
+        Image shape in (channels, height, width) format.
+
+    Returns
+    -------
+    np.ndarray
+        The flat indices.
+    """
+    if isinstance(indices, tuple) and len(indices) > 0 and np.ndim(indices[0]) > 0:
+        return np.ravel_multi_index(indices, img_shape[-2:])
+    return np.asarray(indices)
+
+
+def _noisy_linear_imputation_lhs(
+    indices: np.ndarray, img_shape: Tuple[int, ...]
+) -> csc_matrix:
+    """
+    Assemble the left-hand side of the noisy linear imputation equation system, where each of the
+    given indices is a variable that equals the weighted mean of its neighbours.
+        Adapted from: https://github.com/tleemann/road_evaluation.
+
+    Parameters
+    ----------
+    indices: np.ndarray
+        Flat (height x width) indices of the variables.
+    img_shape: tuple
+        Image shape in (channels, height, width) format.
+
+    Returns
+    -------
+    csc_matrix
+        The (len(indices), len(indices)) sparse matrix.
+    """
+    nr_variables = len(indices)
+
+    ind_to_var_ids = np.full(img_shape[1] * img_shape[2], -1, dtype=int)
+    ind_to_var_ids[indices] = np.arange(nr_variables)
+
+    sum_neighbors = np.ones(nr_variables)
+    rows, cols, weights = [np.arange(nr_variables)], [np.arange(nr_variables)], []
+
+    for offset, weight in _NOISY_LINEAR_IMPUTATION_OFFSET_WEIGHTS:
+        off_coords, valid = offset_coordinates(indices, offset, img_shape)
+        valid_ids = np.flatnonzero(valid)
+
+        # Add weights of neighbours that are variables themselves.
+        variable_ids = ind_to_var_ids[off_coords]
+        is_variable = variable_ids >= 0
+        rows.append(valid_ids[is_variable])
+        cols.append(variable_ids[is_variable])
+        weights.append(np.full(np.count_nonzero(is_variable), weight))
+
+        # Reduce weight for invalid coordinates.
+        sum_neighbors[~valid] -= weight
+
+    weights.insert(0, -sum_neighbors)
+
+    return coo_matrix(
+        (np.concatenate(weights), (np.concatenate(rows), np.concatenate(cols))),
+        shape=(nr_variables, nr_variables),
+    ).tocsc()
+
+
+def _noisy_linear_imputation_rhs(arr: np.array, indices: np.ndarray) -> np.array:
+    """
+    Assemble the right-hand side of the noisy linear imputation equation system, i.e., the
+    weighted values of the neighbours that are not imputed, for every channel of arr.
+
+    Parameters
+    ----------
+    arr: np.ndarray
+         Array to be perturbed, in (channels, height, width) format.
+    indices: np.ndarray
+        Flat (height x width) indices of the variables.
+
+    Returns
+    -------
+    np.ndarray
+        The (len(indices), channels) right-hand side.
+    """
+    arr_flat = arr.reshape((arr.shape[0], -1))
+
+    is_variable = np.zeros(arr_flat.shape[1], dtype=bool)
+    is_variable[indices] = True
+
+    b = np.zeros((len(indices), arr.shape[0]))
+
+    for offset, weight in _NOISY_LINEAR_IMPUTATION_OFFSET_WEIGHTS:
+        off_coords, valid = offset_coordinates(indices, offset, arr.shape)
+        valid_ids = np.flatnonzero(valid)
+
+        # Add weighted values of known neighbours.
+        is_known = ~is_variable[off_coords]
+        b[valid_ids[is_known], :] -= weight * arr_flat[:, off_coords[is_known]].T
+
+    return b
+
+
+def _superlu_nbytes(lu: SuperLU) -> int:
+    """Return the number of bytes of the sparse L and U factors of a factorisation."""
+    return sum(
+        factor.data.nbytes + factor.indices.nbytes + factor.indptr.nbytes
+        for factor in (lu.L, lu.U)
+    )
+
+
+def _noisy_linear_imputation_factorisation(
+    indices: np.ndarray,
+    img_shape: Tuple[int, ...],
+    lhs: Optional[Callable[[], csc_matrix]] = None,
+) -> Optional[SuperLU]:
+    """
+    Return the LU factorisation of the noisy linear imputation system of the given index set,
+    reusing a cached factorisation of the same image shape and (ordered) index set if available.
+
+    Parameters
+    ----------
+    indices: np.ndarray
+        Flat (height x width) indices of the variables.
+    img_shape: tuple
+        Image shape in (channels, height, width) format.
+    lhs: callable, optional
+        Returns the left-hand side matrix if it needs to be factorised, by default it is assembled.
+
+    Returns
+    -------
+    SuperLU, None
+        The factorisation, or None if the system is singular.
+    """
+    key = (
+        tuple(img_shape[1:]),
+        hashlib.sha1(np.ascontiguousarray(indices, dtype=np.int64)).hexdigest(),
+    )
+    with _NOISY_LINEAR_IMPUTATION_CACHE_LOCK:
+        if key in _NOISY_LINEAR_IMPUTATION_CACHE:
+            _NOISY_LINEAR_IMPUTATION_CACHE.move_to_end(key)
+            return _NOISY_LINEAR_IMPUTATION_CACHE[key][0]
+
+    a = lhs() if lhs is not None else _noisy_linear_imputation_lhs(indices, img_shape)
+    try:
+        lu = splu(a)
+    except RuntimeError:
+        return None
+
+    nbytes = _superlu_nbytes(lu)
+    if (
+        NOISY_LINEAR_IMPUTATION_CACHE_SIZE <= 0
+        or nbytes > NOISY_LINEAR_IMPUTATION_CACHE_BYTES
+    ):
+        return lu
+
+    with _NOISY_LINEAR_IMPUTATION_CACHE_LOCK:
+        _NOISY_LINEAR_IMPUTATION_CACHE[key] = (lu, nbytes)
+        while len(_NOISY_LINEAR_IMPUTATION_CACHE) > NOISY_LINEAR_IMPUTATION_CACHE_SIZE or (
+            sum(n for _, n in _NOISY_LINEAR_IMPUTATION_CACHE.values())
+            > NOISY_LINEAR_IMPUTATION_CACHE_BYTES
+        ):
+            _NOISY_LINEAR_IMPUTATION_CACHE.popitem(last=False)
+    return lu
+
+
+def _solve_noisy_linear_imputation(
+    indices: np.ndarray,
+    img_shape: Tuple[int, ...],
+    b: np.array,
+    lhs: Optional[Callable[[], csc_matrix]] = None,
+) -> np.array:
+    """
+    Solve the noisy linear imputation system for all right-hand sides (columns of b) at once.
+
+    Parameters
+    ----------
+    indices: np.ndarray
+        Flat (height x width) indices of the variables.
+    img_shape: tuple
+        Image shape in (channels, height, width) format.
+    b: np.ndarray
+        The (len(indices), nr_rhs) right-hand side.
+    lhs: callable, optional
+        Returns the left-hand side matrix if it needs to be factorised, by default it is assembled.
+
+    Returns
+    -------
+    np.ndarray
+        The (nr_rhs, len(indices)) solution.
+    """
+    lu = _noisy_linear_imputation_factorisation(indices, img_shape, lhs=lhs)
+    if lu is None:
+        # Singular systems are left to spsolve, which warns and returns nan.
+        a = lhs() if lhs is not None else _noisy_linear_imputation_lhs(indices, img_shape)
+        return np.transpose(spsolve(a, b)).reshape(b.shape[1], len(indices))
+    return np.transpose(lu.solve(b))
+
+
+def clear_noisy_linear_imputation_cache() -> None:
+    """Remove all cached factorisations of noisy linear imputation systems."""
+    with _NOISY_LINEAR_IMPUTATION_CACHE_LOCK:
+        _NOISY_LINEAR_IMPUTATION_CACHE.clear()
+
+
 def noisy_linear_imputation(
     arr: np.array,
     indices: Union[Sequence[int], Tuple[np.array]],
@@ -461,15 +696,17 @@ def noisy_linear_imputation(
     which elements are not included in the mask.
         Adapted from: https://github.com/tleemann/road_evaluation.
 
+    The equation system is assembled in sparse coordinate format and solved for all channels at once.
+    Its factorisation is cached and reused for later calls with the same image shape and indices,
+    see NOISY_LINEAR_IMPUTATION_CACHE_SIZE, NOISY_LINEAR_IMPUTATION_CACHE_BYTES and
+    clear_noisy_linear_imputation_cache().
+
     Parameters
     ----------
     arr: np.ndarray
          Array to be perturbed.
-    indices: int, sequence, tuple
-        Array-like, with a subset shape of arr.
-    indexed_axes: sequence
-        The dimensions of arr that are indexed. These need to be consecutive,
-                  and either include the first or last dimension of array.
+    indices: sequence, tuple
+        Flat (height x width) indices of arr that are imputed, or a tuple of (row, column) index arrays.
     noise: float
         The amount of noise added.
     kwargs: optional
@@ -480,63 +717,116 @@ def noisy_linear_imputation(
     arr_perturbed: np.ndarray
          The array which some of its indices have been perturbed.
     """
-    offset_weight = [
-        ((1, 1), 1 / 12),
-        ((0, 1), 1 / 6),
-        ((-1, 1), 1 / 12),
-        ((1, -1), 1 / 12),
-        ((0, -1), 1 / 6),
-        ((-1, -1), 1 / 12),
-        ((1, 0), 1 / 6),
-        ((-1, 0), 1 / 6),
-    ]
-    arr_flat = arr.reshape((arr.shape[0], -1))
+    indices = _noisy_linear_imputation_indices(indices=indices, img_shape=arr.shape)
+    b = _noisy_linear_imputation_rhs(arr=arr, indices=indices)
 
-    mask = np.ones(arr_flat.shape[1])
-    mask[indices] = 0
+    # Solve the system of equations.
+    res = _solve_noisy_linear_imputation(indices=indices, img_shape=arr.shape, b=b)
 
-    ind_to_var_ids = np.zeros(arr_flat.shape[1], dtype=int)
-    ind_to_var_ids[indices] = np.arange(len(indices))
+    # Fill the values with the solution of the system.
+    arr_flat_copy = np.copy(arr.reshape((arr.shape[0], -1)))
+    arr_flat_copy[:, indices] = res + noise * np.random.randn(*res.shape)
 
-    # Equation system left-hand side.
-    a = lil_matrix((len(indices), len(indices)))
+    return arr_flat_copy.reshape(*arr.shape)
 
-    # Equation system right-hand side.
-    b = np.zeros((len(indices), arr.shape[0]))
 
-    sum_neighbors = np.ones(len(indices))
+def batch_noisy_linear_imputation(
+    arr: np.array,
+    indices: Union[Sequence[int], Tuple[np.array]],
+    noise: float = 0.01,
+    **kwargs,
+) -> np.array:
+    """
+    Calculates noisy linear imputation for a batch of arrays that share the same indices. The equation
+    system depends on the indices only, so it is factorised once and solved for all arrays and channels
+    in a single multi right-hand side solve.
 
-    for n in offset_weight:
-        offset, weight = n[0], n[1]
-        off_coords, valid = offset_coordinates(indices, offset, arr.shape)
-        valid_ids = np.argwhere(valid == 1).flatten()
+    Parameters
+    ----------
+    arr: np.ndarray
+         Batch of arrays to be perturbed, in (batch, channels, height, width) format.
+    indices: sequence, tuple
+        Flat (height x width) indices that are imputed in every array, or a tuple of (row, column)
+        index arrays.
+    noise: float
+        The amount of noise added.
+    kwargs: optional
+        Keyword arguments.
 
-        # Add weighted values to vector b.
-        in_off_coord = off_coords[mask[off_coords] == 1]
-        in_off_coord_ids = valid_ids[mask[off_coords] == 1]
-        b[in_off_coord_ids, :] -= weight * arr_flat[:, in_off_coord].T
+    Returns
+    -------
+    arr_perturbed: np.ndarray
+         The batch of arrays which some of its indices have been perturbed.
+    """
+    # The channels of all arrays are the right-hand sides of one equation system.
+    arr_perturbed = noisy_linear_imputation(
+        arr=arr.reshape(-1, *arr.shape[-2:]), indices=indices, noise=noise
+    )
+    return arr_perturbed.reshape(*arr.shape)
 
-        # Add weights to a.
-        out_off_coord = off_coords[mask[off_coords] != 1]
-        out_off_coord_ids = valid_ids[mask[off_coords] != 1]
-        variable_ids = ind_to_var_ids[out_off_coord]
-        a[out_off_coord_ids, variable_ids] = weight
 
-        # Reduce weight for invalid coordinates.
-        sum_neighbors[np.argwhere(valid == 0).flatten()] = (
-            sum_neighbors[np.argwhere(valid == 0).flatten()] - weight
-        )
+def nested_noisy_linear_imputation(
+    arr: np.array,
+    indices: Union[Sequence[int], Tuple[np.array]],
+    nr_indices: Sequence[int],
+    noise: float = 0.01,
+    **kwargs,
+) -> np.array:
+    """
+    Calculates the noisy linear imputation for several nested index sets at once, where the
+    l-th perturbed array imputes the first nr_indices[l] indices. This is equivalent to calling
+    noisy_linear_imputation(arr, indices[:k], noise) for each k in nr_indices, but the equation
+    system is assembled only once, for the largest index set: the system of every smaller set is
+    its leading block, with the now-known values moved to the right-hand side.
 
-    a[np.arange(len(indices)), np.arange(len(indices))] = -sum_neighbors
+    Parameters
+    ----------
+    arr: np.ndarray
+         Array to be perturbed.
+    indices: sequence
+        Flat indices of arr (excluding the first axis), ordered such that every index set is a prefix.
+    nr_indices: sequence
+        The number of leading indices that are imputed in each of the perturbed arrays.
+    noise: float
+        The amount of noise added.
+    kwargs: optional
+        Keyword arguments.
 
-    # Solve the system of equations.
-    res = np.transpose(spsolve(csc_matrix(a), b))
+    Returns
+    -------
+    arr_perturbed: np.ndarray
+         The (len(nr_indices), *arr.shape) array of perturbed arrays.
+    """
+    indices = np.asarray(indices)[: max(nr_indices, default=0)]
+    arr_flat = arr.reshape((arr.shape[0], -1))
+    arr_perturbed = np.repeat(arr_flat[None], len(nr_indices), axis=0)
+    if len(indices) == 0:
+        return arr_perturbed.reshape(len(nr_indices), *arr.shape)
+
+    a = _noisy_linear_imputation_lhs(indices=indices, img_shape=arr.shape).tocsr()
+    b = _noisy_linear_imputation_rhs(arr=arr, indices=indices)
+
+    for level, k in enumerate(nr_indices):
+        if k == 0:
+            continue
+
+        # Variables beyond the first k indices keep their original values.
+        b_k = b[:k] - a[:k, k:] @ arr_flat[:, indices[k:]].T
+
+        # Solve the system of equations.
+        res = _solve_noisy_linear_imputation(
+            indices=indices[:k],
+            img_shape=arr.shape,
+            b=b_k,
+            lhs=lambda: a[:k, :k].tocsc(),
+        )
 
-    # Fill the values with the solution of the system.
-    arr_flat_copy = np.copy(arr.reshape((arr.shape[0], -1)))
-    arr_flat_copy[:, indices] = res + noise * np.random.randn(*res.shape)
+        # Fill the values with the solution of the system.
+        arr_perturbed[level][:, indices[:k]] = res + noise * np.random.randn(
+            *res.shape
+        )
 
-    return arr_flat_copy.reshape(*arr.shape)
+    return arr_perturbed.reshape(len(nr_indices), *arr.shape)
 
 
 def no_perturbation(arr: np.array, **kwargs) -> np.array:
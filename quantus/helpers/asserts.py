@@ -35,6 +35,120 @@ def assert_features_in_step(
     )
 
 
+def assert_perturbation_batch_size(perturbation_batch_size: int) -> None:
+    """
+    Assert that the number of perturbed inputs predicted on at once is a positive integer.
+
+    Parameters
+    ----------
+    perturbation_batch_size: integer
+        The maximum number of perturbed inputs that are materialised and predicted on at once.
+
+    Returns
+    -------
+    None
+    """
+    assert isinstance(perturbation_batch_size, int) and perturbation_batch_size > 0, (
+        "Set 'perturbation_batch_size' to a positive integer or None"
+        f" (perturbation_batch_size={perturbation_batch_size})."
+    )
+
+
+def assert_neighbourhood_batch_size(neighbourhood_batch_size: int) -> None:
+    """
+    Assert that the number of distance matrix rows computed at once is a positive integer.
+
+    Parameters
+    ----------
+    neighbourhood_batch_size: integer
+        The number of rows of the distance matrix that are computed at once.
+
+    Returns
+    -------
+    None
+    """
+    assert isinstance(neighbourhood_batch_size, int) and neighbourhood_batch_size > 0, (
+        "Set 'neighbourhood_batch_size' to a positive integer or None"
+        f" (neighbourhood_batch_size={neighbourhood_batch_size})."
+    )
+
+
+def assert_executor(executor: str) -> None:
+    """
+    Assert that the executor of evaluate_instance() is supported.
+
+    Parameters
+    ----------
+    executor: string
+        The executor, "serial", "thread" or "process".
+
+    Returns
+    -------
+    None
+    """
+    assert executor in [
+        "serial",
+        "thread",
+        "process",
+    ], "The executor must be either 'serial', 'thread' or 'process'."
+
+
+def assert_n_jobs(n_jobs: int) -> None:
+    """
+    Assert that the number of worker processes is a positive integer.
+
+    Parameters
+    ----------
+    n_jobs: integer
+        The number of worker processes.
+
+    Returns
+    -------
+    None
+    """
+    assert isinstance(n_jobs, int) and n_jobs > 0, (
+        f"Set 'n_jobs' to a positive integer or None (n_jobs={n_jobs})."
+    )
+
+
+def assert_on_budget_exceeded(on_budget_exceeded: str) -> None:
+    """
+    Assert that the behaviour on an exceeded forward-pass budget is supported.
+
+    Parameters
+    ----------
+    on_budget_exceeded: string
+        The behaviour, "raise" or "nan".
+
+    Returns
+    -------
+    None
+    """
+    assert on_budget_exceeded in [
+        "raise",
+        "nan",
+    ], "The on_budget_exceeded must be either 'raise' or 'nan'."
+
+
+def assert_prediction_batch_size(prediction_batch_size: int) -> None:
+    """
+    Assert that the number of samples of a coalesced forward pass is a positive integer.
+
+    Parameters
+    ----------
+    prediction_batch_size: integer
+        The maximal number of samples of a coalesced forward pass.
+
+    Returns
+    -------
+    None
+    """
+    assert isinstance(prediction_batch_size, int) and prediction_batch_size > 0, (
+        "Set 'prediction_batch_size' to a positive integer or None "
+        f"(prediction_batch_size={prediction_batch_size})."
+    )
+
+
 def assert_patch_size(patch_size: Union[int, tuple], shape: Tuple[int, ...]) -> None:
     """
     Assert that patch size is compatible with given image shape.
@@ -144,7 +258,7 @@ def assert_attributions(x_batch: np.array, a_batch: np.array) -> None:
     None
     """
     assert (
-        type(a_batch) == np.ndarray
+        isinstance(a_batch, np.ndarray)
     ), "Attributions 'a_batch' should be of type np.ndarray."
     assert np.shape(x_batch)[0] == np.shape(a_batch)[0], (
         "The inputs 'x_batch' and attributions 'a_batch' should "
@@ -212,7 +326,7 @@ def assert_segmentations(x_batch: np.array, s_batch: np.array) -> None:
     None
     """
     assert (
-        type(s_batch) == np.ndarray
+        isinstance(s_batch, np.ndarray)
     ), "Segmentations 's_batch' should be of type np.ndarray."
     assert (
         np.shape(x_batch)[0] == np.shape(s_batch)[0]
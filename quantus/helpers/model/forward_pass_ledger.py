@@ -0,0 +1,148 @@
+"""This module implements the ledger of the forward passes of a ModelInterface, with an optional budget."""
+
+# This file is part of Quantus.
+# Quantus is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+# Quantus is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public License along with Quantus. If not, see <https://www.gnu.org/licenses/>.
+# Quantus project URL: <https://github.com/understandable-machine-intelligence-lab/Quantus>.
+
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Optional
+
+
+class ForwardPassBudgetExceeded(RuntimeError):
+    """Raised before a forward pass that would exceed the budget of a ForwardPassLedger."""
+
+
+class ForwardPassLedger:
+    """
+    Counts the forward passes of a ModelInterface, i.e., the calls of predict() and
+    get_hidden_representations(), their samples, time and batch sizes, and enforces an optional budget.
+
+    Forward passes run by explanation functions directly on the torch or tensorflow model are not counted.
+    """
+
+    def __init__(
+        self,
+        max_samples: Optional[int] = None,
+        max_seconds: Optional[float] = None,
+    ):
+        """
+        Initialisation of ForwardPassLedger class.
+
+        Parameters
+        ----------
+        max_samples: integer, optional
+            The maximal number of samples of all forward passes. If None, it is not limited, default=None.
+        max_seconds: float, optional
+            The maximal wall time in seconds since the ledger was reset, after which no forward pass is
+            started. If None, it is not limited, default=None.
+        """
+        self.max_samples = max_samples
+        self.max_seconds = max_seconds
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Reset the counts and the start time of the budget.
+
+        Returns
+        -------
+        None
+        """
+        with self._lock:
+            self.n_forward_passes = 0
+            self.n_samples = 0
+            self.forward_time = 0.0
+            self.batch_sizes: Counter = Counter()
+            self._start = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        """
+        The wall time in seconds since the ledger was reset.
+        """
+        return time.perf_counter() - self._start
+
+    def check(self, n_samples: int) -> None:
+        """
+        Check that a forward pass of n_samples samples fits into the budget.
+
+        Parameters
+        ----------
+        n_samples: integer
+            The number of samples of the forward pass.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        ForwardPassBudgetExceeded
+            If the forward pass would exceed the budget.
+        """
+        if self.max_samples is not None and self.n_samples + n_samples > self.max_samples:
+            raise ForwardPassBudgetExceeded(
+                f"A forward pass of {n_samples} samples exceeds the budget of max_samples="
+                f"{self.max_samples} ({self.n_samples} samples in {self.n_forward_passes} forward passes "
+                "so far)."
+            )
+        if self.max_seconds is not None and self.elapsed > self.max_seconds:
+            raise ForwardPassBudgetExceeded(
+                f"The budget of max_seconds={self.max_seconds} is exhausted ({self.elapsed:.1f} seconds, "
+                f"{self.n_samples} samples in {self.n_forward_passes} forward passes so far)."
+            )
+
+    def record(self, n_samples: int, duration: float) -> None:
+        """
+        Record a forward pass.
+
+        Parameters
+        ----------
+        n_samples: integer
+            The number of samples of the forward pass.
+        duration: float
+            The wall time of the forward pass in seconds.
+
+        Returns
+        -------
+        None
+        """
+        with self._lock:
+            self.n_forward_passes += 1
+            self.n_samples += n_samples
+            self.forward_time += duration
+            self.batch_sizes[n_samples] += 1
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Summarise the recorded forward passes.
+
+        Returns
+        -------
+        dict
+            The number of forward passes and samples, the mean batch size, the number of forward passes per
+            batch size, the time spent in forward passes and the elapsed time, in seconds.
+        """
+        with self._lock:
+            return {
+                "n_forward_passes": self.n_forward_passes,
+                "n_samples": self.n_samples,
+                "mean_batch_size": self.n_samples / max(self.n_forward_passes, 1),
+                "batch_sizes": dict(sorted(self.batch_sizes.items())),
+                "forward_time": self.forward_time,
+                "elapsed": self.elapsed,
+            }
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
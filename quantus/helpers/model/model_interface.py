@@ -6,11 +6,16 @@
 # You should have received a copy of the GNU Lesser General Public License along with Quantus. If not, see <https://www.gnu.org/licenses/>.
 # Quantus project URL: <https://github.com/understandable-machine-intelligence-lab/Quantus>.
 
+import contextlib
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional, Tuple, List, Union
+from typing import Any, Dict, Iterator, Optional, Tuple, List, Union
 
 import numpy as np
 
+from quantus.helpers.model.forward_pass_ledger import ForwardPassLedger
+from quantus.helpers.profiling import Profiler, get_nbytes, profile_phase
+
 
 class ModelInterface(ABC):
     """Base ModelInterface for torch and tensorflow models."""
@@ -46,6 +51,45 @@ class ModelInterface(ABC):
         else:
             self.model_predict_kwargs = model_predict_kwargs
 
+        # Set by a metric to count and profile the forward passes of its calls, see forward_pass().
+        self.profiler: Optional[Profiler] = None
+        self.ledger: Optional[ForwardPassLedger] = None
+
+    @contextlib.contextmanager
+    def forward_pass(self, name: str, x: np.ndarray) -> Iterator[None]:
+        """
+        Record the forward pass on x that runs within the context in the ledger and the profiler, if set.
+
+        Parameters
+        ----------
+        name: string
+            The name of the forward pass, e.g., "model.predict".
+        x: np.ndarray
+            The input of the forward pass.
+
+        Returns
+        -------
+        iterator
+            The context of the forward pass.
+
+        Raises
+        ------
+        ForwardPassBudgetExceeded
+            If the forward pass would exceed the budget of the ledger.
+        """
+        n_samples = len(x)
+        if self.ledger is not None:
+            self.ledger.check(n_samples=n_samples)
+        start = time.perf_counter()
+        with profile_phase(
+            self.profiler, name, n_samples=n_samples, n_bytes=get_nbytes(x)
+        ):
+            yield
+        if self.ledger is not None:
+            self.ledger.record(
+                n_samples=n_samples, duration=time.perf_counter() - start
+            )
+
     @abstractmethod
     def get_softmax_arg_model(self):
         """
@@ -107,14 +151,53 @@ class ModelInterface(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def get_random_layer_generator(self):
+    def get_random_layer_generator(
+        self, order: str = "top_down", seed: int = 42, start: int = 0
+    ):
         """
         In every iteration yields a copy of the model with one additional layer's parameters randomized.
         For cascading randomization, set order (str) to 'top_down'. For independent randomization,
         set it to 'independent'. For bottom-up order, set it to 'bottom_up'.
+
+        Parameters
+        ----------
+        order: string
+            The various ways that a model's weights of a layer can be randomised.
+        seed: integer
+            The seed of the random layer generator.
+        start: integer
+            The index of the first layer that is yielded, default=0.
         """
         raise NotImplementedError
 
+    def is_random_layer_generator_reproducible(self, order: str) -> bool:
+        """
+        Whether get_random_layer_generator yields the same models in every process, given the same seed.
+
+        Parameters
+        ----------
+        order: string
+            The various ways that a model's weights of a layer can be randomised.
+
+        Returns
+        -------
+        bool
+            True, if the randomised models only depend on the seed.
+        """
+        return True
+
+    def get_random_layer_count(self) -> int:
+        """
+        Get the number of layers that get_random_layer_generator will randomise, i.e., its number of iterations.
+        Subclasses should override this to count the layers without randomising them.
+
+        Returns
+        -------
+        int
+            The number of randomisable layers.
+        """
+        return len(list(self.get_random_layer_generator()))
+
     @abstractmethod
     def add_mean_shift_to_first_layer(
         self,
@@ -0,0 +1,260 @@
+"""This model implements a ModelInterface that coalesces concurrent predictions into batched forward passes."""
+
+# This file is part of Quantus.
+# Quantus is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+# Quantus is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public License along with Quantus. If not, see <https://www.gnu.org/licenses/>.
+# Quantus project URL: <https://github.com/understandable-machine-intelligence-lab/Quantus>.
+
+import threading
+from concurrent.futures import Future, TimeoutError
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from quantus.helpers import asserts
+from quantus.helpers.model.model_interface import ModelInterface
+
+
+class PredictionBroker(ModelInterface):
+    """
+    Wraps a ModelInterface and coalesces the predict() calls of concurrently running threads, e.g., the
+    evaluate_instance() calls of a metric with executor="thread", into batched forward passes.
+
+    Each call to predict() is queued. The queue is flushed as one forward pass of the wrapped model as soon
+    as it holds max_batch_size samples, or when a queued call has waited max_latency seconds. The
+    predictions are then split and returned to the calling threads. Calls with keyword arguments, and all
+    other methods, are passed through to the wrapped model.
+    """
+
+    def __init__(
+        self,
+        model: ModelInterface,
+        max_batch_size: int = 64,
+        max_latency: float = 0.005,
+    ):
+        """
+        Initialisation of PredictionBroker class.
+
+        Parameters
+        ----------
+        model: ModelInterface
+            The wrapped model, e.g., a PyTorchModel or TensorFlowModel.
+        max_batch_size: integer
+            The number of queued samples at which the queue is flushed, default=64.
+        max_latency: float
+            The number of seconds a queued call waits for other calls before the queue is flushed,
+            default=0.005.
+        """
+        super().__init__(
+            model=model.model,
+            channel_first=model.channel_first,
+            softmax=model.softmax,
+            model_predict_kwargs=model.model_predict_kwargs,
+        )
+        asserts.assert_prediction_batch_size(prediction_batch_size=max_batch_size)
+        assert max_latency >= 0, "'max_latency' must be non-negative."
+
+        self.model_interface = model
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+
+        self._lock = threading.Lock()
+        self._queue: List[Tuple[np.ndarray, Future]] = []
+        self._n_queued = 0
+
+    def get_softmax_arg_model(self):
+        """
+        Returns model with last layer adjusted accordingly to softmax argument.
+        """
+        return self.model_interface.get_softmax_arg_model()
+
+    def predict(self, x: np.ndarray, **kwargs) -> np.ndarray:
+        """
+        Predict on the given input, batched together with the inputs of concurrent calls.
+
+        Parameters
+        ----------
+        x: np.ndarray
+            A given input that the wrapped model predicts on.
+        kwargs: optional
+            Keyword arguments. If given, the call is passed through to the wrapped model.
+
+        Returns
+        --------
+        np.ndarray
+            The predictions of the wrapped model for x.
+        """
+        if kwargs:
+            return self.model_interface.predict(x, **kwargs)
+
+        x = np.asarray(x)
+        future: Future = Future()
+        requests = None
+        with self._lock:
+            self._queue.append((x, future))
+            self._n_queued += len(x)
+            if self._n_queued >= self.max_batch_size:
+                requests = self._take_queue()
+        if requests:
+            self._flush(requests)
+
+        try:
+            return future.result(timeout=self.max_latency)
+        except TimeoutError:
+            pass
+
+        # A call that is not already part of a running flush flushes the queue itself.
+        with self._lock:
+            if not future.running() and not future.done():
+                requests = self._take_queue()
+        if requests:
+            self._flush(requests)
+        return future.result()
+
+    def _take_queue(self) -> List[Tuple[np.ndarray, Future]]:
+        """
+        Empties the queue and marks its calls as running. Must be called while holding the lock.
+
+        Returns
+        -------
+        list
+            The queued inputs and their futures.
+        """
+        requests = self._queue
+        self._queue = []
+        self._n_queued = 0
+        for _, future in requests:
+            future.set_running_or_notify_cancel()
+        return requests
+
+    def _flush(self, requests: List[Tuple[np.ndarray, Future]]) -> None:
+        """
+        Runs one forward pass per group of inputs with the same sample shape and dtype, and sets the
+        results of the futures.
+
+        Parameters
+        ----------
+        requests: list
+            The inputs and their futures.
+
+        Returns
+        -------
+        None
+        """
+        groups: Dict[Tuple, List[Tuple[np.ndarray, Future]]] = {}
+        for x, future in requests:
+            groups.setdefault((x.shape[1:], x.dtype), []).append((x, future))
+
+        for group in groups.values():
+            try:
+                predictions = self.model_interface.predict(
+                    np.concatenate([x for x, _ in group], axis=0)
+                )
+            except BaseException as e:
+                for _, future in group:
+                    future.set_exception(e)
+                continue
+
+            splits = np.cumsum([len(x) for x, _ in group])[:-1]
+            for (_, future), prediction in zip(
+                group, np.split(predictions, splits, axis=0)
+            ):
+                future.set_result(prediction)
+
+    def shape_input(
+        self,
+        x: np.array,
+        shape: Tuple[int, ...],
+        channel_first: Optional[bool] = None,
+        batched: bool = False,
+    ) -> np.array:
+        """
+        Reshape input into model expected input.
+
+        Parameters
+        ----------
+        x: np.ndarray
+            A given input that is shaped.
+        shape: Tuple[int...]
+            The shape of the input.
+        channel_first: boolean, optional
+            Indicates of the image dimensions are channel first, or channel last.
+            Inferred from the input shape if None.
+        batched: boolean
+            Indicates if the first dimension should be expanded or not, if it is just a single instance.
+        """
+        return self.model_interface.shape_input(
+            x=x, shape=shape, channel_first=channel_first, batched=batched
+        )
+
+    def get_model(self):
+        """
+        Get the original torch/tf model.
+        """
+        return self.model_interface.get_model()
+
+    def state_dict(self):
+        """
+        Get a dictionary of the model's learnable parameters.
+        """
+        return self.model_interface.state_dict()
+
+    def get_random_layer_generator(self, *args, **kwargs):
+        """
+        In every iteration yields a copy of the wrapped model with one additional layer's parameters randomized.
+        """
+        return self.model_interface.get_random_layer_generator(*args, **kwargs)
+
+    def is_random_layer_generator_reproducible(self, order: str) -> bool:
+        """
+        Whether the random layer generator of the wrapped model is reproducible across processes.
+        """
+        return self.model_interface.is_random_layer_generator_reproducible(order=order)
+
+    def get_random_layer_count(self, *args, **kwargs) -> int:
+        """
+        Get the number of layers that get_random_layer_generator will randomise.
+        """
+        return self.model_interface.get_random_layer_count(*args, **kwargs)
+
+    def add_mean_shift_to_first_layer(
+        self,
+        input_shift: Union[int, float],
+        shape: tuple,
+    ):
+        """
+        Shift the bias of the first layer of the wrapped model, see ModelInterface.
+
+        Parameters
+        ----------
+        input_shift: Union[int, float]
+            Shift to be applied.
+        shape: tuple
+            Model input shape.
+        """
+        return self.model_interface.add_mean_shift_to_first_layer(
+            input_shift=input_shift, shape=shape
+        )
+
+    def get_hidden_representations(
+        self,
+        x: np.ndarray,
+        layer_names: Optional[List[str]] = None,
+        layer_indices: Optional[List[int]] = None,
+    ) -> np.ndarray:
+        """
+        Compute the wrapped model's internal representation of input x, see ModelInterface.
+
+        Parameters
+        ----------
+        x: np.ndarray
+            4D tensor, a batch of input datapoints
+        layer_names: List[str]
+            List with names of layers, from which output should be captured.
+        layer_indices: List[int]
+            List with indices of layers, from which output should be captured.
+        """
+        return self.model_interface.get_hidden_representations(
+            x=x, layer_names=layer_names, layer_indices=layer_indices
+        )
@@ -174,7 +174,7 @@ class PyTorchModel(ModelInterface):
 
         grad_context = torch.no_grad() if not grad else suppress()
 
-        with grad_context:
+        with grad_context, self.forward_pass("model.predict", x):
             pred_model = self.get_softmax_arg_model()
             pred = pred_model(torch.Tensor(x).to(self.device), **model_predict_kwargs)
             if pred.requires_grad:
@@ -232,7 +232,9 @@ class PyTorchModel(ModelInterface):
         """
         return self.model.state_dict()
 
-    def get_random_layer_generator(self, order: str = "top_down", seed: int = 42):
+    def get_random_layer_generator(
+        self, order: str = "top_down", seed: int = 42, start: int = 0
+    ):
         """
         In every iteration yields a copy of the model with one additional layer's parameters randomized.
         For cascading randomization, set order (str) to 'top_down'. For independent randomization,
@@ -244,14 +246,17 @@ class PyTorchModel(ModelInterface):
             The various ways that a model's weights of a layer can be randomised.
         seed: integer
             The seed of the random layer generator.
+        start: integer
+            The index of the first layer that is yielded. For cascading orders, the preceding layers are
+            randomised as in a full iteration, but not yielded, default=0.
 
         Returns
         -------
         layer.name, random_layer_model: string, torch.nn
             The layer name and the model.
         """
-        original_parameters = self.state_dict()
         random_layer_model = deepcopy(self.model)
+        original_modules = dict(self.model.named_modules())
 
         modules = [
             l
@@ -262,13 +267,34 @@ class PyTorchModel(ModelInterface):
         if order == "top_down":
             modules = modules[::-1]
 
-        for module in modules:
-            if order == "independent":
-                random_layer_model.load_state_dict(original_parameters)
+        previous_module = None
+        for module_id, module in enumerate(modules):
+            if module_id < start:
+                if order != "independent":
+                    torch.manual_seed(seed=seed + 1)
+                    module[1].reset_parameters()
+                continue
+            if order == "independent" and previous_module is not None:
+                # Only the previously randomised layer differs from the original model.
+                previous_module[1].load_state_dict(
+                    original_modules[previous_module[0]].state_dict()
+                )
             torch.manual_seed(seed=seed + 1)
             module[1].reset_parameters()
+            previous_module = module
             yield module[0], random_layer_model
 
+    def get_random_layer_count(self) -> int:
+        """
+        Get the number of layers that get_random_layer_generator will randomise, without copying the model.
+
+        Returns
+        -------
+        int
+            The number of modules with a reset_parameters method.
+        """
+        return len([m for m in self.model.modules() if hasattr(m, "reset_parameters")])
+
     def sample(
         self,
         mean: float,
@@ -441,7 +467,7 @@ class PyTorchModel(ModelInterface):
             raise ValueError("No hidden representations were selected.")
 
         # Execute forward pass.
-        with torch.no_grad():
+        with torch.no_grad(), self.forward_pass("model.get_hidden_representations", x):
             self.model(torch.Tensor(x).to(device))
 
         # Cleanup.
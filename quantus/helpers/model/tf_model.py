@@ -178,7 +178,8 @@ class TensorFlowModel(ModelInterface):
         predict_kwargs = self._get_predict_kwargs(**kwargs)
         predict_model = self.get_softmax_arg_model()
 
-        return predict_model.predict(x, **predict_kwargs)
+        with self.forward_pass("model.predict", x):
+            return predict_model.predict(x, **predict_kwargs)
 
     def shape_input(
         self,
@@ -234,7 +235,9 @@ class TensorFlowModel(ModelInterface):
         """Set model's learnable parameters."""
         self.model.set_weights(original_parameters)
 
-    def get_random_layer_generator(self, order: str = "top_down", seed: int = 42):
+    def get_random_layer_generator(
+        self, order: str = "top_down", seed: int = 42, start: int = 0
+    ):
         """
         In every iteration yields a copy of the model with one additional layer's parameters randomized.
         For cascading randomization, set order (str) to 'top_down'. For independent randomization,
@@ -246,32 +249,77 @@ class TensorFlowModel(ModelInterface):
             The various ways that a model's weights of a layer can be randomised.
         seed: integer
             The seed of the random layer generator.
+        start: integer
+            The index of the first layer that is yielded. For cascading orders, the preceding layers are
+            randomised as in a full iteration, but not yielded, default=0.
 
         Returns
         -------
         layer.name, random_layer_model: string, torch.nn
             The layer name and the model.
         """
-        original_parameters = self.state_dict()
         random_layer_model = clone_model(self.model)
 
         layers = [
-            _layer
-            for _layer in random_layer_model.layers
-            if len(_layer.get_weights()) > 0
+            (_layer, _original_layer)
+            for _layer, _original_layer in zip(
+                random_layer_model.layers, self.model.layers
+            )
+            if len(_layer.weights) > 0
         ]
 
         if order == "top_down":
             layers = layers[::-1]
 
-        for layer in layers:
-            if order == "independent":
-                random_layer_model.set_weights(original_parameters)
+        if order == "independent":
+            random_layer_model.set_weights(self.state_dict())
+
+        previous_layer = None
+        for layer_id, (layer, original_layer) in enumerate(layers):
+            if layer_id < start:
+                if order != "independent":
+                    weights = layer.get_weights()
+                    np.random.seed(seed=seed + 1)
+                    layer.set_weights([np.random.permutation(w) for w in weights])
+                continue
+            if order == "independent" and previous_layer is not None:
+                # Only the previously randomised layer differs from the original model.
+                previous_layer[0].set_weights(previous_layer[1].get_weights())
             weights = layer.get_weights()
             np.random.seed(seed=seed + 1)
             layer.set_weights([np.random.permutation(w) for w in weights])
+            previous_layer = (layer, original_layer)
             yield layer.name, random_layer_model
 
+    def is_random_layer_generator_reproducible(self, order: str) -> bool:
+        """
+        Whether get_random_layer_generator yields the same models in every process, given the same seed.
+        For cascading orders, the layers start from the weights that clone_model re-initialises, which do
+        not depend on the seed.
+
+        Parameters
+        ----------
+        order: string
+            The various ways that a model's weights of a layer can be randomised.
+
+        Returns
+        -------
+        bool
+            True for the independent order.
+        """
+        return order == "independent"
+
+    def get_random_layer_count(self) -> int:
+        """
+        Get the number of layers that get_random_layer_generator will randomise, without cloning the model.
+
+        Returns
+        -------
+        int
+            The number of layers with weights.
+        """
+        return len([_layer for _layer in self.model.layers if len(_layer.weights) > 0])
+
     @cachedmethod(operator.attrgetter("cache"))
     def _build_hidden_representation_model(
         self, layer_names: Tuple, layer_indices: Tuple
@@ -403,9 +451,10 @@ class TensorFlowModel(ModelInterface):
             tuple(layer_names), tuple(positive_layer_indices)
         )
         predict_kwargs = self._get_predict_kwargs(**kwargs)
-        internal_representation = hidden_representation_model.predict(
-            x, **predict_kwargs
-        )
+        with self.forward_pass("model.get_hidden_representations", x):
+            internal_representation = hidden_representation_model.predict(
+                x, **predict_kwargs
+            )
         input_batch_size = x.shape[0]
 
         # If we requested outputs only of 1 layer, keras will already return np.ndarray.
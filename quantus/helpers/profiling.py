@@ -0,0 +1,289 @@
+"""This module contains the opt-in instrumentation of the phases of a metric evaluation."""
+
+# This file is part of Quantus.
+# Quantus is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+# Quantus is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public License along with Quantus. If not, see <https://www.gnu.org/licenses/>.
+# Quantus project URL: <https://github.com/understandable-machine-intelligence-lab/Quantus>.
+
+import contextlib
+import json
+import os
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional
+
+import numpy as np
+
+
+class Profiler:
+    """
+    Records the wall time, number of samples and bytes of the phases of metric evaluations, e.g.,
+    general_preprocess, explain_func, perturb_func, model.predict or similarity_func.
+
+    Phases may be nested and may be recorded from several threads. Phases recorded in the worker processes
+    of executor="process" are not collected.
+    """
+
+    def __init__(self):
+        """
+        Initialisation of Profiler class.
+        """
+        self.events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+
+    @contextlib.contextmanager
+    def phase(
+        self,
+        name: str,
+        n_samples: Optional[int] = None,
+        n_bytes: Optional[int] = None,
+    ) -> Iterator[None]:
+        """
+        Record the phase that runs within the context.
+
+        Parameters
+        ----------
+        name: string
+            The name of the phase.
+        n_samples: integer, optional
+            The number of samples, i.e., the batch size, processed by the phase.
+        n_bytes: integer, optional
+            The number of bytes of the arrays passed to the phase.
+
+        Returns
+        -------
+        iterator
+            The context of the phase.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            event = {
+                "name": name,
+                "start": start - self._start,
+                "duration": time.perf_counter() - start,
+                "thread": threading.get_ident(),
+                "n_samples": n_samples,
+                "n_bytes": n_bytes,
+            }
+            with self._lock:
+                self.events.append(event)
+
+    def wrap(
+        self, name: str, func: Callable, sample_arg: Optional[str] = None
+    ) -> "ProfiledFunction":
+        """
+        Wrap a function such that each of its calls is recorded as a phase.
+
+        Parameters
+        ----------
+        name: string
+            The name of the phase.
+        func: callable
+            The function. If it is already wrapped, the wrapped function is wrapped anew.
+        sample_arg: string, optional
+            The keyword argument whose length is the number of samples of a call.
+
+        Returns
+        -------
+        ProfiledFunction
+            The wrapped function.
+        """
+        if isinstance(func, ProfiledFunction):
+            func = func.func
+        return ProfiledFunction(profiler=self, name=name, func=func, sample_arg=sample_arg)
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Summarise the recorded phases.
+
+        Returns
+        -------
+        dict
+            Per phase: the number of calls, the total, mean and maximal wall time in seconds, the number of
+            samples and bytes, and the number of calls per batch size.
+        """
+        report: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            events = list(self.events)
+        for event in events:
+            phase = report.setdefault(
+                event["name"],
+                {
+                    "n_calls": 0,
+                    "total_time": 0.0,
+                    "max_time": 0.0,
+                    "n_samples": 0,
+                    "n_bytes": 0,
+                    "batch_sizes": Counter(),
+                },
+            )
+            phase["n_calls"] += 1
+            phase["total_time"] += event["duration"]
+            phase["max_time"] = max(phase["max_time"], event["duration"])
+            if event["n_samples"] is not None:
+                phase["n_samples"] += event["n_samples"]
+                phase["batch_sizes"][event["n_samples"]] += 1
+            if event["n_bytes"] is not None:
+                phase["n_bytes"] += event["n_bytes"]
+        for phase in report.values():
+            phase["mean_time"] = phase["total_time"] / phase["n_calls"]
+            phase["batch_sizes"] = dict(sorted(phase["batch_sizes"].items()))
+        return report
+
+    def to_chrome_trace(self, path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Export the recorded phases as a timeline in the Chrome trace event format, which can be opened in
+        chrome://tracing or Perfetto.
+
+        Parameters
+        ----------
+        path: string, optional
+            A JSON file the timeline is written to.
+
+        Returns
+        -------
+        dict
+            The timeline.
+        """
+        with self._lock:
+            events = list(self.events)
+        trace = {
+            "traceEvents": [
+                {
+                    "name": event["name"],
+                    "ph": "X",
+                    "ts": event["start"] * 1e6,
+                    "dur": event["duration"] * 1e6,
+                    "pid": os.getpid(),
+                    "tid": event["thread"],
+                    "args": {
+                        key: event[key]
+                        for key in ["n_samples", "n_bytes"]
+                        if event[key] is not None
+                    },
+                }
+                for event in events
+            ],
+            "displayTimeUnit": "ms",
+        }
+        if path is not None:
+            with open(path, "w") as f:
+                json.dump(trace, f)
+        return trace
+
+    def reset(self) -> None:
+        """
+        Discard the recorded phases.
+
+        Returns
+        -------
+        None
+        """
+        with self._lock:
+            self.events = []
+        self._start = time.perf_counter()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+class ProfiledFunction:
+    """
+    A function whose calls are recorded as a phase of a Profiler.
+    """
+
+    def __init__(
+        self,
+        profiler: Profiler,
+        name: str,
+        func: Callable,
+        sample_arg: Optional[str] = None,
+    ):
+        """
+        Initialisation of ProfiledFunction class.
+
+        Parameters
+        ----------
+        profiler: Profiler
+            The profiler that records the calls.
+        name: string
+            The name of the phase.
+        func: callable
+            The wrapped function.
+        sample_arg: string, optional
+            The keyword argument whose length is the number of samples of a call.
+        """
+        self.profiler = profiler
+        self.name = name
+        self.func = func
+        self.sample_arg = sample_arg
+        self.__name__ = getattr(func, "__name__", name)
+
+    def __call__(self, *args, **kwargs):
+        n_samples = None
+        if self.sample_arg is not None and self.sample_arg in kwargs:
+            n_samples = len(kwargs[self.sample_arg])
+        with self.profiler.phase(
+            name=self.name,
+            n_samples=n_samples,
+            n_bytes=get_nbytes(*args, *kwargs.values()),
+        ):
+            return self.func(*args, **kwargs)
+
+
+def profile_phase(
+    profiler: Optional[Profiler],
+    name: str,
+    n_samples: Optional[int] = None,
+    n_bytes: Optional[int] = None,
+) -> ContextManager:
+    """
+    Record the phase that runs within the context, if a profiler is given.
+
+    Parameters
+    ----------
+    profiler: Profiler, optional
+        The profiler. If None, nothing is recorded.
+    name: string
+        The name of the phase.
+    n_samples: integer, optional
+        The number of samples, i.e., the batch size, processed by the phase.
+    n_bytes: integer, optional
+        The number of bytes of the arrays passed to the phase.
+
+    Returns
+    -------
+    contextmanager
+        The context of the phase.
+    """
+    if profiler is None:
+        return contextlib.nullcontext()
+    return profiler.phase(name=name, n_samples=n_samples, n_bytes=n_bytes)
+
+
+def get_nbytes(*arrays: Any) -> int:
+    """
+    Get the number of bytes of the np.ndarrays among the given values.
+
+    Parameters
+    ----------
+    arrays: any
+        The values.
+
+    Returns
+    -------
+    integer
+        The total number of bytes of the np.ndarrays.
+    """
+    return sum(array.nbytes for array in arrays if isinstance(array, np.ndarray))
@@ -0,0 +1,273 @@
+"""This module implements a columnar store for the evaluation scores of the calls of a metric."""
+
+# This file is part of Quantus.
+# Quantus is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+# Quantus is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public License along with Quantus. If not, see <https://www.gnu.org/licenses/>.
+# Quantus project URL: <https://github.com/understandable-machine-intelligence-lab/Quantus>.
+
+import os
+import uuid
+import warnings
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+class ResultStore:
+    """
+    Stores the evaluation scores of the calls of a metric as typed NumPy columns, one record per call.
+
+    A record holds the call id and one column per score field, whose rows are the instances:
+    - a list of scores, e.g., floats or per-step curves of PixelFlipping, is one column "score",
+    - a list of dictionaries per instance is one column per key,
+    - a dictionary of scores, e.g., per layer of ModelParameterRandomisation, is one column per key.
+    Ragged scores are kept in object columns.
+
+    If max_calls is set, only the records of the last max_calls calls are retained. Evicted records are
+    saved to spill_dir as .npz files (a zip of .npy files), if set, and dropped otherwise. The file names
+    start with a prefix unique to the store, so that stores sharing a spill_dir do not overwrite each other.
+
+    The store behaves like the list of the scores of the retained calls: indexing, iteration and len()
+    return the scores in their original form.
+    """
+
+    def __init__(
+        self,
+        max_calls: Optional[int] = None,
+        spill_dir: Optional[str] = None,
+        name: Optional[str] = None,
+    ):
+        """
+        Initialisation of ResultStore class.
+
+        Parameters
+        ----------
+        max_calls: integer, optional
+            The number of calls whose records are retained in memory. If None, all are retained, default=None.
+        spill_dir: string, optional
+            A directory to which evicted records are saved. If None, they are dropped, default=None.
+        name: string, optional
+            The name of the store, e.g., the name of the metric, which starts the prefix of the saved files,
+            followed by the process id and a random suffix, default=None.
+        """
+        assert max_calls is None or (
+            isinstance(max_calls, int) and max_calls >= 0
+        ), f"Set 'max_calls' to a non-negative integer or None (max_calls={max_calls})."
+
+        self.max_calls = max_calls
+        self.spill_dir = spill_dir
+        self.prefix = f"{name or 'scores'}_{os.getpid()}_{uuid.uuid4().hex[:8]}"
+        self.records: List[Dict[str, Any]] = []
+        self.spilled_paths: List[str] = []
+        self.n_calls = 0
+
+    def append(self, scores: Any) -> None:
+        """
+        Store the scores of a call, and evict the oldest records beyond max_calls.
+
+        Parameters
+        ----------
+        scores: list, np.ndarray, dict
+            The evaluation scores of the call.
+
+        Returns
+        -------
+        None
+        """
+        record = self.to_record(scores=scores)
+        record["call_id"] = self.n_calls
+        self.records.append(record)
+        self.n_calls += 1
+
+        while self.max_calls is not None and len(self.records) > self.max_calls:
+            evicted = self.records.pop(0)
+            if self.spill_dir is not None:
+                self.spill(record=evicted)
+
+    def column(self, key: str = "score") -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get a column over the retained calls that have it.
+
+        Parameters
+        ----------
+        key: string
+            The name of the column, "score" for lists of scores, default="score".
+
+        Returns
+        -------
+        tuple
+            The call ids, the instance ids and the values of the column.
+        """
+        call_ids, instance_ids, values = [], [], []
+        for record in self.records:
+            if key in record["keys"]:
+                column = np.atleast_1d(record["columns"][record["keys"].index(key)])
+                call_ids.append(np.full(len(column), record["call_id"]))
+                instance_ids.append(np.arange(len(column)))
+                values.append(column)
+        if not values:
+            raise KeyError(f"No retained call has the column '{key}'.")
+        return (
+            np.concatenate(call_ids),
+            np.concatenate(instance_ids),
+            np.concatenate(values),
+        )
+
+    def spill(self, record: Dict[str, Any]) -> str:
+        """
+        Save a record to spill_dir.
+
+        Parameters
+        ----------
+        record: dict
+            The record.
+
+        Returns
+        -------
+        string
+            The path of the saved record.
+        """
+        os.makedirs(self.spill_dir, exist_ok=True)
+        path = os.path.join(self.spill_dir, f"{self.prefix}_call_{record['call_id']:08d}.npz")
+        np.savez(
+            path,
+            kind=np.asarray(record["kind"]),
+            keys=_to_column(record["keys"]),
+            **{
+                f"column_{id_column}": column
+                for id_column, column in enumerate(record["columns"])
+            },
+        )
+        self.spilled_paths.append(path)
+        return path
+
+    @staticmethod
+    def load(path: str) -> Any:
+        """
+        Load the scores of a spilled call.
+
+        Parameters
+        ----------
+        path: string
+            The path of the spilled record.
+
+        Returns
+        -------
+        list, dict
+            The evaluation scores of the call.
+        """
+        with np.load(path, allow_pickle=True) as f:
+            keys = f["keys"].tolist()
+            record = {
+                "kind": str(f["kind"]),
+                "keys": keys,
+                "columns": [f[f"column_{id_column}"] for id_column in range(len(keys))],
+            }
+        return ResultStore.from_record(record=record)
+
+    @staticmethod
+    def to_record(scores: Any) -> Dict[str, Any]:
+        """
+        Convert the scores of a call to a record of columns.
+
+        Parameters
+        ----------
+        scores: list, np.ndarray, dict
+            The evaluation scores of a call.
+
+        Returns
+        -------
+        dict
+            The record, with the kind of the scores, the names of the columns and the columns.
+        """
+        if isinstance(scores, dict):
+            return {
+                "kind": "dict",
+                "keys": list(scores.keys()),
+                "columns": [_to_column(value) for value in scores.values()],
+            }
+
+        if (
+            isinstance(scores, list)
+            and len(scores)
+            and all(isinstance(score, dict) for score in scores)
+        ):
+            keys = list(scores[0].keys())
+            return {
+                "kind": "records",
+                "keys": keys,
+                "columns": [_to_column([score[key] for score in scores]) for key in keys],
+            }
+
+        return {"kind": "list", "keys": ["score"], "columns": [_to_column(scores)]}
+
+    @staticmethod
+    def from_record(record: Dict[str, Any]) -> Any:
+        """
+        Convert a record of columns back to the scores of a call.
+
+        Parameters
+        ----------
+        record: dict
+            The record.
+
+        Returns
+        -------
+        list, dict
+            The evaluation scores of the call.
+        """
+        columns = [column.tolist() for column in record["columns"]]
+        if record["kind"] == "dict":
+            return dict(zip(record["keys"], columns))
+        if record["kind"] == "records":
+            return [dict(zip(record["keys"], row)) for row in zip(*columns)]
+        return columns[0]
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self.from_record(record) for record in self.records[index]]
+        return self.from_record(self.records[index])
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        del self.records[index]
+
+    def __iter__(self) -> Iterator[Any]:
+        return (self.from_record(record) for record in self.records)
+
+    def __repr__(self) -> str:
+        return (
+            f"ResultStore(n_calls={self.n_calls}, retained={len(self.records)}, "
+            f"spilled={len(self.spilled_paths)})"
+        )
+
+
+def _to_column(values: Sequence[Any]) -> np.ndarray:
+    """
+    Convert values to a typed NumPy column, or to an object column if they are ragged.
+
+    Parameters
+    ----------
+    values: sequence
+        The values, one per instance.
+
+    Returns
+    -------
+    np.ndarray
+        The column.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        try:
+            column = np.asarray(values)
+        except (ValueError, Warning):
+            column = None
+
+    if column is None or column.dtype == object:
+        column = np.empty(len(values), dtype=object)
+        for id_value, value in enumerate(values):
+            column[id_value] = value
+    return column
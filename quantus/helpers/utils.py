@@ -6,16 +6,35 @@
 # You should have received a copy of the GNU Lesser General Public License along with Quantus. If not, see <https://www.gnu.org/licenses/>.
 # Quantus project URL: <https://github.com/understandable-machine-intelligence-lab/Quantus>.
 
+import contextlib
 import copy
+import functools
+import hashlib
+import os
+import pickle
+import random
 import re
+import threading
+from collections import OrderedDict
 from importlib import util
-from typing import Any, Dict, Optional, Sequence, Tuple, Union, List
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    List,
+)
 
 import numpy as np
 from skimage.segmentation import slic, felzenszwalb
 
 from quantus.helpers import asserts
 from quantus.helpers.model.model_interface import ModelInterface
+from quantus.helpers.profiling import ProfiledFunction
 
 if util.find_spec("torch"):
     import torch
@@ -24,6 +43,12 @@ if util.find_spec("tensorflow"):
     import tensorflow as tf
     from quantus.helpers.model.tf_model import TensorFlowModel
 
+# Cache of super-pixel segmentations, keyed by image content and segmentation method. The lock guards
+# the cache against concurrent lookups and evictions of thread workers.
+_SEGMENTATION_CACHE: OrderedDict = OrderedDict()
+_SEGMENTATION_CACHE_LOCK = threading.Lock()
+SEGMENTATION_CACHE_SIZE = 256
+
 
 def get_superpixel_segments(img: np.ndarray, segmentation_method: str) -> np.ndarray:
     """
@@ -60,6 +85,87 @@ def get_superpixel_segments(img: np.ndarray, segmentation_method: str) -> np.nda
         )
 
 
+def get_cached_superpixel_segments(
+    img: np.ndarray, segmentation_method: str
+) -> np.ndarray:
+    """
+    Given an image, return its super-pixel segments, reusing a previously computed segmentation if the same
+    image (by content) was segmented with the same method before, e.g., when evaluating several explanation
+    methods on the same inputs. The cache is bounded to SEGMENTATION_CACHE_SIZE entries (least recently used
+    entries are evicted first) and can be emptied with clear_superpixel_cache().
+
+    Parameters
+    ----------
+    img: np.ndarray
+        CxWxH image array.
+    segmentation_method: string
+        Indicates the segmentation method, i.e. "slic" or "felzenszwalb".
+
+    Returns
+    -------
+    segments: np.ndarray
+        CxWxH segmented image array. The returned array is read-only since it is shared between calls.
+    """
+    img = np.ascontiguousarray(img)
+    key = (
+        hashlib.sha1(img.view(np.uint8)).hexdigest(),
+        img.shape,
+        img.dtype.str,
+        segmentation_method,
+    )
+    with _SEGMENTATION_CACHE_LOCK:
+        if key in _SEGMENTATION_CACHE:
+            _SEGMENTATION_CACHE.move_to_end(key)
+            return _SEGMENTATION_CACHE[key]
+
+    # Segment outside of the lock, such that other threads are not blocked meanwhile.
+    segments = get_superpixel_segments(
+        img=img, segmentation_method=segmentation_method
+    )
+    segments.setflags(write=False)
+    with _SEGMENTATION_CACHE_LOCK:
+        _SEGMENTATION_CACHE[key] = segments
+        while len(_SEGMENTATION_CACHE) > SEGMENTATION_CACHE_SIZE:
+            _SEGMENTATION_CACHE.popitem(last=False)
+    return segments
+
+
+def clear_superpixel_cache() -> None:
+    """Remove all cached super-pixel segmentations, see get_cached_superpixel_segments()."""
+    with _SEGMENTATION_CACHE_LOCK:
+        _SEGMENTATION_CACHE.clear()
+
+
+def calculate_segment_means(
+    a: np.ndarray, segments: np.ndarray, nr_segments: int
+) -> np.ndarray:
+    """
+    Calculate the mean attribution of each segment, i.e., np.mean(a[:, segments == s]) for every segment label
+    s in range(nr_segments), in a single pass over the attribution.
+
+    Parameters
+    ----------
+    a: np.ndarray
+        Attribution array, where the shape of all but the first axis matches the segments.
+    segments: np.ndarray
+        Array of (non-negative) integer segment labels.
+    nr_segments: int
+        The number of segments.
+
+    Returns
+    -------
+    np.ndarray
+        The mean attribution per segment, nan for labels without any pixel.
+    """
+    labels = segments.reshape(-1)
+    pixel_sums = a.reshape(a.shape[0], -1).sum(axis=0, dtype=np.float64)
+    minlength = max(nr_segments, int(labels.max()) + 1)
+    sums = np.bincount(labels, weights=pixel_sums, minlength=minlength)[:nr_segments]
+    counts = np.bincount(labels, minlength=minlength)[:nr_segments] * a.shape[0]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return sums / counts
+
+
 def get_baseline_value(
     value: Union[float, int, str, np.array],
     arr: np.ndarray,
@@ -559,6 +665,114 @@ def get_nr_patches(
     return np.prod(shape) // np.prod(patch_size)
 
 
+def calculate_patch_sums(
+    a: np.ndarray,
+    patch_size: Union[int, Sequence[int]],
+    indexed_axes: Sequence[int],
+) -> np.ndarray:
+    """
+    Sum attributions over the patch that starts at each coordinate of the indexed axes.
+
+    All patch sums are computed at once with a summed-area table, built separably along
+    each indexed axis. Patches that extend beyond the array border are zero-padded, and
+    axes of a that are not indexed are summed over.
+
+    Parameters
+    ----------
+    a: np.ndarray
+        The attributions of a single instance.
+    patch_size: int, sequence
+        One- or multidimensional patch size.
+    indexed_axes: sequence
+        The dimensions of a that are patched. These need to be consecutive,
+        and either include the first or last dimension of array.
+
+    Returns
+    -------
+    np.ndarray
+        Patch sums with the shape of a over indexed_axes, e.g. patch_sums[i, j] is the
+        sum of the patch with top-left coordinates (i, j).
+    """
+    indexed_axes = np.sort(np.array(indexed_axes))
+    asserts.assert_indexed_axes(a, indexed_axes)
+
+    patch_size = np.broadcast_to(patch_size, (len(indexed_axes),))
+
+    # Reduce the non-indexed axes, such that one value per patchable coordinate remains.
+    patch_sums = np.sum(
+        a,
+        axis=tuple([ax for ax in range(a.ndim) if ax not in indexed_axes]),
+        dtype=np.float64,
+    )
+
+    for ax, size in enumerate(patch_size):
+        size = int(size)
+        n = patch_sums.shape[ax]
+
+        # Zero-pad for patches beyond the border and prepend zeros for the summed-area table.
+        pad_width = [(0, 0) for _ in range(patch_sums.ndim)]
+        pad_width[ax] = (1, size - 1)
+        table = np.cumsum(np.pad(patch_sums, pad_width), axis=ax)
+
+        patch_sums = np.take(table, np.arange(size, size + n), axis=ax) - np.take(
+            table, np.arange(0, n), axis=ax
+        )
+
+    return patch_sums
+
+
+def get_non_overlapping_patches(
+    order: np.ndarray,
+    patch_size: Union[int, Sequence[int]],
+    shape: Tuple[int, ...],
+    max_patches: Optional[int] = None,
+) -> List[Tuple[int, ...]]:
+    """
+    Greedily select patches in the given order, skipping those that overlap a selected patch.
+
+    Overlaps are checked on a boolean occupancy grid of the patched axes only.
+
+    Parameters
+    ----------
+    order: np.ndarray
+        Flat indices into shape, giving the top-left coordinates of the candidate patches in
+        order of priority.
+    patch_size: int, sequence
+        One- or multidimensional patch size.
+    shape: tuple
+        The shape of the patched axes.
+    max_patches: integer, optional
+        Stop once this number of patches is selected. If None, all non-overlapping patches are selected.
+
+    Returns
+    -------
+    list
+        The top-left coordinates of the selected patches, in order of selection.
+    """
+    patch_size = tuple(int(p) for p in np.broadcast_to(patch_size, (len(shape),)))
+
+    # Patches may extend beyond the border of shape.
+    occupancy = np.zeros(
+        tuple([s + p - 1 for s, p in zip(shape, patch_size)]), dtype=bool
+    )
+
+    patches: List[Tuple[int, ...]] = []
+    for coords in zip(*np.unravel_index(order, shape)):
+        patch_slice = tuple(
+            [slice(int(c), int(c) + p) for c, p in zip(coords, patch_size)]
+        )
+        if occupancy[patch_slice].any():
+            continue
+
+        occupancy[patch_slice] = True
+        patches.append(tuple([int(c) for c in coords]))
+
+        if max_patches is not None and len(patches) >= max_patches:
+            break
+
+    return patches
+
+
 def _pad_array(
     arr: np.array,
     pad_width: Union[int, Sequence[int], Sequence[Tuple[int]], List[Tuple[int, int]]],
@@ -995,3 +1209,275 @@ def calculate_auc(values: np.array, dx: int = 1):
         Definite integral of values.
     """
     return np.trapz(np.array(values), dx=dx)
+
+
+@contextlib.contextmanager
+def limit_threads(n_threads: Optional[int]) -> Iterator[None]:
+    """
+    Limit the number of torch threads and of the BLAS and OpenMP thread pools within the context.
+    The BLAS and OpenMP thread pools are limited with threadpoolctl, if it is installed.
+
+    Parameters
+    ----------
+    n_threads: integer, optional
+        The maximum number of threads. If None, the thread limits are left unchanged.
+
+    Returns
+    -------
+    iterator
+        The context in which the limits apply.
+    """
+    with contextlib.ExitStack() as stack:
+        if n_threads is not None:
+            if util.find_spec("threadpoolctl"):
+                from threadpoolctl import threadpool_limits
+
+                stack.enter_context(threadpool_limits(limits=n_threads))
+            if util.find_spec("torch"):
+                stack.callback(torch.set_num_threads, torch.get_num_threads())
+                torch.set_num_threads(n_threads)
+        yield
+
+
+def to_numpy(x: Any) -> np.ndarray:
+    """
+    Convert a torch or tensorflow tensor, or an array-like, to a np.ndarray.
+    A np.ndarray, e.g. a np.memmap, is returned as is.
+
+    Parameters
+    ----------
+    x: any
+        The tensor or array-like.
+
+    Returns
+    -------
+    np.ndarray
+        The array.
+    """
+    if isinstance(x, np.ndarray):
+        return x
+    if hasattr(x, "detach"):
+        x = x.detach().cpu()
+    if hasattr(x, "numpy"):
+        x = x.numpy()
+    return np.asarray(x)
+
+
+def iterate_batches(
+    data: Union[Dict[str, Any], Iterable[Any]],
+    chunk_size: int = 256,
+    a_batch: Optional[np.ndarray] = None,
+) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Iterate over a data set in batches of np.ndarrays, without loading the whole data set into memory.
+
+    The data set is either
+    1) a dictionary with the keys "x_batch", "y_batch" and optionally "a_batch" and "s_batch", whose values
+    are arrays, np.memmap or paths of .npy files (memory-mapped on load), which are sliced into chunks of
+    chunk_size instances, or
+    2) an iterable of batches, e.g., a torch DataLoader, a tf.data.Dataset or a generator, where each batch is
+    a tuple (x_batch, y_batch[, a_batch[, s_batch]]) or a dictionary with the keys listed above.
+
+    Parameters
+    ----------
+    data: dict, iterable
+        The data set.
+    chunk_size: integer
+        The number of instances per batch when slicing arrays, default=256.
+    a_batch: np.ndarray, optional
+        Pre-computed attributions of the whole data set, sliced alongside the batches of the data set.
+
+    Returns
+    -------
+    iterator
+        The batches as dictionaries with the keys "x_batch", "y_batch" and optionally "a_batch" and "s_batch".
+    """
+    keys = ["x_batch", "y_batch", "a_batch", "s_batch"]
+
+    if isinstance(data, dict):
+        arrays = {
+            key: np.load(value, mmap_mode="r")
+            if isinstance(value, (str, os.PathLike))
+            else value
+            for key, value in data.items()
+            if value is not None
+        }
+        n_instances = len(arrays["x_batch"])
+        batches: Iterable[Dict[str, Any]] = (
+            {key: value[start : start + chunk_size] for key, value in arrays.items()}
+            for start in range(0, n_instances, chunk_size)
+        )
+    else:
+        batches = (
+            batch if isinstance(batch, dict) else dict(zip(keys, batch))
+            for batch in data
+        )
+
+    offset = 0
+    for batch in batches:
+        batch = {
+            key: to_numpy(value) for key, value in batch.items() if value is not None
+        }
+        n_instances = len(batch["x_batch"])
+        if a_batch is not None:
+            batch["a_batch"] = a_batch[offset : offset + n_instances]
+        offset += n_instances
+        yield batch
+
+
+def get_data_fingerprint(
+    data: Union[Dict[str, Any], Iterable[Any]], batch: Optional[Dict[str, np.ndarray]]
+) -> Dict[str, Any]:
+    """
+    Get a fingerprint of a data set, which identifies it among the data sets a checkpoint may be resumed on.
+
+    Parameters
+    ----------
+    data: dict, iterable
+        The data set, see iterate_batches.
+    batch: dict, optional
+        The first batch of the data set, as yielded by iterate_batches, or None if the data set is empty.
+
+    Returns
+    -------
+    dict
+        The number of instances, or None if it is not known before iterating the data set, and the hash of
+        the arrays of the first batch, e.g., the inputs and labels.
+    """
+    n_instances = None
+    if isinstance(data, dict):
+        x_batch = data["x_batch"]
+        if isinstance(x_batch, (str, os.PathLike)):
+            x_batch = np.load(x_batch, mmap_mode="r")
+        n_instances = len(x_batch)
+
+    first_chunk = None
+    if batch is not None:
+        first_chunk = hashlib.sha1()
+        for key in sorted(batch):
+            value = np.ascontiguousarray(batch[key])
+            first_chunk.update(f"{key}{value.shape}{value.dtype.str}".encode())
+            if value.dtype == object:
+                first_chunk.update(repr(value.tolist()).encode())
+            else:
+                first_chunk.update(value.view(np.uint8))
+
+    return {
+        "n_instances": n_instances,
+        "first_chunk": None if first_chunk is None else first_chunk.hexdigest(),
+    }
+
+
+def get_value_fingerprint(value: Any) -> str:
+    """
+    Get a representation of a parameter value that is stable across processes, e.g., functions are
+    represented by their qualified name instead of their address.
+
+    Parameters
+    ----------
+    value: any
+        The value.
+
+    Returns
+    -------
+    string
+        The representation of the value.
+    """
+    if isinstance(value, ProfiledFunction):
+        value = value.func
+    if isinstance(value, functools.partial):
+        return (
+            f"partial({get_value_fingerprint(value.func)}, {get_value_fingerprint(value.args)}, "
+            f"{get_value_fingerprint(value.keywords)})"
+        )
+    if isinstance(value, np.ndarray):
+        return f"ndarray({hashlib.sha1(np.ascontiguousarray(value).view(np.uint8)).hexdigest()})"
+    if isinstance(value, dict):
+        items = ", ".join(
+            f"{get_value_fingerprint(k)}: {get_value_fingerprint(v)}"
+            for k, v in sorted(value.items(), key=lambda item: repr(item[0]))
+        )
+        return f"{{{items}}}"
+    if isinstance(value, (list, tuple)):
+        return f"{type(value).__name__}({', '.join(get_value_fingerprint(v) for v in value)})"
+    if value is None or isinstance(value, (bool, int, float, str, np.generic)):
+        return repr(value)
+    if callable(value):
+        return f"{getattr(value, '__module__', '')}.{getattr(value, '__qualname__', type(value).__qualname__)}"
+    return type(value).__qualname__
+
+
+def get_rng_state() -> Dict[str, Any]:
+    """
+    Get the states of the random number generators of python, numpy and, if installed, torch.
+
+    Returns
+    -------
+    dict
+        The random number generator states.
+    """
+    state = {"python": random.getstate(), "numpy": np.random.get_state()}
+    if util.find_spec("torch"):
+        state["torch"] = torch.get_rng_state()
+    return state
+
+
+def set_rng_state(state: Dict[str, Any]) -> None:
+    """
+    Set the states of the random number generators of python, numpy and, if installed, torch.
+
+    Parameters
+    ----------
+    state: dict
+        The random number generator states, see get_rng_state.
+
+    Returns
+    -------
+    None
+    """
+    random.setstate(state["python"])
+    np.random.set_state(state["numpy"])
+    if "torch" in state and util.find_spec("torch"):
+        torch.set_rng_state(state["torch"])
+
+
+def save_checkpoint(path: Union[str, os.PathLike], checkpoint: Dict[str, Any]) -> None:
+    """
+    Save a checkpoint to a file. The file is replaced atomically, an interruption leaves the previous
+    checkpoint intact.
+
+    Parameters
+    ----------
+    path: string
+        The checkpoint file.
+    checkpoint: dict
+        The checkpoint.
+
+    Returns
+    -------
+    None
+    """
+    path_tmp = f"{os.fspath(path)}.tmp"
+    with open(path_tmp, "wb") as f:
+        pickle.dump(checkpoint, f)
+    os.replace(path_tmp, path)
+
+
+def load_checkpoint(path: Union[str, os.PathLike]) -> Optional[Dict[str, Any]]:
+    """
+    Load a checkpoint from a file.
+
+    Parameters
+    ----------
+    path: string
+        The checkpoint file.
+
+    Returns
+    -------
+    dict, optional
+        The checkpoint, or None if the file does not exist.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        return pickle.load(f)
@@ -267,6 +267,44 @@ def warn_perturbation_caused_no_change(x: np.ndarray, x_perturbed: np.ndarray) -
         )
 
 
+def warn_budget_exceeded(message: str) -> None:
+    """
+    Warn that an evaluation was stopped as it would exceed the forward-pass budget.
+
+    Parameters
+    ----------
+    message: string
+        The message of the exceeded budget.
+
+    Returns
+    -------
+    None
+    """
+    warnings.warn(
+        f"{message} The remaining evaluation of the instance(s) is skipped and scored with np.nan."
+    )
+
+
+def warn_sequential_layer_randomisation(layer_order: str) -> None:
+    """
+    Warn that the layers are randomised sequentially although n_jobs is set, as the random layer generator of
+    the model is not reproducible in worker processes for the given order.
+
+    Parameters
+    ----------
+    layer_order: string
+        The order of the layer randomisation.
+
+    Returns
+    -------
+    None
+    """
+    warnings.warn(
+        f"The randomised layers of the model are not reproducible across processes for layer_order="
+        f"'{layer_order}'. The layers are evaluated sequentially, ignoring 'n_jobs'."
+    )
+
+
 def warn_max_size() -> None:
     """
     Warns if the ratio is smaller than the maximum size, for attribution_localisaiton metric.
@@ -5,14 +5,23 @@
 # You should have received a copy of the GNU Lesser General Public License along with Quantus. If not, see <https://www.gnu.org/licenses/>.
 # Quantus project URL: <https://github.com/understandable-machine-intelligence-lab/Quantus>.
 
+import contextlib
 import inspect
+import math
+import multiprocessing
+import os
 import re
+import time
+import tracemalloc
 from abc import abstractmethod
 from collections.abc import Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from typing import (
     Any,
     Callable,
     Dict,
+    Iterable,
     Sequence,
     Optional,
     Tuple,
@@ -20,6 +29,7 @@ from typing import (
     Collection,
     List,
     Set,
+    ContextManager,
 )
 import matplotlib.pyplot as plt
 import numpy as np
@@ -29,6 +39,13 @@ from quantus.helpers import asserts
 from quantus.helpers import utils
 from quantus.helpers import warn
 from quantus.helpers.model.model_interface import ModelInterface
+from quantus.helpers.model.forward_pass_ledger import (
+    ForwardPassBudgetExceeded,
+    ForwardPassLedger,
+)
+from quantus.helpers.model.prediction_broker import PredictionBroker
+from quantus.helpers.profiling import Profiler, ProfiledFunction, profile_phase
+from quantus.helpers.result_store import ResultStore
 from quantus.helpers.enums import (
     ModelType,
     DataType,
@@ -78,6 +95,16 @@ class Metric:
         default_plot_func: Optional[Callable],
         disable_warnings: bool,
         display_progressbar: bool,
+        executor: str = "serial",
+        n_workers: Optional[int] = None,
+        n_threads_per_worker: Optional[int] = 1,
+        prediction_batch_size: Optional[int] = None,
+        max_stored_calls: Optional[int] = None,
+        scores_spill_dir: Optional[str] = None,
+        profile: bool = False,
+        max_forward_samples: Optional[int] = None,
+        max_forward_seconds: Optional[float] = None,
+        on_budget_exceeded: str = "raise",
         **kwargs,
     ):
         """
@@ -93,8 +120,8 @@ class Metric:
         - general_preprocess(): Prepares all necessary data structures for evaluation.
                                 Will call custom_preprocess() at the end.
 
-        The content of evaluation_scores will be appended to all_evaluation_scores (list) at the end of
-        the evaluation call.
+        The content of evaluation_scores will be appended to all_evaluation_scores (a ResultStore) at the
+        end of the evaluation call.
 
         Parameters
         ----------
@@ -116,6 +143,43 @@ class Metric:
             Indicates whether the warnings are printed.
         display_progressbar: boolean
             Indicates whether a tqdm-progress-bar is printed.
+        executor: string
+            How evaluate_instance() is run over the instances: "serial", "thread" (a thread pool) or
+            "process" (a process pool), default="serial". With a process pool, the metric and the model
+            must be picklable and evaluate_instance() must not rely on state shared between instances.
+            Metrics that evaluate whole batches or implement their own __call__() ignore it.
+        n_workers: integer, optional
+            The number of worker threads or processes. If None, the number of CPUs is used, default=None.
+        n_threads_per_worker: integer, optional
+            The number of torch and BLAS threads of each worker, to avoid oversubscribing the CPUs.
+            If None, the thread limits are left unchanged, default=1.
+        prediction_batch_size: integer, optional
+            With executor="thread", the model.predict() calls of concurrently evaluated instances are
+            coalesced into forward passes of up to this many samples by a PredictionBroker. If None, each
+            call is its own forward pass, default=None.
+        max_stored_calls: integer, optional
+            The number of calls whose evaluation scores are retained in all_evaluation_scores. If None, all
+            are retained, default=None.
+        scores_spill_dir: string, optional
+            A directory to which the evaluation scores of calls beyond max_stored_calls are saved as .npz
+            files, named after the metric, the process id and a random suffix. If None, they are dropped,
+            default=None.
+        profile: boolean
+            Indicates whether the wall time, calls, batch sizes and bytes of the phases of each call are
+            recorded in profiler, e.g., general_preprocess, explain_func, perturb_func, model.predict and
+            similarity_func, default=False. See profiler.report() and profiler.to_chrome_trace().
+        max_forward_samples: integer, optional
+            The budget of samples of the forward passes of the model (predict() and
+            get_hidden_representations()) in a call. If None, it is not limited, default=None.
+            The forward passes of each call are counted in ledger, see ledger.report().
+        max_forward_seconds: float, optional
+            The budget of wall time in seconds of a call, after which no forward pass is started. If None, it
+            is not limited, default=None.
+        on_budget_exceeded: string
+            What happens when a forward pass would exceed the budget: "raise" raises a
+            ForwardPassBudgetExceeded error, "nan" warns and scores the instances that are not completed
+            within the budget with np.nan, default="raise". With executor="process", the budget applies
+            per worker.
         kwargs: optional
             Keyword arguments.
         """
@@ -123,6 +187,16 @@ class Metric:
         warn.deprecation_warnings(kwargs)
         warn.check_kwargs(kwargs)
 
+        # Asserts.
+        asserts.assert_executor(executor=executor)
+        if n_workers is not None:
+            asserts.assert_n_jobs(n_jobs=n_workers)
+        asserts.assert_on_budget_exceeded(on_budget_exceeded=on_budget_exceeded)
+        if prediction_batch_size is not None:
+            asserts.assert_prediction_batch_size(
+                prediction_batch_size=prediction_batch_size
+            )
+
         self.abs = abs
         self.normalise = normalise
         self.return_aggregate = return_aggregate
@@ -136,11 +210,29 @@ class Metric:
         self.default_plot_func = default_plot_func
         self.disable_warnings = disable_warnings
         self.display_progressbar = display_progressbar
+        self.executor = executor
+        self.n_workers = n_workers
+        self.n_threads_per_worker = n_threads_per_worker
+        self.prediction_batch_size = prediction_batch_size
 
         self.a_axes: Sequence[int] = None
 
         self.evaluation_scores: Any = []
-        self.all_evaluation_scores: Any = []
+        self.all_evaluation_scores: Any = ResultStore(
+            max_calls=max_stored_calls,
+            spill_dir=scores_spill_dir,
+            name=self.__class__.__name__,
+        )
+
+        self._streaming = False
+        self._stream_data: Optional[Dict[str, Any]] = None
+
+        self.profiler: Optional[Profiler] = Profiler() if profile else None
+
+        self.ledger = ForwardPassLedger(
+            max_samples=max_forward_samples, max_seconds=max_forward_seconds
+        )
+        self.on_budget_exceeded = on_budget_exceeded
 
     def __call__(
         self,
@@ -168,8 +260,8 @@ class Metric:
         evaluate_instance() on each instance, and saves results to evaluation_scores.
         Calls custom_postprocess() afterwards. Finally returns evaluation_scores.
 
-        The content of evaluation_scores will be appended to all_evaluation_scores (list) at the end of
-        the evaluation call.
+        The content of evaluation_scores will be stored in all_evaluation_scores (a ResultStore) at the end
+        of the evaluation call.
 
         Parameters
         ----------
@@ -240,35 +332,248 @@ class Metric:
         """
 
         # Run deprecation warnings.
-        warn.deprecation_warnings(kwargs)
-        warn.check_kwargs(kwargs)
+        with profile_phase(self.profiler, "warn"):
+            warn.deprecation_warnings(kwargs)
+            warn.check_kwargs(kwargs)
 
-        data = self.general_preprocess(
-            model=model,
-            x_batch=x_batch,
-            y_batch=y_batch,
-            a_batch=a_batch,
-            s_batch=s_batch,
-            channel_first=channel_first,
-            explain_func=explain_func,
-            explain_func_kwargs=explain_func_kwargs,
-            model_predict_kwargs=model_predict_kwargs,
-            softmax=softmax,
-            device=device,
-            custom_batch=custom_batch,
-        )
+        with profile_phase(self.profiler, "general_preprocess"):
+            data = self.general_preprocess(
+                model=model,
+                x_batch=x_batch,
+                y_batch=y_batch,
+                a_batch=a_batch,
+                s_batch=s_batch,
+                channel_first=channel_first,
+                explain_func=explain_func,
+                explain_func_kwargs=explain_func_kwargs,
+                model_predict_kwargs=model_predict_kwargs,
+                softmax=softmax,
+                device=device,
+                custom_batch=custom_batch,
+            )
 
         self.evaluation_scores = [None for _ in x_batch]
 
         # Evaluate with instance given the metric.
-        iterator = self.get_instance_iterator(data=data)
-        for id_instance, data_instance in iterator:
-            result = self.evaluate_instance(**data_instance)
-            self.evaluation_scores[id_instance] = result
+        if self.executor == "serial":
+            iterator = self.get_instance_iterator(data=data)
+            for id_instance, data_instance in iterator:
+                with profile_phase(self.profiler, "evaluate_instance", n_samples=1):
+                    result = self.evaluate_within_budget(
+                        self.evaluate_instance, n_instances=None, **data_instance
+                    )
+                self.evaluation_scores[id_instance] = result
+        else:
+            self.evaluation_scores = self.evaluate_instances_parallel(data=data)
+
+        # When streaming, post-processing is deferred until all chunks are evaluated.
+        if self._streaming:
+            self._stream_data = data
+            return self.evaluation_scores
 
         # Call custom post-processing.
-        self.custom_postprocess(**data)
+        with profile_phase(self.profiler, "custom_postprocess"):
+            self.custom_postprocess(**data)
+
+        self.aggregate_evaluation_scores()
+
+        self.all_evaluation_scores.append(self.evaluation_scores)
+
+        return self.evaluation_scores
+
+    def evaluate_stream(
+        self,
+        model,
+        data: Union[Dict[str, Any], Iterable[Any]],
+        chunk_size: int = 256,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_every: int = 1,
+        **kwargs,
+    ) -> Union[int, float, list, dict, Collection[Any], None]:
+        """
+        Evaluate the metric on a data set that is streamed chunk by chunk, e.g., a torch DataLoader, a
+        tf.data.Dataset, a generator or memory-mapped arrays, instead of being held in memory as a whole.
+
+        Each chunk is evaluated by a call of the metric and the scores are accumulated. Post-processing and
+        aggregation run once on the accumulated scores, with the data of the last chunk. Metrics that relate
+        instances to each other, e.g., Consistency or Sufficiency, do so within each chunk.
+
+        Parameters
+        ----------
+        model: torch.nn.Module, tf.keras.Model
+            A torch or tensorflow model that is subject to explanation.
+        data: dict, iterable
+            The data set, see utils.iterate_batches: a dictionary of arrays, np.memmap or .npy paths with the
+            keys "x_batch", "y_batch" and optionally "a_batch" and "s_batch", or an iterable of batches.
+        chunk_size: integer
+            The number of instances per chunk when slicing arrays, default=256.
+        checkpoint_path: string, optional
+            A file to which the scores of the evaluated chunks and the random number generator states at the
+            start of each chunk are saved. If the file exists, the evaluation resumes from it and skips the
+            chunks it holds, or returns its scores if the evaluation was completed. Every chunk that is
+            evaluated on resume starts from its saved random number generator state, so the scores equal
+            those of an uninterrupted evaluation. The data set must yield the same chunks on resume: a
+            ValueError is raised if the number of instances, the first chunk or the parameters of the
+            metric differ from those of the checkpoint, see get_checkpoint_fingerprint.
+            If None, no checkpoint is saved, default=None.
+        checkpoint_every: integer
+            The number of chunks evaluated between two saves of the checkpoint, default=1.
+        kwargs: optional
+            Keyword arguments of the call of the metric, e.g., explain_func and explain_func_kwargs.
+
+        Returns
+        -------
+        evaluation_scores: list
+            The evaluation scores of the whole data set.
+        """
+        batches = utils.iterate_batches(data=data, chunk_size=chunk_size)
+        batch = next(batches, None)
+
+        checkpoint = None
+        fingerprint = None
+        if checkpoint_path is not None:
+            fingerprint = self.get_checkpoint_fingerprint(data=data, batch=batch)
+            checkpoint = utils.load_checkpoint(path=checkpoint_path)
+            if checkpoint is not None and (
+                checkpoint["metric"] != self.__class__.__name__
+                or checkpoint["chunk_size"] != chunk_size
+                or checkpoint.get("fingerprint") != fingerprint
+            ):
+                mismatches = [
+                    key
+                    for key in fingerprint
+                    if (checkpoint.get("fingerprint") or {}).get(key) != fingerprint[key]
+                ]
+                raise ValueError(
+                    f"The checkpoint '{checkpoint_path}' was saved by {checkpoint['metric']} with "
+                    f"chunk_size={checkpoint['chunk_size']}, it cannot be resumed by "
+                    f"{self.__class__.__name__} with chunk_size={chunk_size}"
+                    + (
+                        f", as the run differs in: {', '.join(mismatches)}."
+                        if mismatches
+                        else "."
+                    )
+                )
+        if checkpoint is None:
+            checkpoint = {
+                "metric": self.__class__.__name__,
+                "chunk_size": chunk_size,
+                "fingerprint": fingerprint,
+                "chunk_scores": [],
+                "rng_states": [utils.get_rng_state()],
+                "evaluation_scores": None,
+            }
+        elif checkpoint["evaluation_scores"] is not None:
+            # The evaluation was completed.
+            self.evaluation_scores = checkpoint["evaluation_scores"]
+            self.all_evaluation_scores.append(self.evaluation_scores)
+            return self.evaluation_scores
+
+        return_aggregate = self.return_aggregate
+        all_evaluation_scores = self.all_evaluation_scores
+        chunk_scores = checkpoint["chunk_scores"]
+        rng_states = checkpoint["rng_states"]
+        evaluation_scores = None
+        stream_data = None
+
+        # Metrics with their own __call__ finish and store each chunk, keep one entry for the stream.
+        self.ledger.reset()
+        self.all_evaluation_scores = []
+        self.return_aggregate = False
+        self._streaming = True
+        try:
+            id_chunk = 0
+            while batch is not None:
+                next_batch = next(batches, None)
+
+                # The last chunk is always evaluated, post-processing needs its data.
+                if id_chunk < len(chunk_scores) and next_batch is not None:
+                    scores = chunk_scores[id_chunk]
+                else:
+                    # Start each chunk from the random number generator state of the original run.
+                    if id_chunk < len(rng_states):
+                        utils.set_rng_state(state=rng_states[id_chunk])
+                    self._stream_data = None
+                    scores = self(model=model, **batch, **kwargs)
+                    stream_data = self._stream_data
+
+                    if id_chunk >= len(chunk_scores):
+                        chunk_scores.append(scores)
+                        rng_states.append(utils.get_rng_state())
+                        if checkpoint_path is not None and (
+                            len(chunk_scores) % checkpoint_every == 0
+                        ):
+                            utils.save_checkpoint(
+                                path=checkpoint_path, checkpoint=checkpoint
+                            )
+
+                evaluation_scores = _extend_scores(evaluation_scores, scores)
+                batch = next_batch
+                id_chunk += 1
+        finally:
+            self.all_evaluation_scores = all_evaluation_scores
+            self.return_aggregate = return_aggregate
+            self._streaming = False
+            self._stream_data = None
+
+        self.evaluation_scores = evaluation_scores
+        if stream_data is not None:
+            self.custom_postprocess(**stream_data)
+
+        self.aggregate_evaluation_scores()
+
+        if checkpoint_path is not None:
+            checkpoint["evaluation_scores"] = self.evaluation_scores
+            utils.save_checkpoint(path=checkpoint_path, checkpoint=checkpoint)
+
+        self.all_evaluation_scores.append(self.evaluation_scores)
+
+        return self.evaluation_scores
+
+    def get_checkpoint_fingerprint(
+        self, data: Union[Dict[str, Any], Iterable[Any]], batch: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Get the fingerprint of an evaluation that a checkpoint of evaluate_stream is saved with and
+        checked against on resume.
+
+        Parameters
+        ----------
+        data: dict, iterable
+            The data set, see utils.iterate_batches.
+        batch: dict, optional
+            The first batch of the data set, or None if the data set is empty.
+
+        Returns
+        -------
+        dict
+            The number of instances (None for iterables of batches, whose length is not known before
+            iterating them), the hash of the first chunk, i.e., its inputs, labels and optionally attributions
+            and segmentations, and the initialisation parameters of the metric that affect its scores.
+        """
+        init_params: Dict[str, Any] = {}
+        for cls in type(self).__mro__:
+            if "__init__" not in cls.__dict__ or cls is object:
+                continue
+            for name in inspect.signature(cls.__dict__["__init__"]).parameters:
+                if name in ["self", "args", "kwargs"] + _CHECKPOINT_EXCLUDED_PARAMS:
+                    continue
+                init_params.setdefault(
+                    name, getattr(self, name, getattr(self, f"_{name}", None))
+                )
+        return {
+            **utils.get_data_fingerprint(data=data, batch=batch),
+            "init_params": utils.get_value_fingerprint(init_params),
+        }
+
+    def aggregate_evaluation_scores(self) -> None:
+        """
+        Aggregate evaluation_scores with aggregate_func, if return_aggregate is set.
 
+        Returns
+        -------
+        None
+        """
         if self.return_aggregate:
             if self.aggregate_func:
                 try:
@@ -286,9 +591,192 @@ class Metric:
                     "Specify an 'aggregate_func' (Callable) to aggregate evaluation scores."
                 )
 
-        self.all_evaluation_scores.append(self.evaluation_scores)
+    def estimate_cost(
+        self,
+        model,
+        x_batch: np.ndarray,
+        y_batch: Optional[np.ndarray],
+        a_batch: Optional[np.ndarray] = None,
+        s_batch: Optional[np.ndarray] = None,
+        n_instances: Optional[int] = None,
+        n_probe: int = 2,
+        batch_size: int = 64,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """
+        Estimate the cost of evaluating the metric on n_instances instances shaped like x_batch, from a dry
+        run on the first n_probe instances.
+
+        The dry run counts the forward passes of the model (see ledger), the calls of explain_func and the
+        peak memory allocated by NumPy and Python (with tracemalloc). It also times the run, after one
+        warm-up forward pass. The counts and the time are then extrapolated:
+        - samples of forward passes and explanations scale with the number of instances,
+        - forward passes and explain_func calls scale with get_number_of_evaluation_units(), except the
+          one explain_func call of general_preprocess(),
+        - the peak memory scales with the instances evaluated at once plus the input data.
+        The state of the metric, e.g., evaluation_scores, and the random number generator states are restored
+        after the dry run.
 
-        return self.evaluation_scores
+        Parameters
+        ----------
+        model: torch.nn.Module, tf.keras.Model
+            A torch or tensorflow model that is subject to explanation.
+        x_batch: np.ndarray
+            A np.ndarray which contains (a sample of) the input data.
+        y_batch: np.ndarray
+            A np.ndarray which contains the output labels of x_batch.
+        a_batch: np.ndarray, optional
+            A np.ndarray which contains pre-computed attributions of x_batch.
+        s_batch: np.ndarray, optional
+            A np.ndarray which contains segmentation masks of x_batch.
+        n_instances: integer, optional
+            The number of instances to estimate the cost for. If None, len(x_batch) is used, default=None.
+        n_probe: integer
+            The number of instances of the dry run, default=2.
+        batch_size: integer
+            The batch size of the estimated evaluation, default=64.
+        kwargs: optional
+            Keyword arguments of the call of the metric, e.g., explain_func and explain_func_kwargs.
+
+        Returns
+        -------
+        dict
+            The estimated number of forward passes and their samples, of explain_func calls and their
+            samples, the peak memory in bytes and the runtime in seconds, and the measurements of the dry run.
+        """
+        if n_instances is None:
+            n_instances = len(x_batch)
+        n_probe = min(n_probe, len(x_batch))
+        probe = {
+            "x_batch": x_batch[:n_probe],
+            "y_batch": None if y_batch is None else y_batch[:n_probe],
+            "a_batch": None if a_batch is None else a_batch[:n_probe],
+            "s_batch": None if s_batch is None else s_batch[:n_probe],
+        }
+
+        state = {
+            name: getattr(self, name)
+            for name in [
+                "evaluation_scores",
+                "all_evaluation_scores",
+                "return_aggregate",
+                "display_progressbar",
+                "profiler",
+                "ledger",
+            ]
+        }
+        rng_state = utils.get_rng_state()
+        was_tracing = tracemalloc.is_tracing()
+
+        self.all_evaluation_scores = []
+        self.return_aggregate = False
+        self.display_progressbar = False
+        self.profiler = Profiler()
+        self.ledger = ForwardPassLedger()
+        try:
+            # Warm up the model, the first forward pass is often much slower.
+            if model is not None:
+                channel_first = kwargs.get("channel_first")
+                if not isinstance(channel_first, bool):
+                    channel_first = utils.infer_channel_first(probe["x_batch"])
+                utils.get_wrapped_model(
+                    model=model,
+                    channel_first=channel_first,
+                    softmax=kwargs.get("softmax"),
+                    device=kwargs.get("device"),
+                    model_predict_kwargs=kwargs.get("model_predict_kwargs"),
+                ).predict(
+                    utils.make_channel_first(probe["x_batch"][:1], channel_first)
+                )
+
+            if was_tracing and hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+            elif not was_tracing:
+                tracemalloc.start()
+            traced_before, _ = tracemalloc.get_traced_memory()
+
+            start = time.perf_counter()
+            self(model=model, **probe, batch_size=n_probe, **kwargs)
+            elapsed = time.perf_counter() - start
+
+            _, traced_peak = tracemalloc.get_traced_memory()
+            peak_bytes = max(traced_peak - traced_before, 0)
+            forward_passes = self.ledger.report()
+            events = list(self.profiler.events)
+        finally:
+            if not was_tracing:
+                tracemalloc.stop()
+            for name in ["perturb_func", "similarity_func", "explain_func"]:
+                func = getattr(self, name, None)
+                if isinstance(func, ProfiledFunction):
+                    setattr(self, name, func.func)
+            for name, value in state.items():
+                setattr(self, name, value)
+            utils.set_rng_state(state=rng_state)
+
+        instance_scale = n_instances / n_probe
+        unit_scale = self.get_number_of_evaluation_units(
+            n_instances=n_instances, batch_size=batch_size
+        ) / self.get_number_of_evaluation_units(
+            n_instances=n_probe, batch_size=n_probe
+        )
+        memory_scale = min(batch_size, n_instances) / n_probe
+
+        # Attributions generated in general_preprocess() take one call per call of the metric.
+        preprocess = [
+            (event["start"], event["start"] + event["duration"])
+            for event in events
+            if event["name"] == "general_preprocess"
+        ]
+        explain_events = [event for event in events if event["name"] == "explain_func"]
+        n_explain_preprocess = sum(
+            any(start <= event["start"] <= end for start, end in preprocess)
+            for event in explain_events
+        )
+        n_explain_samples = sum(event["n_samples"] or 0 for event in explain_events)
+        data_bytes = sum(
+            value.nbytes for value in probe.values() if isinstance(value, np.ndarray)
+        )
+
+        return {
+            "n_instances": n_instances,
+            "n_forward_passes": math.ceil(
+                forward_passes["n_forward_passes"] * unit_scale
+            ),
+            "n_forward_samples": math.ceil(forward_passes["n_samples"] * instance_scale),
+            "n_explain_calls": n_explain_preprocess
+            + math.ceil((len(explain_events) - n_explain_preprocess) * unit_scale),
+            "n_explain_samples": math.ceil(n_explain_samples * instance_scale),
+            "peak_bytes": int(peak_bytes * memory_scale + data_bytes * instance_scale),
+            "runtime": elapsed * instance_scale,
+            "probe": {
+                "n_instances": n_probe,
+                "runtime": elapsed,
+                "peak_bytes": peak_bytes,
+                "forward_passes": forward_passes,
+                "n_explain_calls": len(explain_events),
+                "n_explain_samples": n_explain_samples,
+            },
+        }
+
+    def get_number_of_evaluation_units(self, n_instances: int, batch_size: int) -> int:
+        """
+        Get the number of units that a call on n_instances instances evaluates one by one, e.g., instances.
+        The forward passes and explain_func calls of a call scale with it, see estimate_cost().
+
+        Parameters
+        ----------
+        n_instances: integer
+            The number of instances.
+        batch_size: integer
+            The batch size.
+
+        Returns
+        -------
+        integer
+            The number of evaluation units.
+        """
+        return n_instances
 
     @abstractmethod
     def evaluate_instance(
@@ -407,6 +895,15 @@ class Metric:
                 model_predict_kwargs=model_predict_kwargs,
             )
 
+        # Count the forward passes of the call, of the whole stream when streaming.
+        if not self._streaming:
+            self.ledger.reset()
+        if isinstance(model, ModelInterface):
+            model.ledger = self.ledger
+
+        if self.profiler is not None:
+            explain_func = self.profile_functions(model=model, explain_func=explain_func)
+
         # Save as attribute, some metrics need it during processing.
         self.explain_func = explain_func
         if explain_func_kwargs is None:
@@ -434,7 +931,8 @@ class Metric:
         a_batch = utils.expand_attribution_channel(a_batch, x_batch)
 
         # Asserts.
-        asserts.assert_attributions(x_batch=x_batch, a_batch=a_batch)
+        with profile_phase(self.profiler, "asserts"):
+            asserts.assert_attributions(x_batch=x_batch, a_batch=a_batch)
 
         # Infer attribution axes for perturbation function.
         self.a_axes = utils.infer_attribution_axes(a_batch, x_batch)
@@ -450,7 +948,8 @@ class Metric:
         }
 
         # Call custom pre-processing from inheriting class.
-        custom_preprocess_dict = self.custom_preprocess(**data)
+        with profile_phase(self.profiler, "custom_preprocess"):
+            custom_preprocess_dict = self.custom_preprocess(**data)
 
         # Save data coming from custom preprocess to data dict.
         if custom_preprocess_dict:
@@ -461,19 +960,100 @@ class Metric:
         if data["custom_batch"] is None:
             del data["custom_batch"]
 
+        # Normalise and take absolute values of the attributions, if requested.
+        with profile_phase(self.profiler, "normalise_attributions"):
+            data["a_batch"] = self.normalise_attributions(a_batch=data["a_batch"])
+
+        return data
+
+    def evaluate_within_budget(
+        self, evaluate: Callable, n_instances: Optional[int], **kwargs
+    ) -> Any:
+        """
+        Runs evaluate_instance() or evaluate_batch(). If a forward pass would exceed the budget of the ledger
+        and on_budget_exceeded="nan", warns and returns np.nan for the instances instead.
+
+        Parameters
+        ----------
+        evaluate: callable
+            evaluate_instance() or evaluate_batch().
+        n_instances: integer, optional
+            The number of instances of a batch. None for a single instance.
+        kwargs: optional
+            Keyword arguments of evaluate.
+
+        Returns
+        -------
+        any
+            The evaluation result.
+        """
+        try:
+            return evaluate(**kwargs)
+        except ForwardPassBudgetExceeded as e:
+            if self.on_budget_exceeded == "raise":
+                raise
+            warn.warn_budget_exceeded(message=str(e))
+            if n_instances is None:
+                return np.nan
+            return [np.nan for _ in range(n_instances)]
+
+    def profile_functions(self, model: ModelInterface, explain_func: Callable) -> Callable:
+        """
+        Attach the profiler to the model and wrap explain_func, perturb_func and similarity_func, such that
+        their calls are recorded as phases.
+
+        Parameters
+        ----------
+        model: ModelInterface
+            The wrapped model of the call.
+        explain_func: callable
+            Callable generating attributions.
+
+        Returns
+        -------
+        callable
+            The wrapped explain_func, or explain_func itself if it is not callable or no profiler is set.
+        """
+        profiler = self.profiler
+        if profiler is None:
+            return explain_func
+        if isinstance(model, ModelInterface):
+            model.profiler = profiler
+        for name in ["perturb_func", "similarity_func"]:
+            func = getattr(self, name, None)
+            if callable(func):
+                setattr(self, name, profiler.wrap(name, func))
+        if not callable(explain_func):
+            return explain_func
+        return profiler.wrap("explain_func", explain_func, sample_arg="inputs")
+
+    def normalise_attributions(self, a_batch: np.ndarray) -> np.ndarray:
+        """
+        Normalise the attributions and take their absolute values, if normalise and abs are set.
+
+        Parameters
+        ----------
+        a_batch: np.ndarray
+            A np.ndarray which contains the attributions.
+
+        Returns
+        -------
+        np.ndarray
+            The normalised attributions.
+        """
         # Normalise with specified keyword arguments if requested.
         if self.normalise:
-            data["a_batch"] = self.normalise_func(
-                a=data["a_batch"],
-                normalise_axes=list(range(np.ndim(data["a_batch"])))[1:],
+            a_batch = self.normalise_func(
+                a=a_batch,
+                normalise_axes=list(range(np.ndim(a_batch)))[1:],
                 **self.normalise_func_kwargs,
             )
 
         # Take absolute if requested.
         if self.abs:
-            data["a_batch"] = np.abs(data["a_batch"])
+            a_batch = np.abs(a_batch)
 
-        return data
+        return a_batch
 
     def custom_preprocess(
         self,
@@ -635,6 +1215,8 @@ class Metric:
           as a simple value and the respective item key/value pair will be
           written to each iterator output dictionary.
 
+        The output dictionaries are created lazily, one per iteration, and data is not modified.
+
         Parameters
         ----------
         data: dict[str, any]
@@ -647,11 +1229,56 @@ class Metric:
 
         """
         n_instances = len(data["x_batch"])
+        single_value_kwargs, batched_value_kwargs = self.get_instance_kwargs(data=data)
+
+        # We lazily yield one dictionary per instance, holding views into the batched values.
+        data_instances = (
+            {
+                **single_value_kwargs,
+                **{key: value[id_instance] for key, value in batched_value_kwargs.items()},
+            }
+            for id_instance in range(n_instances)
+        )
+
+        iterator = tqdm(
+            enumerate(data_instances),
+            total=n_instances,
+            disable=not self.display_progressbar,  # Create progress bar if desired.
+            desc=f"Evaluating {self.__class__.__name__}",
+        )
+
+        return iterator
+
+    def get_instance_kwargs(
+        self, data: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Splits the data dictionary into the values shared by all instances and the batched values,
+        following the rules of get_instance_iterator(). The '_batch' suffix is removed from the keys
+        of the batched values.
+
+        Parameters
+        ----------
+        data: dict[str, any]
+            The data input dictionary.
+
+        Returns
+        -------
+        tuple
+            The shared keyword arguments and the batched keyword arguments.
+        """
+        n_instances = len(data["x_batch"])
+
+        single_value_kwargs: Dict[str, Any] = {}
+        batched_value_kwargs: Dict[str, Any] = {}
 
         for key, value in data.items():
-            # If data-value is not a Sequence or a string, create list of repeated values with length of n_instances.
+            # We remove the '_batch' suffix once for all instances, whatever the type of the value.
+            instance_key = re.sub("_batch", "", key)
+
+            # If data-value is not a Sequence or a string, pass the value to each instance.
             if not isinstance(value, (Sequence, np.ndarray)) or isinstance(value, str):
-                data[key] = [value for _ in range(n_instances)]
+                single_value_kwargs[instance_key] = value
 
             # If data-value is a sequence and ends with '_batch', only check for correct length.
             elif key.endswith("_batch"):
@@ -660,30 +1287,92 @@ class Metric:
                     raise ValueError(
                         f"'{key}' has incorrect length (expected: {n_instances}, is: {len(value)})"
                     )
+                batched_value_kwargs[instance_key] = value
 
-            # If data-value is a sequence and doesn't end with '_batch', create
-            # list of repeated sequences with length of n_instances.
+            # If data-value is a sequence and doesn't end with '_batch', pass the whole
+            # sequence to each instance.
             else:
-                data[key] = [value for _ in range(n_instances)]
+                single_value_kwargs[instance_key] = value
+
+        return single_value_kwargs, batched_value_kwargs
+
+    def evaluate_instances_parallel(self, data: Dict[str, Any]) -> List[Any]:
+        """
+        Evaluates all instances in data dictionary on a thread or process pool and returns the
+        evaluation results in input order.
+
+        The instances are dispatched in chunks of consecutive instances. Each process worker receives
+        the metric and the shared values once, and the batched values of its chunks as slices.
+
+        Parameters
+        ----------
+        data: dict[str, any]
+            The data input dictionary.
+
+        Returns
+        -------
+        list
+            The evaluation results.
+        """
+        n_instances = len(data["x_batch"])
+        single_value_kwargs, batched_value_kwargs = self.get_instance_kwargs(data=data)
 
-        # We create a list of dictionaries where each dictionary holds all data for a single instance.
-        # We remove the '_batch' suffix if present.
-        data_instances = [
+        n_workers = self.n_workers or os.cpu_count() or 1
+        chunk_size = max(1, math.ceil(n_instances / (4 * n_workers)))
+        chunks = [
             {
-                re.sub("_batch", "", key): value[id_instance]
-                for key, value in data.items()
+                key: value[start : start + chunk_size]
+                for key, value in batched_value_kwargs.items()
             }
-            for id_instance in range(n_instances)
+            for start in range(0, n_instances, chunk_size)
         ]
 
-        iterator = tqdm(
-            enumerate(data_instances),
+        executor: Executor
+        thread_limits: ContextManager
+        if self.executor == "thread":
+            # Threads share the thread pools of the process, limit them once for all workers.
+            thread_limits = utils.limit_threads(
+                n_threads=self.n_threads_per_worker
+            )
+            executor = ThreadPoolExecutor(max_workers=n_workers)
+            if self.prediction_batch_size is not None and isinstance(
+                single_value_kwargs.get("model"), ModelInterface
+            ):
+                single_value_kwargs["model"] = PredictionBroker(
+                    model=single_value_kwargs["model"],
+                    max_batch_size=self.prediction_batch_size,
+                )
+            evaluate_chunk = partial(
+                _evaluate_instance_chunk,
+                metric=self,
+                single_value_kwargs=single_value_kwargs,
+                n_threads=None,
+            )
+        else:
+            # Forked workers can deadlock on the thread pools of torch and tensorflow, hence spawn.
+            thread_limits = contextlib.nullcontext()
+            executor = ProcessPoolExecutor(
+                max_workers=n_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_instance_worker,
+                initargs=(self, single_value_kwargs),
+            )
+            evaluate_chunk = partial(
+                _evaluate_instance_chunk, n_threads=self.n_threads_per_worker
+            )
+
+        evaluation_scores = []
+        with thread_limits, executor, tqdm(
             total=n_instances,
-            disable=not self.display_progressbar,  # Create progress bar if desired.
+            disable=not self.display_progressbar,
             desc=f"Evaluating {self.__class__.__name__}",
-        )
+        ) as pbar:
+            # Executor.map returns the results in the order of the chunks.
+            for chunk_scores in executor.map(evaluate_chunk, chunks):
+                evaluation_scores.extend(chunk_scores)
+                pbar.update(len(chunk_scores))
 
-        return iterator
+        return evaluation_scores
 
     def custom_postprocess(
         self,
@@ -806,3 +1495,119 @@ class Metric:
             "Warning: 'all_results' has been renamed to 'all_evaluation_scores'. 'all_results' is removed in current version."
         )
         return self.all_evaluation_scores
+
+
+# Initialisation parameters that leave the scores unchanged, which a checkpoint may be resumed with.
+_CHECKPOINT_EXCLUDED_PARAMS = [
+    "default_plot_func",
+    "disable_warnings",
+    "display_progressbar",
+    "executor",
+    "n_workers",
+    "n_threads_per_worker",
+    "prediction_batch_size",
+    "max_stored_calls",
+    "scores_spill_dir",
+    "profile",
+]
+
+
+# The metric and the shared values of a process worker, set once by _init_instance_worker().
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def _init_instance_worker(metric: Metric, single_value_kwargs: Dict[str, Any]) -> None:
+    """
+    Stores the metric and the values shared by all instances in a process worker.
+
+    Parameters
+    ----------
+    metric: Metric
+        The metric whose evaluate_instance() is run.
+    single_value_kwargs: dict[str, any]
+        The keyword arguments shared by all instances.
+
+    Returns
+    -------
+    None
+    """
+    _WORKER_STATE["metric"] = metric
+    _WORKER_STATE["single_value_kwargs"] = single_value_kwargs
+
+
+def _evaluate_instance_chunk(
+    batched_value_kwargs: Dict[str, Any],
+    n_threads: Optional[int],
+    metric: Optional[Metric] = None,
+    single_value_kwargs: Optional[Dict[str, Any]] = None,
+) -> List[Any]:
+    """
+    Runs evaluate_instance() on each instance of a chunk of consecutive instances.
+
+    Parameters
+    ----------
+    batched_value_kwargs: dict[str, any]
+        The batched keyword arguments of the instances of the chunk.
+    n_threads: integer, optional
+        The number of torch and BLAS threads used while evaluating the chunk. If None, the thread limits
+        are left unchanged.
+    metric: Metric, optional
+        The metric whose evaluate_instance() is run. If None, the metric of the process worker is used.
+    single_value_kwargs: dict[str, any], optional
+        The keyword arguments shared by all instances. If None, those of the process worker are used.
+
+    Returns
+    -------
+    list
+        The evaluation results of the chunk.
+    """
+    if metric is None:
+        metric = _WORKER_STATE["metric"]
+        single_value_kwargs = _WORKER_STATE["single_value_kwargs"]
+
+    n_instances = len(next(iter(batched_value_kwargs.values())))
+    with utils.limit_threads(n_threads=n_threads), profile_phase(
+        metric.profiler, "evaluate_instance_chunk", n_samples=n_instances
+    ):
+        return [
+            metric.evaluate_within_budget(
+                metric.evaluate_instance,
+                n_instances=None,
+                **single_value_kwargs,
+                **{
+                    key: value[id_instance]
+                    for key, value in batched_value_kwargs.items()
+                },
+            )
+            for id_instance in range(n_instances)
+        ]
+
+
+def _extend_scores(evaluation_scores: Any, scores: Any) -> Any:
+    """
+    Extends the evaluation scores accumulated over chunks of a data set by the scores of one chunk.
+    Dictionaries of scores, e.g., per layer, are extended per key.
+
+    Parameters
+    ----------
+    evaluation_scores: list, dict, optional
+        The accumulated scores. If None, the scores of the first chunk are copied.
+    scores: list, np.ndarray, dict
+        The scores of one chunk.
+
+    Returns
+    -------
+    list, dict
+        The extended evaluation scores.
+    """
+    if isinstance(scores, dict):
+        if evaluation_scores is None:
+            evaluation_scores = {}
+        for key, value in scores.items():
+            evaluation_scores[key] = _extend_scores(evaluation_scores.get(key), value)
+        return evaluation_scores
+
+    if evaluation_scores is None:
+        evaluation_scores = []
+    evaluation_scores.extend(scores)
+    return evaluation_scores
@@ -10,15 +10,17 @@ import inspect
 import math
 import re
 from abc import abstractmethod
-from typing import Any, Callable, Dict, Optional, Sequence, Union
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 from tqdm.auto import tqdm
 
+from quantus.functions.perturb_func import perturb_batch
 from quantus.metrics.base import Metric
 from quantus.helpers import asserts
 from quantus.helpers import warn
 from quantus.helpers.model.model_interface import ModelInterface
+from quantus.helpers.profiling import profile_phase
 from quantus.helpers.enums import (
     ModelType,
     DataType,
@@ -135,8 +137,8 @@ class BatchedMetric(Metric):
         evaluate_instance() on each instance, and saves results to evaluation_scores.
         Calls custom_postprocess() afterwards. Finally returns evaluation_scores.
 
-        The content of evaluation_scores will be appended to all_evaluation_scores (list) at the end of
-        the evaluation call.
+        The content of evaluation_scores will be stored in all_evaluation_scores (a ResultStore) at the end
+        of the evaluation call.
 
         Parameters
         ----------
@@ -206,23 +208,25 @@ class BatchedMetric(Metric):
             >> scores = metric(model=model, x_batch=x_batch, y_batch=y_batch, a_batch=a_batch_saliency}
         """
         # Run deprecation warnings.
-        warn.deprecation_warnings(kwargs)
-        warn.check_kwargs(kwargs)
-
-        data = self.general_preprocess(
-            model=model,
-            x_batch=x_batch,
-            y_batch=y_batch,
-            a_batch=a_batch,
-            s_batch=s_batch,
-            custom_batch=custom_batch,
-            channel_first=channel_first,
-            explain_func=explain_func,
-            explain_func_kwargs=explain_func_kwargs,
-            model_predict_kwargs=model_predict_kwargs,
-            softmax=softmax,
-            device=device,
-        )
+        with profile_phase(self.profiler, "warn"):
+            warn.deprecation_warnings(kwargs)
+            warn.check_kwargs(kwargs)
+
+        with profile_phase(self.profiler, "general_preprocess"):
+            data = self.general_preprocess(
+                model=model,
+                x_batch=x_batch,
+                y_batch=y_batch,
+                a_batch=a_batch,
+                s_batch=s_batch,
+                custom_batch=custom_batch,
+                channel_first=channel_first,
+                explain_func=explain_func,
+                explain_func_kwargs=explain_func_kwargs,
+                model_predict_kwargs=model_predict_kwargs,
+                softmax=softmax,
+                device=device,
+            )
 
         # Create generator for generating batches.
         batch_generator = self.generate_batches(
@@ -232,28 +236,28 @@ class BatchedMetric(Metric):
 
         self.evaluation_scores = []
         for data_batch in batch_generator:
-            result = self.evaluate_batch(**data_batch)
+            with profile_phase(
+                self.profiler,
+                "evaluate_batch",
+                n_samples=len(data_batch["x_batch"]),
+            ):
+                result = self.evaluate_within_budget(
+                    self.evaluate_batch,
+                    n_instances=len(data_batch["x_batch"]),
+                    **data_batch,
+                )
             self.evaluation_scores.extend(result)
 
+        # When streaming, post-processing is deferred until all chunks are evaluated.
+        if self._streaming:
+            self._stream_data = data
+            return self.evaluation_scores
+
         # Call post-processing.
-        self.custom_postprocess(**data)
-
-        if self.return_aggregate:
-            if self.aggregate_func:
-                try:
-                    self.evaluation_scores = [
-                        self.aggregate_func(self.evaluation_scores)
-                    ]
-                except:
-                    print(
-                        "The aggregation of evaluation scores failed. Check that "
-                        "'aggregate_func' supplied is appropriate for the data "
-                        "in 'evaluation_scores'."
-                    )
-            else:
-                raise KeyError(
-                    "Specify an 'aggregate_func' (Callable) to aggregate evaluation scores."
-                )
+        with profile_phase(self.profiler, "custom_postprocess"):
+            self.custom_postprocess(**data)
+
+        self.aggregate_evaluation_scores()
 
         # Append content of last results to all results.
         self.all_evaluation_scores.append(self.evaluation_scores)
@@ -294,6 +298,46 @@ class BatchedMetric(Metric):
         """
         raise NotImplementedError()
 
+    def normalise_attributions(self, a_batch: np.ndarray) -> np.ndarray:
+        """
+        Normalise the attributions and take their absolute values, if normalise and abs are set.
+
+        Memory-mapped attributions are returned unchanged, they are normalised batch by batch in
+        generate_batches(), so that only one batch of them is read into memory at a time.
+
+        Parameters
+        ----------
+        a_batch: np.ndarray
+            A np.ndarray which contains the attributions.
+
+        Returns
+        -------
+        np.ndarray
+            The normalised attributions.
+        """
+        if isinstance(a_batch, np.memmap):
+            return a_batch
+        return super().normalise_attributions(a_batch=a_batch)
+
+    def get_number_of_evaluation_units(self, n_instances: int, batch_size: int) -> int:
+        """
+        Get the number of units that a call on n_instances instances evaluates one by one, i.e., batches.
+        Metrics whose evaluate_batch() evaluates instances one by one override it.
+
+        Parameters
+        ----------
+        n_instances: integer
+            The number of instances.
+        batch_size: integer
+            The batch size.
+
+        Returns
+        -------
+        integer
+            The number of batches.
+        """
+        return self.get_number_of_batches(n_instances=n_instances, batch_size=batch_size)
+
     @staticmethod
     def get_number_of_batches(n_instances: int, batch_size: int) -> int:
         """
@@ -394,6 +438,12 @@ class BatchedMetric(Metric):
                 for key, value in batched_value_kwargs.items()
             }
 
+            # Normalise memory-mapped attributions of this batch only.
+            if isinstance(batch.get("a_batch"), np.memmap):
+                batch["a_batch"] = super().normalise_attributions(
+                    a_batch=np.asarray(batch["a_batch"])
+                )
+
             # Yield batch dictionary including single value keyword arguments.
             yield {**batch, **single_value_kwargs}
 
@@ -527,6 +577,153 @@ class BatchedPerturbationMetric(BatchedMetric):
         """
         raise NotImplementedError()
 
+    @staticmethod
+    def get_sample_chunks(
+        nr_samples: int, batch_size: int, perturbation_batch_size: Optional[int]
+    ) -> List[range]:
+        """
+        Split the ids of nr_samples perturbation samples of a batch into chunks, such that the
+        samples of a chunk, stacked along the batch axis, hold at most perturbation_batch_size
+        inputs (but at least one sample). If perturbation_batch_size is None, each chunk holds one sample.
+
+        Parameters
+        ----------
+        nr_samples: integer
+            The number of perturbation samples drawn per batch.
+        batch_size: integer
+            The number of instances in the batch.
+        perturbation_batch_size: integer, optional
+            The maximum number of stacked perturbed inputs per chunk.
+
+        Returns
+        -------
+        list
+            The ranges of sample ids of each chunk.
+        """
+        if perturbation_batch_size is None:
+            nr_samples_per_chunk = 1
+        else:
+            nr_samples_per_chunk = max(1, perturbation_batch_size // batch_size)
+
+        return [
+            range(start, min(start + nr_samples_per_chunk, nr_samples))
+            for start in range(0, nr_samples, nr_samples_per_chunk)
+        ]
+
+    def perturb_samples(self, x_batch: np.ndarray, nr_samples: int) -> np.ndarray:
+        """
+        Draw nr_samples perturbations of the input batch with perturb_func, stacked sample by
+        sample along the batch axis, i.e., the result has len(x_batch) * nr_samples inputs.
+
+        Parameters
+        ----------
+        x_batch: np.ndarray
+            The input to be evaluated on a batch-basis.
+        nr_samples: integer
+            The number of perturbation samples.
+
+        Returns
+        -------
+        np.ndarray
+            The stacked perturbed inputs.
+        """
+        x_perturbed = np.tile(x_batch, (nr_samples,) + (1,) * (x_batch.ndim - 1))
+        perturb_batch(
+            perturb_func=self.perturb_func,
+            indices=np.tile(np.arange(0, x_batch[0].size), (len(x_perturbed), 1)),
+            indexed_axes=np.arange(0, x_batch[0].ndim),
+            arr=x_perturbed,
+            inplace=True,
+            **self.perturb_func_kwargs,
+        )
+        return x_perturbed
+
+    @staticmethod
+    def predict_reference(model: ModelInterface, x_batch: np.ndarray) -> np.ndarray:
+        """
+        Predict on the unperturbed input batch. Child metrics that draw several perturbed samples
+        per batch call this once per batch and compare every sample against its result, instead of
+        re-predicting the unperturbed input for each sample.
+
+        Parameters
+        ----------
+        model: ModelInterface
+            A ModelInteface that is subject to explanation.
+        x_batch: np.ndarray
+            The input to be evaluated on a batch-basis.
+
+        Returns
+        -------
+        np.ndarray
+            The model outputs of the unperturbed input batch.
+        """
+        return model.predict(x_batch)
+
+    @staticmethod
+    def get_changed_prediction_indices(
+        y_pred: np.ndarray, y_pred_perturbed: np.ndarray
+    ) -> np.ndarray:
+        """
+        Get the indices of the instances whose predicted class changed under perturbation.
+
+        Parameters
+        ----------
+        y_pred: np.ndarray
+            The model outputs of the unperturbed input batch, see predict_reference().
+        y_pred_perturbed: np.ndarray
+            The model outputs of the perturbed input batch.
+
+        Returns
+        -------
+        np.ndarray
+            The indices of the instances with changed predictions.
+        """
+        return np.argwhere(
+            y_pred.argmax(axis=-1) != y_pred_perturbed.argmax(axis=-1)
+        ).reshape(-1)
+
+    @staticmethod
+    def predict_chunk(
+        model: ModelInterface,
+        x_chunk: np.ndarray,
+        chunk_ids: List[Tuple[int, int]],
+        y_batch: np.ndarray,
+        preds: np.ndarray,
+    ) -> None:
+        """
+        Predict on the first len(chunk_ids) inputs of x_chunk and write the scores of the
+        explained classes to preds at the (instance, step) positions given by chunk_ids.
+        A helper for child metrics that score many perturbed inputs in few model.predict() calls.
+
+        Parameters
+        ----------
+        model: ModelInterface
+            A ModelInteface that is subject to explanation.
+        x_chunk: np.ndarray
+            The buffer of perturbed inputs.
+        chunk_ids: list
+            The (instance, step) position of each perturbed input in x_chunk.
+        y_batch: np.ndarray
+            The output to be evaluated on a batch-basis.
+        preds: np.ndarray
+            The (instance, step) array of prediction scores that is filled in-place.
+
+        Returns
+        -------
+        None
+        """
+        instance_ids, step_ids = np.array(chunk_ids).T
+        x_input = model.shape_input(
+            x=x_chunk[: len(chunk_ids)],
+            shape=x_chunk[: len(chunk_ids)].shape,
+            channel_first=True,
+            batched=True,
+        )
+        y_pred = model.predict(x_input)
+        preds[instance_ids, step_ids] = y_pred[
+            np.arange(len(chunk_ids)), y_batch[instance_ids]
+        ]
+
     def evaluate_instance(
         self,
         model: ModelInterface,
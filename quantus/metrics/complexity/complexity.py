@@ -14,7 +14,7 @@ from quantus.helpers import asserts
 from quantus.helpers import warn
 from quantus.helpers.model.model_interface import ModelInterface
 from quantus.functions.normalise_func import normalise_by_max
-from quantus.metrics.base import Metric
+from quantus.metrics.base_batched import BatchedMetric
 from quantus.helpers.enums import (
     ModelType,
     DataType,
@@ -23,7 +23,7 @@ from quantus.helpers.enums import (
 )
 
 
-class Complexity(Metric):
+class Complexity(BatchedMetric):
     """
     Implementation of Complexity metric by Bhatt et al., 2020.
 
@@ -32,6 +32,9 @@ class Complexity(Metric):
     some decision. Even though such an explanation may be faithful to the model output, if the number of features is
     too large it may be too difficult for the user to understand the explanations, rendering it useless.
 
+    The entropies of a batch are computed in one call over the flattened attributions, batch_size attributions
+    at a time, so float32 and memory-mapped attributions are only cast to float64 batch by batch.
+
     References:
         1) Umang Bhatt et al.: "Evaluating and aggregating
         feature-based model explanations." IJCAI (2020): 3016-3022.
@@ -224,6 +227,7 @@ class Complexity(Metric):
             softmax=softmax,
             device=device,
             model_predict_kwargs=model_predict_kwargs,
+            batch_size=batch_size,
             **kwargs,
         )
 
@@ -234,6 +238,7 @@ class Complexity(Metric):
         y: np.ndarray,
         a: np.ndarray,
         s: np.ndarray,
+        **kwargs,
     ) -> float:
         """ "
         Evaluate instance gets model and data for a single instance as input and returns the evaluation result.
@@ -250,6 +255,8 @@ class Complexity(Metric):
             The explanation to be evaluated on an instance-basis.
         s: np.ndarray
             The segmentation to be evaluated on an instance-basis.
+        kwargs: optional
+            Keyword arguments.
 
         Returns
         -------
@@ -264,3 +271,39 @@ class Complexity(Metric):
 
         a = np.array(np.reshape(a, newshape), dtype=np.float64) / np.sum(np.abs(a))
         return scipy.stats.entropy(pk=a)
+
+    def evaluate_batch(
+        self,
+        model: ModelInterface,
+        x_batch: np.ndarray,
+        y_batch: np.ndarray,
+        a_batch: np.ndarray,
+        s_batch: np.ndarray,
+    ) -> List[float]:
+        """
+        Evaluates model and attributes on a single data batch and returns the batched evaluation result.
+
+        The entropy of all explanations is computed with one scipy.stats.entropy call over the flattened
+        (instance, feature) matrix. Only this batch is cast to float64.
+
+        Parameters
+        ----------
+        model: ModelInterface
+            A ModelInteface that is subject to explanation.
+        x_batch: np.ndarray
+            The input to be evaluated on a batch-basis.
+        y_batch: np.ndarray
+            The output to be evaluated on a batch-basis.
+        a_batch: np.ndarray
+            The explanation to be evaluated on a batch-basis.
+        s_batch: np.ndarray
+            The segmentation to be evaluated on a batch-basis.
+
+        Returns
+        -------
+        list
+            The evaluation results.
+        """
+        a_batch = np.array(a_batch.reshape(len(a_batch), -1), dtype=np.float64)
+        a_batch = a_batch / np.sum(np.abs(a_batch), axis=1, keepdims=True)
+        return scipy.stats.entropy(pk=a_batch, axis=1).tolist()
@@ -13,7 +13,7 @@ from quantus.helpers import asserts
 from quantus.helpers import warn
 from quantus.helpers.model.model_interface import ModelInterface
 from quantus.functions.normalise_func import normalise_by_max
-from quantus.metrics.base import Metric
+from quantus.metrics.base_batched import BatchedMetric
 from quantus.helpers.enums import (
     ModelType,
     DataType,
@@ -22,13 +22,16 @@ from quantus.helpers.enums import (
 )
 
 
-class EffectiveComplexity(Metric):
+class EffectiveComplexity(BatchedMetric):
     """
     Implementation of Effective complexity metric by Nguyen at el., 2020.
 
     Effective complexity measures how many attributions in absolute values are exceeding a certain threshold (eps)
     where a value above the specified threshold implies that the features are important and under indicates it is not.
 
+    The counts of a batch are computed with one reduction over the flattened attributions, batch_size
+    attributions at a time, so memory-mapped attributions are read batch by batch.
+
     References:
         1) An-phi Nguyen and María Rodríguez Martínez.: "On quantitative aspects of model
         interpretability." arXiv preprint arXiv:2007.07584 (2020).
@@ -227,6 +230,7 @@ class EffectiveComplexity(Metric):
             softmax=softmax,
             device=device,
             model_predict_kwargs=model_predict_kwargs,
+            batch_size=batch_size,
             **kwargs,
         )
 
@@ -237,6 +241,7 @@ class EffectiveComplexity(Metric):
         y: np.ndarray,
         a: np.ndarray,
         s: np.ndarray,
+        **kwargs,
     ) -> int:
         """
         Evaluate instance gets model and data for a single instance as input and returns the evaluation result.
@@ -253,6 +258,8 @@ class EffectiveComplexity(Metric):
             The explanation to be evaluated on an instance-basis.
         s: np.ndarray
             The segmentation to be evaluated on an instance-basis.
+        kwargs: optional
+            Keyword arguments.
 
         Returns
         -------
@@ -262,3 +269,38 @@ class EffectiveComplexity(Metric):
 
         a = a.flatten()
         return int(np.sum(a > self.eps))
+
+    def evaluate_batch(
+        self,
+        model: ModelInterface,
+        x_batch: np.ndarray,
+        y_batch: np.ndarray,
+        a_batch: np.ndarray,
+        s_batch: np.ndarray,
+    ) -> List[int]:
+        """
+        Evaluates model and attributes on a single data batch and returns the batched evaluation result.
+
+        The attributions above eps are counted with one reduction over the flattened (instance, feature)
+        matrix.
+
+        Parameters
+        ----------
+        model: ModelInterface
+            A ModelInteface that is subject to explanation.
+        x_batch: np.ndarray
+            The input to be evaluated on a batch-basis.
+        y_batch: np.ndarray
+            The output to be evaluated on a batch-basis.
+        a_batch: np.ndarray
+            The explanation to be evaluated on a batch-basis.
+        s_batch: np.ndarray
+            The segmentation to be evaluated on a batch-basis.
+
+        Returns
+        -------
+        list
+            The evaluation results.
+        """
+        a_batch = a_batch.reshape(len(a_batch), -1)
+        return np.sum(a_batch > self.eps, axis=1).tolist()
@@ -13,7 +13,7 @@ from quantus.helpers import asserts
 from quantus.helpers import warn
 from quantus.helpers.model.model_interface import ModelInterface
 from quantus.functions.normalise_func import normalise_by_max
-from quantus.metrics.base import Metric
+from quantus.metrics.base_batched import BatchedMetric
 from quantus.helpers.enums import (
     ModelType,
     DataType,
@@ -22,7 +22,7 @@ from quantus.helpers.enums import (
 )
 
 
-class Sparseness(Metric):
+class Sparseness(BatchedMetric):
     """
     Implementation of Sparseness metric by Chalasani et al., 2020.
 
@@ -34,6 +34,9 @@ class Sparseness(Metric):
         - Based on the implementation of the authors as found on the following link:
         <https://github.com/jfc43/advex/blob/master/DNN-Experiments/Fashion-MNIST/utils.py>.
 
+    The Gini indices of a batch are computed with a row-wise sort of the flattened attributions, batch_size
+    attributions at a time, so float32 and memory-mapped attributions are only cast to float64 batch by batch.
+
     References:
         1) Prasad Chalasani et al.: "Concise explanations of neural networks using adversarial training."
         International Conference on Machine Learning. PMLR, 2020.
@@ -229,6 +232,7 @@ class Sparseness(Metric):
             softmax=softmax,
             device=device,
             model_predict_kwargs=model_predict_kwargs,
+            batch_size=batch_size,
             **kwargs,
         )
 
@@ -239,6 +243,7 @@ class Sparseness(Metric):
         y: np.ndarray,
         a: np.ndarray,
         s: np.ndarray,
+        **kwargs,
     ) -> float:
         """
         Evaluate instance gets model and data for a single instance as input and returns the evaluation result.
@@ -255,6 +260,8 @@ class Sparseness(Metric):
             The explanation to be evaluated on an instance-basis.
         s: np.ndarray
             The segmentation to be evaluated on an instance-basis.
+        kwargs: optional
+            Keyword arguments.
 
         Returns
         -------
@@ -273,3 +280,44 @@ class Sparseness(Metric):
             a.shape[0] * np.sum(a)
         )
         return score
+
+    def evaluate_batch(
+        self,
+        model: ModelInterface,
+        x_batch: np.ndarray,
+        y_batch: np.ndarray,
+        a_batch: np.ndarray,
+        s_batch: np.ndarray,
+    ) -> List[float]:
+        """
+        Evaluates model and attributes on a single data batch and returns the batched evaluation result.
+
+        The Gini indices of all explanations are computed with one row-wise sort and two reductions over the
+        flattened (instance, feature) matrix. Only this batch is cast to float64.
+
+        Parameters
+        ----------
+        model: ModelInterface
+            A ModelInteface that is subject to explanation.
+        x_batch: np.ndarray
+            The input to be evaluated on a batch-basis.
+        y_batch: np.ndarray
+            The output to be evaluated on a batch-basis.
+        a_batch: np.ndarray
+            The explanation to be evaluated on a batch-basis.
+        s_batch: np.ndarray
+            The segmentation to be evaluated on a batch-basis.
+
+        Returns
+        -------
+        list
+            The evaluation results.
+        """
+        a_batch = np.array(a_batch.reshape(len(a_batch), -1), dtype=np.float64)
+        a_batch += 0.0000001
+        a_batch = np.sort(a_batch, axis=1)
+        n_features = a_batch.shape[1]
+        score = np.sum(
+            (2 * np.arange(1, n_features + 1) - n_features - 1) * a_batch, axis=1
+        ) / (n_features * np.sum(a_batch, axis=1))
+        return score.tolist()
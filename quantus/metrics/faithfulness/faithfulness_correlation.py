@@ -16,7 +16,7 @@ from quantus.helpers.model.model_interface import ModelInterface
 from quantus.functions.normalise_func import normalise_by_max
 from quantus.functions.perturb_func import baseline_replacement_by_indices
 from quantus.functions.similarity_func import correlation_pearson
-from quantus.metrics.base_perturbed import PerturbationMetric
+from quantus.metrics.base_batched import BatchedPerturbationMetric
 from quantus.helpers.enums import (
     ModelType,
     DataType,
@@ -25,7 +25,7 @@ from quantus.helpers.enums import (
 )
 
 
-class FaithfulnessCorrelation(PerturbationMetric):
+class FaithfulnessCorrelation(BatchedPerturbationMetric):
     """
     Implementation of faithfulness correlation by Bhatt et al., 2020.
 
@@ -42,6 +42,10 @@ class FaithfulnessCorrelation(PerturbationMetric):
     test point and the average explanation attribution for only the subset of features is calculated. Results is
     average over multiple runs and several test samples.
 
+    By default, the model is queried once per run and instance. If 'perturbation_batch_size' is set,
+    the random subsets of all instances in the batch are drawn at once, the perturbed inputs are
+    materialised in chunks of that size and each chunk is scored with a single model.predict() call.
+
     References:
         1) Umang Bhatt et al.: "Evaluating and aggregating feature-based model
         explanations." IJCAI (2020): 3016-3022.
@@ -77,6 +81,7 @@ class FaithfulnessCorrelation(PerturbationMetric):
         default_plot_func: Optional[Callable] = None,
         disable_warnings: bool = False,
         display_progressbar: bool = False,
+        perturbation_batch_size: Optional[int] = None,
         **kwargs,
     ):
         """
@@ -116,6 +121,9 @@ class FaithfulnessCorrelation(PerturbationMetric):
             Indicates whether the warnings are printed, default=False.
         display_progressbar: boolean
             Indicates whether a tqdm-progress-bar is printed, default=False.
+        perturbation_batch_size: integer, optional
+            The maximum number of perturbed inputs that are materialised and predicted on at once,
+            across runs and instances. If None, each run is predicted on separately, default=None.
         kwargs: optional
             Keyword arguments.
         """
@@ -151,6 +159,11 @@ class FaithfulnessCorrelation(PerturbationMetric):
         self.similarity_func = similarity_func
         self.nr_runs = nr_runs
         self.subset_size = subset_size
+        self.perturbation_batch_size = perturbation_batch_size
+        if self.perturbation_batch_size is not None:
+            asserts.assert_perturbation_batch_size(
+                perturbation_batch_size=self.perturbation_batch_size
+            )
 
         # Asserts and warnings.
         if not self.disable_warnings:
@@ -273,6 +286,7 @@ class FaithfulnessCorrelation(PerturbationMetric):
             softmax=softmax,
             device=device,
             model_predict_kwargs=model_predict_kwargs,
+            batch_size=batch_size,
             **kwargs,
         )
 
@@ -283,6 +297,7 @@ class FaithfulnessCorrelation(PerturbationMetric):
         y: np.ndarray,
         a: np.ndarray,
         s: np.ndarray,
+        **kwargs,
     ) -> float:
         """
         Evaluate instance gets model and data for a single instance as input and returns the evaluation result.
@@ -299,6 +314,8 @@ class FaithfulnessCorrelation(PerturbationMetric):
             The explanation to be evaluated on an instance-basis.
         s: np.ndarray
             The segmentation to be evaluated on an instance-basis.
+        kwargs: optional
+            Keyword arguments.
 
         Returns
         -------
@@ -340,6 +357,130 @@ class FaithfulnessCorrelation(PerturbationMetric):
 
         return similarity
 
+    def evaluate_batch(
+        self,
+        model: ModelInterface,
+        x_batch: np.ndarray,
+        y_batch: np.ndarray,
+        a_batch: np.ndarray,
+        s_batch: np.ndarray,
+    ) -> List[float]:
+        """
+        Evaluates model and attributes on a single data batch and returns the batched evaluation result.
+
+        If perturbation_batch_size is None, evaluate_instance() is called on each instance. Otherwise,
+        the subsets of all instances and runs are drawn as one index matrix, the attribution sums are
+        gathered at once and the perturbed inputs are scored in chunks of perturbation_batch_size inputs.
+
+        Parameters
+        ----------
+        model: ModelInterface
+            A ModelInteface that is subject to explanation.
+        x_batch: np.ndarray
+            The input to be evaluated on a batch-basis.
+        y_batch: np.ndarray
+            The output to be evaluated on a batch-basis.
+        a_batch: np.ndarray
+            The explanation to be evaluated on a batch-basis.
+        s_batch: np.ndarray
+            The segmentation to be evaluated on a batch-basis.
+
+        Returns
+        -------
+        list
+            The evaluation results.
+        """
+        if self.perturbation_batch_size is None:
+            return [
+                self.evaluate_instance(model=model, x=x, y=y, a=a, s=None)
+                for x, y, a in zip(x_batch, y_batch, a_batch)
+            ]
+
+        # Flatten the attributions.
+        a_batch = a_batch.reshape(len(a_batch), -1)
+
+        # Predict on inputs.
+        x_input = model.shape_input(
+            x_batch, x_batch.shape, channel_first=True, batched=True
+        )
+        y_pred = model.predict(x_input)[np.arange(len(x_batch)), y_batch]
+
+        # Draw random subsets of features without replacement, as one (instance, run, subset) index matrix.
+        a_ix_batch = np.stack(
+            [
+                np.argpartition(
+                    np.random.rand(self.nr_runs, a_batch.shape[1]),
+                    kth=self.subset_size - 1,
+                    axis=1,
+                )[:, : self.subset_size]
+                for _ in range(len(a_batch))
+            ]
+        )
+
+        # Sum attributions of the random subsets.
+        att_sums = np.take_along_axis(
+            a_batch, a_ix_batch.reshape(len(a_batch), -1), axis=1
+        )
+        att_sums = att_sums.reshape(a_ix_batch.shape).sum(axis=-1)
+
+        # Predict on perturbed inputs, chunk by chunk.
+        preds = np.zeros((len(x_batch), self.nr_runs))
+        x_chunk = np.zeros(
+            (self.perturbation_batch_size, *x_batch.shape[1:]), dtype=x_batch.dtype
+        )
+        chunk_ids: List[Tuple[int, int]] = []
+
+        for instance_id, (x, a_ix_runs) in enumerate(zip(x_batch, a_ix_batch)):
+            for run_id, a_ix in enumerate(a_ix_runs):
+                x_perturbed = self.perturb_func(
+                    arr=x,
+                    indices=a_ix,
+                    indexed_axes=self.a_axes,
+                    **self.perturb_func_kwargs,
+                )
+                warn.warn_perturbation_caused_no_change(x=x, x_perturbed=x_perturbed)
+
+                x_chunk[len(chunk_ids)] = x_perturbed
+                chunk_ids.append((instance_id, run_id))
+                if len(chunk_ids) == self.perturbation_batch_size:
+                    self.predict_chunk(model, x_chunk, chunk_ids, y_batch, preds)
+                    chunk_ids = []
+
+        if chunk_ids:
+            self.predict_chunk(model, x_chunk, chunk_ids, y_batch, preds)
+
+        pred_deltas = y_pred[:, None] - preds
+
+        return [
+            self.similarity_func(a=att_sums_instance, b=pred_deltas_instance)
+            for att_sums_instance, pred_deltas_instance in zip(att_sums, pred_deltas)
+        ]
+
+    def get_number_of_evaluation_units(self, n_instances: int, batch_size: int) -> int:
+        """
+        Get the number of units that a call on n_instances instances evaluates one by one, see
+        estimate_cost(). If perturbation_batch_size is None, each instance predicts its random subsets on its
+        own, i.e., the units are instances. Otherwise, the subsets of all instances of a batch are predicted
+        in chunks, i.e., the units are batches.
+
+        Parameters
+        ----------
+        n_instances: integer
+            The number of instances.
+        batch_size: integer
+            The batch size.
+
+        Returns
+        -------
+        integer
+            The number of instances or batches.
+        """
+        if self.perturbation_batch_size is None:
+            return n_instances
+        return super().get_number_of_evaluation_units(
+            n_instances=n_instances, batch_size=batch_size
+        )
+
     def custom_preprocess(
         self,
         model: ModelInterface,
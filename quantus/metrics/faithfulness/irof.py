@@ -71,6 +71,7 @@ class IROF(PerturbationMetric):
         default_plot_func: Optional[Callable] = None,
         disable_warnings: bool = False,
         display_progressbar: bool = False,
+        cache_segmentation: bool = True,
         **kwargs,
     ):
         """
@@ -105,6 +106,9 @@ class IROF(PerturbationMetric):
             Indicates whether the warnings are printed, default=False.
         display_progressbar: boolean
             Indicates whether a tqdm-progress-bar is printed, default=False.
+        cache_segmentation: boolean
+            Indicates whether the segmentation of an input is cached and reused by later calls on the same input,
+            e.g., when evaluating several explanation methods, default=True.
         kwargs: optional
             Keyword arguments.
         """
@@ -136,6 +140,7 @@ class IROF(PerturbationMetric):
 
         # Save metric-specific attributes.
         self.segmentation_method = segmentation_method
+        self.cache_segmentation = cache_segmentation
         self.nr_channels = None
 
         # Asserts and warnings.
@@ -296,7 +301,11 @@ class IROF(PerturbationMetric):
         y_pred = float(model.predict(x_input)[:, y])
 
         # Segment image.
-        segments = utils.get_superpixel_segments(
+        if self.cache_segmentation:
+            segment_func = utils.get_cached_superpixel_segments
+        else:
+            segment_func = utils.get_superpixel_segments
+        segments = segment_func(
             img=np.moveaxis(x, 0, -1).astype("double"),
             segmentation_method=self.segmentation_method,
         )
@@ -304,9 +313,9 @@ class IROF(PerturbationMetric):
         asserts.assert_nr_segments(nr_segments=nr_segments)
 
         # Calculate average attribution of each segment.
-        att_segs = np.zeros(nr_segments)
-        for i, s in enumerate(range(nr_segments)):
-            att_segs[i] = np.mean(a[:, segments == s])
+        att_segs = utils.calculate_segment_means(
+            a=a, segments=segments, nr_segments=nr_segments
+        )
 
         # Sort segments based on the mean attribution (descending order).
         s_indices = np.argsort(-att_segs)
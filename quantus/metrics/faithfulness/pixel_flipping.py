@@ -6,7 +6,7 @@
 # You should have received a copy of the GNU Lesser General Public License along with Quantus. If not, see <https://www.gnu.org/licenses/>.
 # Quantus project URL: <https://github.com/understandable-machine-intelligence-lab/Quantus>.
 
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 
@@ -17,7 +17,7 @@ from quantus.helpers import warn
 from quantus.helpers.model.model_interface import ModelInterface
 from quantus.functions.normalise_func import normalise_by_max
 from quantus.functions.perturb_func import baseline_replacement_by_indices
-from quantus.metrics.base_perturbed import PerturbationMetric
+from quantus.metrics.base_batched import BatchedPerturbationMetric
 from quantus.helpers.enums import (
     ModelType,
     DataType,
@@ -26,7 +26,7 @@ from quantus.helpers.enums import (
 )
 
 
-class PixelFlipping(PerturbationMetric):
+class PixelFlipping(BatchedPerturbationMetric):
     """
     Implementation of Pixel-Flipping experiment by Bach et al., 2015.
 
@@ -35,6 +35,11 @@ class PixelFlipping(PerturbationMetric):
     with scores close to zero and then to evaluate the impact of these flips
     onto the prediction scores (mean prediction is calculated).
 
+    By default, the model is queried once per perturbation step and instance. If
+    'perturbation_batch_size' is set, the cumulative perturbation sequences of all instances
+    in the batch are materialised in chunks of that size and scored with a single
+    model.predict() call per chunk.
+
     References:
         1) Sebastian Bach et al.: "On pixel-wise explanations for non-linear classifier
         decisions by layer-wise relevance propagation." PloS one 10.7 (2015): e0130140.
@@ -69,6 +74,7 @@ class PixelFlipping(PerturbationMetric):
         default_plot_func: Optional[Callable] = None,
         disable_warnings: bool = False,
         display_progressbar: bool = False,
+        perturbation_batch_size: Optional[int] = None,
         **kwargs,
     ):
         """
@@ -105,6 +111,10 @@ class PixelFlipping(PerturbationMetric):
             Indicates whether the warnings are printed, default=False.
         display_progressbar: boolean
             Indicates whether a tqdm-progress-bar is printed, default=False.
+        perturbation_batch_size: integer, optional
+            The maximum number of perturbed inputs that are materialised and predicted on at once,
+            across perturbation steps and instances. If None, each perturbation step is predicted
+            on separately, default=None.
         kwargs: optional
             Keyword arguments.
         """
@@ -140,8 +150,14 @@ class PixelFlipping(PerturbationMetric):
         # Save metric-specific attributes.
         self.features_in_step = features_in_step
         self.return_auc_per_sample = return_auc_per_sample
+        self.perturbation_batch_size = perturbation_batch_size
 
         # Asserts and warnings.
+        if self.perturbation_batch_size is not None:
+            asserts.assert_perturbation_batch_size(
+                perturbation_batch_size=self.perturbation_batch_size
+            )
+
         if not self.disable_warnings:
             warn.warn_parameterisation(
                 metric_name=self.__class__.__name__,
@@ -256,6 +272,7 @@ class PixelFlipping(PerturbationMetric):
             softmax=softmax,
             device=device,
             model_predict_kwargs=model_predict_kwargs,
+            batch_size=batch_size,
             **kwargs,
         )
 
@@ -266,6 +283,7 @@ class PixelFlipping(PerturbationMetric):
         y: np.ndarray,
         a: np.ndarray,
         s: np.ndarray,
+        **kwargs,
     ) -> List[float]:
         """
         Evaluate instance gets model and data for a single instance as input and returns the evaluation result.
@@ -282,6 +300,8 @@ class PixelFlipping(PerturbationMetric):
             The explanation to be evaluated on an instance-basis.
         s: np.ndarray
             The segmentation to be evaluated on an instance-basis.
+        kwargs: optional
+            Keyword arguments.
 
         Returns
         -------
@@ -324,6 +344,116 @@ class PixelFlipping(PerturbationMetric):
 
         return preds
 
+    def evaluate_batch(
+        self,
+        model: ModelInterface,
+        x_batch: np.ndarray,
+        y_batch: np.ndarray,
+        a_batch: np.ndarray,
+        s_batch: np.ndarray,
+    ) -> List[Union[List[float], float]]:
+        """
+        Evaluates model and attributes on a single data batch and returns the batched evaluation result.
+
+        If perturbation_batch_size is None, evaluate_instance() is called on each instance. Otherwise,
+        the perturbed inputs of all instances and perturbation steps are collected into chunks of
+        perturbation_batch_size inputs, and each chunk is scored with a single model.predict() call.
+
+        Parameters
+        ----------
+        model: ModelInterface
+            A ModelInteface that is subject to explanation.
+        x_batch: np.ndarray
+            The input to be evaluated on a batch-basis.
+        y_batch: np.ndarray
+            The output to be evaluated on a batch-basis.
+        a_batch: np.ndarray
+            The explanation to be evaluated on a batch-basis.
+        s_batch: np.ndarray
+            The segmentation to be evaluated on a batch-basis.
+
+        Returns
+        -------
+        list
+            The evaluation results.
+        """
+        if self.perturbation_batch_size is None:
+            return [
+                self.evaluate_instance(model=model, x=x, y=y, a=a, s=None)
+                for x, y, a in zip(x_batch, y_batch, a_batch)
+            ]
+
+        # Get indices of sorted attributions (descending).
+        a_indices_batch = np.argsort(-a_batch.reshape(len(a_batch), -1), axis=1)
+
+        # Prepare arrays.
+        n_perturbations = len(range(0, a_indices_batch.shape[1], self.features_in_step))
+        preds = np.zeros((len(x_batch), n_perturbations))
+        x_chunk = np.zeros(
+            (self.perturbation_batch_size, *x_batch.shape[1:]), dtype=x_batch.dtype
+        )
+        chunk_ids: List[Tuple[int, int]] = []
+
+        for instance_id, (x, a_indices) in enumerate(zip(x_batch, a_indices_batch)):
+            x_perturbed = x.copy()
+
+            for step_id in range(n_perturbations):
+
+                # Perturb input by indices of attributions.
+                a_ix = a_indices[
+                    (self.features_in_step * step_id) : (
+                        self.features_in_step * (step_id + 1)
+                    )
+                ]
+                x_perturbed = self.perturb_func(
+                    arr=x_perturbed,
+                    indices=a_ix,
+                    indexed_axes=self.a_axes,
+                    **self.perturb_func_kwargs,
+                )
+                warn.warn_perturbation_caused_no_change(x=x, x_perturbed=x_perturbed)
+
+                # Collect perturbed input, predict once the chunk is full.
+                x_chunk[len(chunk_ids)] = x_perturbed
+                chunk_ids.append((instance_id, step_id))
+                if len(chunk_ids) == self.perturbation_batch_size:
+                    self.predict_chunk(model, x_chunk, chunk_ids, y_batch, preds)
+                    chunk_ids = []
+
+        # Predict on the remaining perturbed inputs.
+        if chunk_ids:
+            self.predict_chunk(model, x_chunk, chunk_ids, y_batch, preds)
+
+        if self.return_auc_per_sample:
+            return [utils.calculate_auc(curve) for curve in preds]
+
+        return [curve.tolist() for curve in preds]
+
+    def get_number_of_evaluation_units(self, n_instances: int, batch_size: int) -> int:
+        """
+        Get the number of units that a call on n_instances instances evaluates one by one, see
+        estimate_cost(). If perturbation_batch_size is None, each instance predicts its perturbation steps on
+        its own, i.e., the units are instances. Otherwise, the steps of all instances of a batch are
+        predicted in chunks, i.e., the units are batches.
+
+        Parameters
+        ----------
+        n_instances: integer
+            The number of instances.
+        batch_size: integer
+            The batch size.
+
+        Returns
+        -------
+        integer
+            The number of instances or batches.
+        """
+        if self.perturbation_batch_size is None:
+            return n_instances
+        return super().get_number_of_evaluation_units(
+            n_instances=n_instances, batch_size=batch_size
+        )
+
     def custom_preprocess(
         self,
         model: ModelInterface,
@@ -6,7 +6,6 @@
 # You should have received a copy of the GNU Lesser General Public License along with Quantus. If not, see <https://www.gnu.org/licenses/>.
 # Quantus project URL: <https://github.com/understandable-machine-intelligence-lab/Quantus>.
 
-import itertools
 from typing import Any, Callable, Dict, List, Optional
 
 import numpy as np
@@ -313,72 +312,47 @@ class RegionPerturbation(PerturbationMetric):
         x_input = model.shape_input(x, x.shape, channel_first=True)
         y_pred = float(model.predict(x_input)[:, y])
 
-        patches = []
         x_perturbed = x.copy()
 
-        # Pad input and attributions. This is needed to allow for any patch_size.
+        # Pad input. This is needed to allow for any patch_size.
         pad_width = self.patch_size - 1
-        x_pad = utils._pad_array(x, pad_width, mode="constant", padded_axes=self.a_axes)
-        a_pad = utils._pad_array(a, pad_width, mode="constant", padded_axes=self.a_axes)
 
-        # Create patches across whole input shape and aggregate attributions.
-        att_sums = []
-        axis_iterators = [
-            range(pad_width, x_pad.shape[axis] - pad_width) for axis in self.a_axes
-        ]
-        for top_left_coords in itertools.product(*axis_iterators):
-
-            # Create slice for patch.
-            patch_slice = utils.create_patch_slice(
-                patch_size=self.patch_size,
-                coords=top_left_coords,
-            )
-
-            # Sum attributions for patch.
-            att_sums.append(
-                a_pad[utils.expand_indices(a_pad, patch_slice, self.a_axes)].sum()
-            )
-            patches.append(patch_slice)
+        # Aggregate attributions for patches across whole input shape.
+        att_sums = utils.calculate_patch_sums(
+            a=a, patch_size=self.patch_size, indexed_axes=self.a_axes
+        )
 
         if self.order == "random":
             # Order attributions randomly.
-            order = np.arange(len(patches))
+            order = np.arange(att_sums.size)
             np.random.shuffle(order)
 
         elif self.order == "morf":
             # Order attributions according to the most relevant first.
-            order = np.argsort(att_sums)[::-1]
+            order = np.argsort(att_sums, axis=None)[::-1]
 
         elif self.order == "lerf":
             # Order attributions according to the least relevant first.
-            order = np.argsort(att_sums)
+            order = np.argsort(att_sums, axis=None)
 
         else:
             raise ValueError(
                 "Chosen order must be in ['random', 'morf', 'lerf'] but is: {self.order}."
             )
 
-        # Create ordered list of patches.
-        ordered_patches = [patches[p] for p in order]
-
-        # Remove overlapping patches
-        blocked_mask = np.zeros(x_pad.shape, dtype=bool)
-        ordered_patches_no_overlap = []
-        for patch_slice in ordered_patches:
-            patch_mask = np.zeros(x_pad.shape, dtype=bool)
-            patch_mask[
-                utils.expand_indices(patch_mask, patch_slice, self.a_axes)
-            ] = True
-            # patch_mask_exp = utils.expand_indices(patch_mask, patch_slice, self.a_axes)
-            # patch_mask[patch_mask_exp] = True
-            intersected = blocked_mask & patch_mask
-
-            if not intersected.any():
-                ordered_patches_no_overlap.append(patch_slice)
-                blocked_mask = blocked_mask | patch_mask
-
-            if len(ordered_patches_no_overlap) >= self.regions_evaluation:
-                break
+        # Remove overlapping patches and create slices for the (padded) patches.
+        ordered_patches_no_overlap = [
+            utils.create_patch_slice(
+                patch_size=self.patch_size,
+                coords=[c + pad_width for c in coords],
+            )
+            for coords in utils.get_non_overlapping_patches(
+                order=order,
+                patch_size=self.patch_size,
+                shape=att_sums.shape,
+                max_patches=self.regions_evaluation,
+            )
+        ]
 
         # Warn
         warn.warn_iterations_exceed_patch_number(
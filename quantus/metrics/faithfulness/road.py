@@ -14,8 +14,11 @@ from quantus.helpers import asserts
 from quantus.helpers import warn
 from quantus.helpers.model.model_interface import ModelInterface
 from quantus.functions.normalise_func import normalise_by_max
-from quantus.functions.perturb_func import noisy_linear_imputation
-from quantus.metrics.base_perturbed import PerturbationMetric
+from quantus.functions.perturb_func import (
+    noisy_linear_imputation,
+    nested_noisy_linear_imputation,
+)
+from quantus.metrics.base_batched import BatchedPerturbationMetric
 from quantus.helpers.enums import (
     ModelType,
     DataType,
@@ -24,7 +27,7 @@ from quantus.helpers.enums import (
 )
 
 
-class ROAD(PerturbationMetric):
+class ROAD(BatchedPerturbationMetric):
     """
     Implementation of ROAD evaluation strategy by Rong et al., 2022.
 
@@ -32,6 +35,11 @@ class ROAD(PerturbationMetric):
     of removing k most important pixels. At each step k most relevant pixels (MoRF order) are replaced with noisy linear
     imputations which removes bias.
 
+    By default, the model is queried once per percentage and instance. If 'perturbation_batch_size' is set,
+    the perturbed inputs of all percentages and instances in the batch are scored together in chunks of that
+    size. Since the top-k index sets of the percentages are nested, the noisy linear imputation then assembles
+    its equation system once per instance and reuses it for every percentage.
+
     Assumptions:
         - The original metric definition relies on perturbation functionality suited only for images.
         Therefore, only apply the metric to 3-dimensional (image) data. To extend the applicablity
@@ -71,6 +79,7 @@ class ROAD(PerturbationMetric):
         default_plot_func: Optional[Callable] = None,
         disable_warnings: bool = False,
         display_progressbar: bool = False,
+        perturbation_batch_size: Optional[int] = None,
         **kwargs,
     ):
         """
@@ -105,6 +114,9 @@ class ROAD(PerturbationMetric):
             Indicates whether the warnings are printed, default=False.
         display_progressbar: boolean
             Indicates whether a tqdm-progress-bar is printed, default=False.
+        perturbation_batch_size: integer, optional
+            The maximum number of perturbed inputs that are predicted on at once, across percentages
+            and instances. If None, each percentage is predicted on separately, default=None.
         kwargs: optional
             Keyword arguments.
         """
@@ -138,6 +150,11 @@ class ROAD(PerturbationMetric):
             percentages = list(range(1, 100, 2))
         self.percentages = percentages
         self.a_size = None
+        self.perturbation_batch_size = perturbation_batch_size
+        if self.perturbation_batch_size is not None:
+            asserts.assert_perturbation_batch_size(
+                perturbation_batch_size=self.perturbation_batch_size
+            )
 
         # Asserts and warnings.
         if not self.disable_warnings:
@@ -259,6 +276,7 @@ class ROAD(PerturbationMetric):
             softmax=softmax,
             device=device,
             model_predict_kwargs=model_predict_kwargs,
+            batch_size=batch_size,
             **kwargs,
         )
 
@@ -269,6 +287,7 @@ class ROAD(PerturbationMetric):
         y: np.ndarray,
         a: np.ndarray,
         s: np.ndarray,
+        **kwargs,
     ) -> List[float]:
         """
         Evaluate instance gets model and data for a single instance as input and returns the evaluation result.
@@ -285,6 +304,8 @@ class ROAD(PerturbationMetric):
             The explanation to be evaluated on an instance-basis.
         s: np.ndarray
             The segmentation to be evaluated on an instance-basis.
+        kwargs: optional
+            Keyword arguments.
 
         Returns
         -------
@@ -317,6 +338,159 @@ class ROAD(PerturbationMetric):
         # Return list of booleans for each percentage.
         return results_instance
 
+    def evaluate_batch(
+        self,
+        model: ModelInterface,
+        x_batch: np.ndarray,
+        y_batch: np.ndarray,
+        a_batch: np.ndarray,
+        s_batch: np.ndarray,
+    ) -> List[np.ndarray]:
+        """
+        Evaluates model and attributes on a single data batch and returns the batched evaluation result.
+
+        If perturbation_batch_size is None, evaluate_instance() is called on each instance. Otherwise,
+        all percentages of an instance are perturbed at once and the perturbed inputs of all instances
+        are scored in chunks of perturbation_batch_size inputs.
+
+        Parameters
+        ----------
+        model: ModelInterface
+            A ModelInteface that is subject to explanation.
+        x_batch: np.ndarray
+            The input to be evaluated on a batch-basis.
+        y_batch: np.ndarray
+            The output to be evaluated on a batch-basis.
+        a_batch: np.ndarray
+            The explanation to be evaluated on a batch-basis.
+        s_batch: np.ndarray
+            The segmentation to be evaluated on a batch-basis.
+
+        Returns
+        -------
+        list
+            The evaluation results.
+        """
+        if self.perturbation_batch_size is None:
+            return [
+                self.evaluate_instance(model=model, x=x, y=y, a=a, s=None)
+                for x, y, a in zip(x_batch, y_batch, a_batch)
+            ]
+
+        nr_indices = [int(self.a_size * p / 100) for p in self.percentages]
+
+        results = np.zeros((len(x_batch), len(self.percentages)), dtype=int)
+        x_chunk = np.zeros(
+            (self.perturbation_batch_size, *x_batch.shape[1:]), dtype=x_batch.dtype
+        )
+        chunk_ids: List[Tuple[int, int]] = []
+
+        for instance_id, (x, a) in enumerate(zip(x_batch, a_batch)):
+
+            # Order indices.
+            ordered_indices = np.argsort(a, axis=None)[::-1]
+
+            # Perturb the input for all percentages.
+            if self.perturb_func is noisy_linear_imputation:
+                x_perturbed_levels = nested_noisy_linear_imputation(
+                    arr=x,
+                    indices=ordered_indices,
+                    nr_indices=nr_indices,
+                    **self.perturb_func_kwargs,
+                )
+            else:
+                x_perturbed_levels = [
+                    self.perturb_func(
+                        arr=x,
+                        indices=ordered_indices[:k],
+                        **self.perturb_func_kwargs,
+                    )
+                    for k in nr_indices
+                ]
+
+            for p_ix, x_perturbed in enumerate(x_perturbed_levels):
+                warn.warn_perturbation_caused_no_change(x=x, x_perturbed=x_perturbed)
+
+                # Collect perturbed input, predict once the chunk is full.
+                x_chunk[len(chunk_ids)] = x_perturbed
+                chunk_ids.append((instance_id, p_ix))
+                if len(chunk_ids) == self.perturbation_batch_size:
+                    self._predict_accuracy_chunk(
+                        model, x_chunk, chunk_ids, y_batch, results
+                    )
+                    chunk_ids = []
+
+        # Predict on the remaining perturbed inputs.
+        if chunk_ids:
+            self._predict_accuracy_chunk(model, x_chunk, chunk_ids, y_batch, results)
+
+        # Return list of booleans for each percentage.
+        return list(results)
+
+    def get_number_of_evaluation_units(self, n_instances: int, batch_size: int) -> int:
+        """
+        Get the number of units that a call on n_instances instances evaluates one by one, see
+        estimate_cost(). If perturbation_batch_size is None, each instance predicts its percentages on its own,
+        i.e., the units are instances. Otherwise, the noisy linear imputations of all instances of a batch
+        are predicted in chunks, i.e., the units are batches.
+
+        Parameters
+        ----------
+        n_instances: integer
+            The number of instances.
+        batch_size: integer
+            The batch size.
+
+        Returns
+        -------
+        integer
+            The number of instances or batches.
+        """
+        if self.perturbation_batch_size is None:
+            return n_instances
+        return super().get_number_of_evaluation_units(
+            n_instances=n_instances, batch_size=batch_size
+        )
+
+    @staticmethod
+    def _predict_accuracy_chunk(
+        model: ModelInterface,
+        x_chunk: np.ndarray,
+        chunk_ids: List[Tuple[int, int]],
+        y_batch: np.ndarray,
+        results: np.ndarray,
+    ) -> None:
+        """
+        Predict on the first len(chunk_ids) inputs of x_chunk and write whether the predicted class
+        equals the explained class to results at the (instance, percentage) positions given by chunk_ids.
+
+        Parameters
+        ----------
+        model: ModelInterface
+            A ModelInteface that is subject to explanation.
+        x_chunk: np.ndarray
+            The buffer of perturbed inputs.
+        chunk_ids: list
+            The (instance, percentage) position of each perturbed input in x_chunk.
+        y_batch: np.ndarray
+            The output to be evaluated on a batch-basis.
+        results: np.ndarray
+            The (instance, percentage) array of results that is filled in-place.
+
+        Returns
+        -------
+        None
+        """
+        instance_ids, p_ids = np.array(chunk_ids).T
+        x_input = model.shape_input(
+            x=x_chunk[: len(chunk_ids)],
+            shape=x_chunk[: len(chunk_ids)].shape,
+            channel_first=True,
+            batched=True,
+        )
+        class_pred_perturb = np.argmax(model.predict(x_input), axis=1)
+        results[instance_ids, p_ids] = y_batch[instance_ids] == class_pred_perturb
+
     def custom_preprocess(
         self,
         model: ModelInterface,
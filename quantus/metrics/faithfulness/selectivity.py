@@ -6,7 +6,6 @@
 # You should have received a copy of the GNU Lesser General Public License along with Quantus. If not, see <https://www.gnu.org/licenses/>.
 # Quantus project URL: <https://github.com/understandable-machine-intelligence-lab/Quantus>.
 
-import itertools
 from typing import Any, Callable, Dict, List, Optional
 
 import numpy as np
@@ -302,48 +301,29 @@ class Selectivity(PerturbationMetric):
         x_input = model.shape_input(x, x.shape, channel_first=True)
         y_pred = float(model.predict(x_input)[:, y])
 
-        patches = []
         x_perturbed = x.copy()
 
-        # Pad input and attributions. This is needed to allow for any patch_size.
+        # Pad input. This is needed to allow for any patch_size.
         pad_width = self.patch_size - 1
-        x_pad = utils._pad_array(x, pad_width, mode="constant", padded_axes=self.a_axes)
-        a_pad = utils._pad_array(a, pad_width, mode="constant", padded_axes=self.a_axes)
 
-        # Get patch indices of sorted attributions (descending).
-        att_sums = []
-        axis_iterators = [
-            range(pad_width, x_pad.shape[axis] - pad_width) for axis in self.a_axes
-        ]
-        for top_left_coords in itertools.product(*axis_iterators):
+        # Aggregate attributions for patches across whole input shape.
+        att_sums = utils.calculate_patch_sums(
+            a=a, patch_size=self.patch_size, indexed_axes=self.a_axes
+        )
 
-            # Create slice for patch.
-            patch_slice = utils.create_patch_slice(
+        # Remove overlapping patches, ordered by sorted attributions (descending),
+        # and create slices for the (padded) patches.
+        ordered_patches_no_overlap = [
+            utils.create_patch_slice(
                 patch_size=self.patch_size,
-                coords=top_left_coords,
+                coords=[c + pad_width for c in coords],
             )
-
-            # Sum attributions for patch.
-            att_sums.append(
-                a_pad[utils.expand_indices(a_pad, patch_slice, self.a_axes)].sum()
+            for coords in utils.get_non_overlapping_patches(
+                order=np.argsort(att_sums, axis=None)[::-1],
+                patch_size=self.patch_size,
+                shape=att_sums.shape,
             )
-            patches.append(patch_slice)
-
-            # Create ordered list of patches.
-        ordered_patches = [patches[p] for p in np.argsort(att_sums)[::-1]]
-
-        # Remove overlapping patches.
-        blocked_mask = np.zeros(x_pad.shape, dtype=bool)
-        ordered_patches_no_overlap = []
-        for patch_slice in ordered_patches:
-            patch_mask = np.zeros(x_pad.shape, dtype=bool)
-            patch_mask_exp = utils.expand_indices(patch_mask, patch_slice, self.a_axes)
-            patch_mask[patch_mask_exp] = True
-            intersected = blocked_mask & patch_mask
-
-            if not intersected.any():
-                ordered_patches_no_overlap.append(patch_slice)
-                blocked_mask = blocked_mask | patch_mask
+        ]
 
         # Increasingly perturb the input and store the decrease in function value.
         results = np.array([None for _ in range(len(ordered_patches_no_overlap))])
@@ -37,6 +37,11 @@ class Sufficiency(Metric):
         - We assume that a given explanation applies to 'anothers' data point if the distance between
         the explanation and the explanations of the data point is under the user-defined threshold.
 
+    By default, the full pairwise distance matrix of the explanations is computed. If 'neighbourhood_batch_size'
+    is set, the distances are computed in blocks of that many rows, in one pass for the maximum distance and one
+    pass for the neighbours, so memory grows linearly with the number of instances. Only the neighbour lists of
+    each instance are kept, which allows evaluating sufficiency over a whole dataset in one call.
+
     References:
          1) Sanjoy Dasgupta et al.: "Framework for Evaluating Faithfulness of Local
             Explanations." ICML (2022): 4794-4815.
@@ -68,6 +73,7 @@ class Sufficiency(Metric):
         default_plot_func: Optional[Callable] = None,
         disable_warnings: bool = False,
         display_progressbar: bool = False,
+        neighbourhood_batch_size: Optional[int] = None,
         **kwargs,
     ):
         """
@@ -102,6 +108,10 @@ class Sufficiency(Metric):
             Indicates whether the warnings are printed, default=False.
         display_progressbar: boolean
             Indicates whether a tqdm-progress-bar is printed, default=False.
+        neighbourhood_batch_size: integer, optional
+            The number of rows of the distance matrix, and of inputs predicted on, that are computed at once.
+            Requires the default normalise_func, as the distances are normalised by their maximum. If None,
+            the full distance matrix is computed, default=None.
         kwargs: optional
             Keyword arguments.
         """
@@ -124,9 +134,19 @@ class Sufficiency(Metric):
         # Save metric-specific attributes.
         self.threshold = threshold
         self.distance_func = distance_func
+        self.neighbourhood_batch_size = neighbourhood_batch_size
         self.y_pred_classes = None
 
         # Asserts and warnings.
+        if self.neighbourhood_batch_size is not None:
+            asserts.assert_neighbourhood_batch_size(
+                neighbourhood_batch_size=self.neighbourhood_batch_size
+            )
+            if self.normalise_func is not normalise_by_max:
+                raise ValueError(
+                    "Set 'neighbourhood_batch_size' to None to normalise the distances with a custom "
+                    "'normalise_func', only the normalisation by the maximum distance is computed in blocks."
+                )
         if not self.disable_warnings:
             warn.warn_parameterisation(
                 metric_name=self.__class__.__name__,
@@ -256,6 +276,7 @@ class Sufficiency(Metric):
         i: int = None,
         a_sim_vector: np.ndarray = None,
         y_pred_classes: np.ndarray = None,
+        neighbours: np.ndarray = None,
     ) -> float:
         """
         Evaluate instance gets model and data for a single instance as input and returns the evaluation result.
@@ -278,6 +299,9 @@ class Sufficiency(Metric):
             The custom input to be evaluated on an instance-basis.
         y_pred_classes: np,ndarray
             The class predictions of the complete input dataset.
+        neighbours: np.ndarray
+            The indices of the instances whose explanations are within the threshold distance. If None,
+            they are taken from a_sim_vector.
 
         Returns
         -------
@@ -287,8 +311,9 @@ class Sufficiency(Metric):
 
         # Metric logic.
         pred_a = y_pred_classes[i]
-        low_dist_a = np.argwhere(a_sim_vector == 1.0).flatten()
-        low_dist_a = low_dist_a[low_dist_a != i]
+        if neighbours is None:
+            neighbours = np.argwhere(a_sim_vector == 1.0).flatten()
+        low_dist_a = neighbours[neighbours != i]
         pred_low_dist_a = y_pred_classes[low_dist_a]
 
         if len(low_dist_a) == 0:
@@ -325,23 +350,97 @@ class Sufficiency(Metric):
         Returns
         -------
         dictionary[str, np.ndarray]
-            Output dictionary with 'a_sim_vector_batch' as and attributtion similarity matrix as value.
+            Output dictionary with 'neighbours_batch' as the neighbour indices of each instance as value.
         """
 
         a_batch_flat = a_batch.reshape(a_batch.shape[0], -1)
-        dist_matrix = cdist(a_batch_flat, a_batch_flat, self.distance_func, V=None)
-        dist_matrix = self.normalise_func(dist_matrix)
-        a_sim_matrix = np.zeros_like(dist_matrix)
-        a_sim_matrix[dist_matrix <= self.threshold] = 1
-
-        # Predict on input.
-        x_input = model.shape_input(
-            x_batch, x_batch[0].shape, channel_first=True, batched=True
-        )
-        y_pred_classes = np.argmax(model.predict(x_input), axis=1).flatten()
+
+        if self.neighbourhood_batch_size is None:
+            # V is estimated from the explanations for 'seuclidean', and not accepted by other distances.
+            dist_matrix = cdist(a_batch_flat, a_batch_flat, self.distance_func)
+            dist_matrix = self.normalise_func(dist_matrix)
+            neighbours = [np.flatnonzero(dist <= self.threshold) for dist in dist_matrix]
+
+            # Predict on input.
+            x_input = model.shape_input(
+                x_batch, x_batch[0].shape, channel_first=True, batched=True
+            )
+            y_pred_classes = np.argmax(model.predict(x_input), axis=1).flatten()
+
+        else:
+            neighbours = self.get_neighbours(a_batch_flat=a_batch_flat)
+
+            # Predict on input, chunk by chunk.
+            y_pred_classes = np.concatenate(
+                [
+                    np.argmax(
+                        model.predict(
+                            model.shape_input(
+                                x_batch[start : start + self.neighbourhood_batch_size],
+                                x_batch[0].shape,
+                                channel_first=True,
+                                batched=True,
+                            )
+                        ),
+                        axis=1,
+                    ).flatten()
+                    for start in range(
+                        0, x_batch.shape[0], self.neighbourhood_batch_size
+                    )
+                ]
+            )
 
         return {
             "i_batch": np.arange(x_batch.shape[0]),
-            "a_sim_vector_batch": a_sim_matrix,
+            "neighbours_batch": neighbours,
             "y_pred_classes": y_pred_classes,
         }
+
+    def get_neighbours(self, a_batch_flat: np.ndarray) -> List[np.ndarray]:
+        """
+        Find the instances whose explanations are within the threshold distance of each explanation,
+        computing the distance matrix in blocks of neighbourhood_batch_size rows.
+
+        The distances are normalised by their maximum, as normalise_by_max does on the full matrix, which
+        needs one pass over the blocks for the maximum and one for the neighbours.
+
+        Parameters
+        ----------
+        a_batch_flat: np.ndarray
+            The flattened explanations.
+
+        Returns
+        -------
+        list
+            The indices of the neighbours of each instance.
+        """
+        n_instances = a_batch_flat.shape[0]
+
+        distance_kwargs: Dict[str, np.ndarray] = {}
+        if self.distance_func == "seuclidean":
+            # cdist(X, X) estimates the variances from X stacked twice, use the same estimate for every block.
+            distance_kwargs["V"] = (
+                np.var(a_batch_flat, axis=0, dtype=np.float64) * 2 * n_instances / (2 * n_instances - 1)
+            )
+
+        def distance_blocks():
+            for start in range(0, n_instances, self.neighbourhood_batch_size):
+                yield cdist(
+                    a_batch_flat[start : start + self.neighbourhood_batch_size],
+                    a_batch_flat,
+                    self.distance_func,
+                    **distance_kwargs,
+                )
+
+        dist_max = max(np.max(np.abs(dist_block)) for dist_block in distance_blocks())
+
+        neighbours: List[np.ndarray] = []
+        for dist_block in distance_blocks():
+            # No normalisation if all distances are zero, as in normalise_by_max.
+            if dist_max != 0.0:
+                dist_block = np.divide(dist_block, dist_max)
+            neighbours.extend(
+                np.flatnonzero(dist <= self.threshold) for dist in dist_block
+            )
+
+        return neighbours
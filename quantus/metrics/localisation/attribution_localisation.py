@@ -13,7 +13,7 @@ from quantus.helpers import asserts
 from quantus.helpers import warn
 from quantus.helpers.model.model_interface import ModelInterface
 from quantus.functions.normalise_func import normalise_by_max
-from quantus.metrics.base import Metric
+from quantus.metrics.base_batched import BatchedMetric
 from quantus.helpers.enums import (
     ModelType,
     DataType,
@@ -22,7 +22,7 @@ from quantus.helpers.enums import (
 )
 
 
-class AttributionLocalisation(Metric):
+class AttributionLocalisation(BatchedMetric):
     """
     Implementation of the Attribution Localization by Kohlbrenner et al., 2020.
 
@@ -30,6 +30,8 @@ class AttributionLocalisation(Metric):
     attribution. High scores are desired, as it means, that the positively attributed pixels belong to the
     targeted object class.
 
+    Masked sums over the flattened attributions and masks give the ratios of a whole batch at once.
+
     References:
         1) Max Kohlbrenner et al., "Towards Best Practice in Explaining Neural Network Decisions with LRP."
            IJCNN (2020): 1-7.
@@ -238,6 +240,7 @@ class AttributionLocalisation(Metric):
             softmax=softmax,
             device=device,
             model_predict_kwargs=model_predict_kwargs,
+            batch_size=batch_size,
             **kwargs,
         )
 
@@ -248,6 +251,7 @@ class AttributionLocalisation(Metric):
         y: np.ndarray,
         a: np.ndarray,
         s: np.ndarray,
+        **kwargs,
     ) -> float:
         """
         Evaluate instance gets model and data for a single instance as input and returns the evaluation result.
@@ -264,6 +268,8 @@ class AttributionLocalisation(Metric):
             The explanation to be evaluated on an instance-basis.
         s: np.ndarray
             The segmentation to be evaluated on an instance-basis.
+        kwargs: optional
+            Keyword arguments.
 
         Returns
         -------
@@ -299,6 +305,74 @@ class AttributionLocalisation(Metric):
         else:
             return float(inside_attribution_ratio * ratio)
 
+    def evaluate_batch(
+        self,
+        model: ModelInterface,
+        x_batch: np.ndarray,
+        y_batch: np.ndarray,
+        a_batch: np.ndarray,
+        s_batch: np.ndarray,
+    ) -> List[float]:
+        """
+        Evaluates model and attributes on a single data batch and returns the batched evaluation result.
+
+        The inside and total attribution of all explanations are computed as masked sums over the
+        flattened (instance, feature) matrix.
+
+        Parameters
+        ----------
+        model: ModelInterface
+            A ModelInteface that is subject to explanation.
+        x_batch: np.ndarray
+            The input to be evaluated on a batch-basis.
+        y_batch: np.ndarray
+            The output to be evaluated on a batch-basis.
+        a_batch: np.ndarray
+            The explanation to be evaluated on a batch-basis.
+        s_batch: np.ndarray
+            The segmentation to be evaluated on a batch-basis.
+
+        Returns
+        -------
+        list
+            The evaluation results.
+        """
+        # Return np.nan as result if segmentation map is empty.
+        scores = np.full(len(a_batch), np.nan)
+        non_empty = np.sum(s_batch.reshape(len(s_batch), -1), axis=1) != 0
+        if not np.all(non_empty):
+            warn.warn_empty_segmentation()
+
+        # Prepare shapes.
+        a_batch = a_batch.reshape(len(a_batch), -1)[non_empty]
+        s_batch = s_batch.reshape(len(s_batch), -1)[non_empty].astype(bool)
+
+        # Compute ratio.
+        size_bbox = np.sum(s_batch, axis=1).astype(float)
+        size_data = np.prod(x_batch.shape[2:])
+        ratio = size_bbox / size_data
+
+        # Compute inside/outside ratio.
+        inside_attribution = np.sum(np.where(s_batch, a_batch, 0), axis=1)
+        total_attribution = np.sum(a_batch, axis=1)
+        inside_attribution_ratio = inside_attribution / total_attribution
+
+        if not np.all(ratio <= self.max_size):
+            warn.warn_max_size()
+
+        invalid = inside_attribution_ratio > 1.0
+        for inside, total in zip(
+            inside_attribution[invalid], total_attribution[invalid]
+        ):
+            warn.warn_segmentation(inside, total)
+
+        if self.weighted:
+            inside_attribution_ratio = inside_attribution_ratio * ratio
+
+        scores[non_empty] = np.where(invalid, np.nan, inside_attribution_ratio)
+
+        return scores.tolist()
+
     def custom_preprocess(
         self,
         model: ModelInterface,
@@ -8,13 +8,14 @@
 
 from typing import Any, Callable, Dict, List, Optional, Tuple
 import numpy as np
+from scipy.stats import rankdata
 from sklearn.metrics import roc_curve, auc
 
 from quantus.helpers import asserts
 from quantus.helpers import warn
 from quantus.helpers.model.model_interface import ModelInterface
 from quantus.functions.normalise_func import normalise_by_max
-from quantus.metrics.base import Metric
+from quantus.metrics.base_batched import BatchedMetric
 from quantus.helpers.enums import (
     ModelType,
     DataType,
@@ -23,12 +24,15 @@ from quantus.helpers.enums import (
 )
 
 
-class AUC(Metric):
+class AUC(BatchedMetric):
     """
     Implementation of AUC metric by Fawcett et al., 2006.
 
     AUC is a ranking metric and  compares the ranking between attributions and a given ground-truth mask
 
+    The AUC of a batch is computed from the ranks of the attributions (Mann-Whitney U statistic)
+    rather than from a ROC curve per instance.
+
     References:
         1) Tom Fawcett: 'An introduction to ROC analysis' "Pattern Recognition Letters" Vol 27, Issue 8, 2006
 
@@ -215,6 +219,7 @@ class AUC(Metric):
             softmax=softmax,
             device=device,
             model_predict_kwargs=model_predict_kwargs,
+            batch_size=batch_size,
             **kwargs,
         )
 
@@ -225,6 +230,7 @@ class AUC(Metric):
         y: np.ndarray,
         a: np.ndarray,
         s: np.ndarray,
+        **kwargs,
     ) -> float:
         """
         Evaluate instance gets model and data for a single instance as input and returns the evaluation result.
@@ -241,6 +247,8 @@ class AUC(Metric):
             The explanation to be evaluated on an instance-basis.
         s: np.ndarray
             The segmentation to be evaluated on an instance-basis.
+        kwargs: optional
+            Keyword arguments.
 
         Returns
         -------
@@ -261,6 +269,62 @@ class AUC(Metric):
 
         return score
 
+    def evaluate_batch(
+        self,
+        model: ModelInterface,
+        x_batch: np.ndarray,
+        y_batch: np.ndarray,
+        a_batch: np.ndarray,
+        s_batch: np.ndarray,
+    ) -> List[float]:
+        """
+        Evaluates model and attributes on a single data batch and returns the batched evaluation result.
+
+        The AUC of all explanations is computed as the Mann-Whitney U statistic of the ranks of the
+        features within the masks, which equals the area under the ROC curve, with ties counted as one half.
+
+        Parameters
+        ----------
+        model: ModelInterface
+            A ModelInteface that is subject to explanation.
+        x_batch: np.ndarray
+            The input to be evaluated on a batch-basis.
+        y_batch: np.ndarray
+            The output to be evaluated on a batch-basis.
+        a_batch: np.ndarray
+            The explanation to be evaluated on a batch-basis.
+        s_batch: np.ndarray
+            The segmentation to be evaluated on a batch-basis.
+
+        Returns
+        -------
+        list
+            The evaluation results.
+        """
+        # Return np.nan as result if segmentation map is empty.
+        scores = np.full(len(a_batch), np.nan)
+        non_empty = np.sum(s_batch.reshape(len(s_batch), -1), axis=1) != 0
+        if not np.all(non_empty):
+            warn.warn_empty_segmentation()
+
+        # Prepare shapes.
+        a_batch = a_batch.reshape(len(a_batch), -1)[non_empty]
+        s_batch = s_batch.reshape(len(s_batch), -1)[non_empty].astype(bool)
+
+        # Rank of each feature, with ties averaged.
+        ranks = rankdata(a_batch, axis=1)
+
+        # Mann-Whitney U statistic of the features within the masks.
+        n_pos = np.sum(s_batch, axis=1)
+        n_neg = s_batch.shape[1] - n_pos
+        u_statistic = (
+            np.sum(np.where(s_batch, ranks, 0), axis=1) - n_pos * (n_pos + 1) / 2
+        )
+
+        scores[non_empty] = u_statistic / (n_pos * n_neg)
+
+        return scores.tolist()
+
     def custom_preprocess(
         self,
         model: ModelInterface,
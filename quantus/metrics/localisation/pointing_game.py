@@ -13,7 +13,7 @@ from quantus.helpers import asserts
 from quantus.helpers import warn
 from quantus.helpers.model.model_interface import ModelInterface
 from quantus.functions.normalise_func import normalise_by_max
-from quantus.metrics.base import Metric
+from quantus.metrics.base_batched import BatchedMetric
 from quantus.helpers.enums import (
     ModelType,
     DataType,
@@ -22,7 +22,7 @@ from quantus.helpers.enums import (
 )
 
 
-class PointingGame(Metric):
+class PointingGame(BatchedMetric):
     """
     Implementation of the Pointing Game by Zhang et al., 2018.
 
@@ -30,6 +30,8 @@ class PointingGame(Metric):
     denoted by a binary mask. High scores are desired as it means, that the maximal attributed pixel belongs to
     an object of the specified class.
 
+    The scores of a batch are computed with array operations over the flattened attributions and masks.
+
     References:
         1) Jianming Zhang et al.:
            "Top-Down Neural Attention by Excitation Backprop." International Journal of Computer Vision
@@ -227,6 +229,7 @@ class PointingGame(Metric):
             softmax=softmax,
             device=device,
             model_predict_kwargs=model_predict_kwargs,
+            batch_size=batch_size,
             **kwargs,
         )
 
@@ -237,6 +240,7 @@ class PointingGame(Metric):
         y: np.ndarray,
         a: np.ndarray,
         s: np.ndarray,
+        **kwargs,
     ) -> bool:
         """
         Evaluate instance gets model and data for a single instance as input and returns the evaluation result.
@@ -253,6 +257,8 @@ class PointingGame(Metric):
             The explanation to be evaluated on an instance-basis.
         s: np.ndarray
             The segmentation to be evaluated on an instance-basis.
+        kwargs: optional
+            Keyword arguments.
 
         Returns
         -------
@@ -280,6 +286,61 @@ class PointingGame(Metric):
 
         return hit
 
+    def evaluate_batch(
+        self,
+        model: ModelInterface,
+        x_batch: np.ndarray,
+        y_batch: np.ndarray,
+        a_batch: np.ndarray,
+        s_batch: np.ndarray,
+    ) -> List[float]:
+        """
+        Evaluates model and attributes on a single data batch and returns the batched evaluation result.
+
+        The point of maximal attribution of all explanations is found with one reduction over the
+        flattened (instance, feature) matrix.
+
+        Parameters
+        ----------
+        model: ModelInterface
+            A ModelInteface that is subject to explanation.
+        x_batch: np.ndarray
+            The input to be evaluated on a batch-basis.
+        y_batch: np.ndarray
+            The output to be evaluated on a batch-basis.
+        a_batch: np.ndarray
+            The explanation to be evaluated on a batch-basis.
+        s_batch: np.ndarray
+            The segmentation to be evaluated on a batch-basis.
+
+        Returns
+        -------
+        list
+            The evaluation results.
+        """
+        # Return np.nan as result if segmentation map is empty.
+        scores = np.full(len(a_batch), np.nan)
+        non_empty = np.sum(s_batch.reshape(len(s_batch), -1), axis=1) != 0
+        if not np.all(non_empty):
+            warn.warn_empty_segmentation()
+
+        # Prepare shapes.
+        a_batch = a_batch.reshape(len(a_batch), -1)[non_empty]
+        s_batch = s_batch.reshape(len(s_batch), -1)[non_empty].astype(bool)
+
+        # Find indices with max value.
+        max_mask = a_batch == np.max(a_batch, axis=1, keepdims=True)
+
+        # Check if maximum of explanation is on target object class.
+        hits = np.any(np.logical_and(s_batch, max_mask), axis=1)
+
+        if self.weighted:
+            hits = np.where(hits, 1 - (np.sum(s_batch, axis=1) / s_batch.shape[1]), 0.0)
+
+        scores[non_empty] = hits
+
+        return scores.tolist()
+
     def custom_preprocess(
         self,
         model: ModelInterface,
@@ -13,7 +13,7 @@ from quantus.helpers import asserts
 from quantus.helpers import warn
 from quantus.helpers.model.model_interface import ModelInterface
 from quantus.functions.normalise_func import normalise_by_max
-from quantus.metrics.base import Metric
+from quantus.metrics.base_batched import BatchedMetric
 from quantus.helpers.enums import (
     ModelType,
     DataType,
@@ -22,7 +22,7 @@ from quantus.helpers.enums import (
 )
 
 
-class RelevanceMassAccuracy(Metric):
+class RelevanceMassAccuracy(BatchedMetric):
     """
     Implementation of the Relevance Mass Accuracy by Arras et al., 2021.
 
@@ -30,6 +30,8 @@ class RelevanceMassAccuracy(Metric):
     the sum of overall positive attributions. High scores are desired, as the pixels with the highest positively
     attributed scores should be within the bounding box of the targeted object.
 
+    The relevance mass of a batch is computed with masked sums over the flattened attributions and masks.
+
     References:
         1) Leila Arras et al.: "CLEVR-XAI: A benchmark dataset for the ground
         truth evaluation of neural network explanations." Inf. Fusion 81 (2022): 14-40.
@@ -221,6 +223,7 @@ class RelevanceMassAccuracy(Metric):
             softmax=softmax,
             device=device,
             model_predict_kwargs=model_predict_kwargs,
+            batch_size=batch_size,
             **kwargs,
         )
 
@@ -231,6 +234,7 @@ class RelevanceMassAccuracy(Metric):
         y: np.ndarray,
         a: np.ndarray,
         s: np.ndarray,
+        **kwargs,
     ) -> float:
         """
         Evaluate instance gets model and data for a single instance as input and returns the evaluation result.
@@ -247,6 +251,8 @@ class RelevanceMassAccuracy(Metric):
             The explanation to be evaluated on an instance-basis.
         s: np.ndarray
             The segmentation to be evaluated on an instance-basis.
+        kwargs: optional
+            Keyword arguments.
 
         Returns
         -------
@@ -271,6 +277,57 @@ class RelevanceMassAccuracy(Metric):
 
         return mass_accuracy
 
+    def evaluate_batch(
+        self,
+        model: ModelInterface,
+        x_batch: np.ndarray,
+        y_batch: np.ndarray,
+        a_batch: np.ndarray,
+        s_batch: np.ndarray,
+    ) -> List[float]:
+        """
+        Evaluates model and attributes on a single data batch and returns the batched evaluation result.
+
+        The relevance within the masks is computed as a masked sum over the flattened (instance, feature)
+        matrix.
+
+        Parameters
+        ----------
+        model: ModelInterface
+            A ModelInteface that is subject to explanation.
+        x_batch: np.ndarray
+            The input to be evaluated on a batch-basis.
+        y_batch: np.ndarray
+            The output to be evaluated on a batch-basis.
+        a_batch: np.ndarray
+            The explanation to be evaluated on a batch-basis.
+        s_batch: np.ndarray
+            The segmentation to be evaluated on a batch-basis.
+
+        Returns
+        -------
+        list
+            The evaluation results.
+        """
+        # Return np.nan as result if segmentation map is empty.
+        scores = np.full(len(a_batch), np.nan)
+        non_empty = np.sum(s_batch.reshape(len(s_batch), -1), axis=1) != 0
+        if not np.all(non_empty):
+            warn.warn_empty_segmentation()
+
+        # Prepare shapes.
+        a_batch = a_batch.reshape(len(a_batch), -1)[non_empty]
+        s_batch = s_batch.reshape(len(s_batch), -1)[non_empty].astype(bool)
+
+        # Compute inside/outside ratio.
+        r_within = np.sum(np.where(s_batch, a_batch, 0), axis=1)
+        r_total = np.sum(a_batch, axis=1)
+
+        # Calculate mass accuracy.
+        scores[non_empty] = r_within / r_total
+
+        return scores.tolist()
+
     def custom_preprocess(
         self,
         model: ModelInterface,
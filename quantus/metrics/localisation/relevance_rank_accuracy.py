@@ -13,7 +13,7 @@ from quantus.helpers import asserts
 from quantus.helpers import warn
 from quantus.helpers.model.model_interface import ModelInterface
 from quantus.functions.normalise_func import normalise_by_max
-from quantus.metrics.base import Metric
+from quantus.metrics.base_batched import BatchedMetric
 from quantus.helpers.enums import (
     ModelType,
     DataType,
@@ -22,7 +22,7 @@ from quantus.helpers.enums import (
 )
 
 
-class RelevanceRankAccuracy(Metric):
+class RelevanceRankAccuracy(BatchedMetric):
     """
     Implementation of the Relevance Rank Accuracy by Arras et al., 2021.
 
@@ -32,6 +32,8 @@ class RelevanceRankAccuracy(Metric):
     as the pixels with the highest positively attributed scores should be within the bounding box of the targeted
     object.
 
+    The ranks of all features of a batch are computed with one row-wise argsort.
+
     References:
         1) Leila Arras et al.: "CLEVR-XAI: A benchmark dataset for the ground
         truth evaluation of neural network explanations." Inf. Fusion 81 (2022): 14-40.
@@ -223,6 +225,7 @@ class RelevanceRankAccuracy(Metric):
             softmax=softmax,
             device=device,
             model_predict_kwargs=model_predict_kwargs,
+            batch_size=batch_size,
             **kwargs,
         )
 
@@ -233,6 +236,7 @@ class RelevanceRankAccuracy(Metric):
         y: np.ndarray,
         a: np.ndarray,
         s: np.ndarray,
+        **kwargs,
     ) -> float:
         """
         Evaluate instance gets model and data for a single instance as input and returns the evaluation result.
@@ -249,6 +253,8 @@ class RelevanceRankAccuracy(Metric):
             The explanation to be evaluated on an instance-basis.
         s: np.ndarray
             The segmentation to be evaluated on an instance-basis.
+        kwargs: optional
+            Keyword arguments.
 
         Returns
         -------
@@ -280,6 +286,69 @@ class RelevanceRankAccuracy(Metric):
 
         return rank_accuracy
 
+    def evaluate_batch(
+        self,
+        model: ModelInterface,
+        x_batch: np.ndarray,
+        y_batch: np.ndarray,
+        a_batch: np.ndarray,
+        s_batch: np.ndarray,
+    ) -> List[float]:
+        """
+        Evaluates model and attributes on a single data batch and returns the batched evaluation result.
+
+        All explanations are sorted with one argsort over the flattened (instance, feature) matrix, so
+        a feature is among the top k of its explanation if its rank is at least the number of features minus k.
+
+        Parameters
+        ----------
+        model: ModelInterface
+            A ModelInteface that is subject to explanation.
+        x_batch: np.ndarray
+            The input to be evaluated on a batch-basis.
+        y_batch: np.ndarray
+            The output to be evaluated on a batch-basis.
+        a_batch: np.ndarray
+            The explanation to be evaluated on a batch-basis.
+        s_batch: np.ndarray
+            The segmentation to be evaluated on a batch-basis.
+
+        Returns
+        -------
+        list
+            The evaluation results.
+        """
+        # Return np.nan as result if segmentation map is empty.
+        scores = np.full(len(a_batch), np.nan)
+        non_empty = np.sum(s_batch.reshape(len(s_batch), -1), axis=1) != 0
+        if not np.all(non_empty):
+            warn.warn_empty_segmentation()
+
+        # Prepare shapes.
+        a_batch = a_batch.reshape(len(a_batch), -1)[non_empty]
+        s_batch = s_batch.reshape(len(s_batch), -1)[non_empty].astype(bool)
+
+        # Size of the ground truth mask.
+        k = np.sum(s_batch, axis=1)
+
+        # Rank of each feature in ascending order.
+        ranks = np.empty(a_batch.shape, dtype=int)
+        np.put_along_axis(
+            ranks,
+            np.argsort(a_batch, axis=1),
+            np.arange(a_batch.shape[1])[None],
+            axis=1,
+        )
+
+        # Calculate hits.
+        hits = np.sum(
+            np.logical_and(s_batch, ranks >= a_batch.shape[1] - k[:, None]), axis=1
+        )
+
+        scores[non_empty] = hits / k
+
+        return scores.tolist()
+
     def custom_preprocess(
         self,
         model: ModelInterface,
@@ -13,7 +13,7 @@ from quantus.helpers import asserts
 from quantus.helpers import warn
 from quantus.helpers.model.model_interface import ModelInterface
 from quantus.functions.normalise_func import normalise_by_max
-from quantus.metrics.base import Metric
+from quantus.metrics.base_batched import BatchedMetric
 from quantus.helpers.enums import (
     ModelType,
     DataType,
@@ -22,7 +22,7 @@ from quantus.helpers.enums import (
 )
 
 
-class TopKIntersection(Metric):
+class TopKIntersection(BatchedMetric):
     """
     Implementation of the top-k intersection by Theiner et al., 2021.
 
@@ -30,6 +30,9 @@ class TopKIntersection(Metric):
     an "explainer" mask, the binarized version of the explanation. High scores are desired, as the
     overlap between the ground truth object mask and the attribution mask should be maximal.
 
+    The top-k features of a batch are selected with one argpartition, which breaks ties between equal
+    attributions at the k-th position differently than a full sort may.
+
     References:
         1) Jonas Theiner et al.: "Interpretable Semantic Photo
         Geolocalization." arXiv preprint arXiv:2104.14995 (2021).
@@ -232,6 +235,7 @@ class TopKIntersection(Metric):
             softmax=softmax,
             device=device,
             model_predict_kwargs=model_predict_kwargs,
+            batch_size=batch_size,
             **kwargs,
         )
 
@@ -242,6 +246,7 @@ class TopKIntersection(Metric):
         y: np.ndarray,
         a: np.ndarray,
         s: np.ndarray,
+        **kwargs,
     ):
         """
         Evaluate instance gets model and data for a single instance as input and returns the evaluation result.
@@ -258,6 +263,8 @@ class TopKIntersection(Metric):
             The explanation to be evaluated on an instance-basis.
         s: np.ndarray
             The segmentation to be evaluated on an instance-basis.
+        kwargs: optional
+            Keyword arguments.
 
         Returns
         -------
@@ -287,6 +294,64 @@ class TopKIntersection(Metric):
 
         return tki
 
+    def evaluate_batch(
+        self,
+        model: ModelInterface,
+        x_batch: np.ndarray,
+        y_batch: np.ndarray,
+        a_batch: np.ndarray,
+        s_batch: np.ndarray,
+    ) -> List[float]:
+        """
+        Evaluates model and attributes on a single data batch and returns the batched evaluation result.
+
+        The top-k features of all explanations are selected with one argpartition over the flattened
+        (instance, feature) matrix.
+
+        Parameters
+        ----------
+        model: ModelInterface
+            A ModelInteface that is subject to explanation.
+        x_batch: np.ndarray
+            The input to be evaluated on a batch-basis.
+        y_batch: np.ndarray
+            The output to be evaluated on a batch-basis.
+        a_batch: np.ndarray
+            The explanation to be evaluated on a batch-basis.
+        s_batch: np.ndarray
+            The segmentation to be evaluated on a batch-basis.
+
+        Returns
+        -------
+        list
+            The evaluation results.
+        """
+        # Return np.nan as result if segmentation map is empty.
+        scores = np.full(len(a_batch), np.nan)
+        non_empty = np.sum(s_batch.reshape(len(s_batch), -1), axis=1) != 0
+        if not np.all(non_empty):
+            warn.warn_empty_segmentation()
+
+        # Prepare shapes.
+        a_batch = a_batch.reshape(len(a_batch), -1)[non_empty]
+        s_batch = s_batch.reshape(len(s_batch), -1)[non_empty].astype(bool)
+
+        # Create top-k masks.
+        top_k_indices = np.argpartition(a_batch, -self.k, axis=1)[:, -self.k :]
+        top_k_binary_mask = np.zeros(a_batch.shape, dtype=bool)
+        np.put_along_axis(top_k_binary_mask, top_k_indices, True, axis=1)
+
+        # Top-k intersection.
+        tki = 1.0 / self.k * np.sum(np.logical_and(s_batch, top_k_binary_mask), axis=1)
+
+        # Concept influence (with size of object normalised tki score).
+        if self.concept_influence:
+            tki = s_batch.shape[1] / np.sum(s_batch, axis=1) * tki
+
+        scores[non_empty] = tki
+
+        return scores.tolist()
+
     def custom_preprocess(
         self,
         model: ModelInterface,
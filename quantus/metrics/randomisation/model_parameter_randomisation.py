@@ -17,10 +17,15 @@ from typing import (
     Collection,
     Iterable,
 )
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import itertools
+import multiprocessing
+
 import numpy as np
 from tqdm.auto import tqdm
 
 from quantus.helpers import asserts
+from quantus.helpers import utils
 from quantus.helpers import warn
 from quantus.helpers.model.model_interface import ModelInterface
 from quantus.functions.normalise_func import normalise_by_max
@@ -46,6 +51,11 @@ class ModelParameterRandomisation(Metric):
         - In the original paper multiple distance measures are taken: Spearman rank correlation (with and without abs),
         HOG and SSIM. We have set Spearman as the default value.
 
+    Setting n_jobs distributes the randomised layers over a local process pool. Each worker holds its own
+    copy of the model and starts the layer generator at its contiguous block of layers, with the same seeds
+    as the serial layer generator, so the scores equal those of the serial evaluation. The model,
+    explain_func and the metric itself must be picklable; the mode is meant for CPU models.
+
     References:
         1) Julius Adebayo et al.: "Sanity Checks for Saliency Maps." NeurIPS (2018): 9525-9536.
 
@@ -78,6 +88,7 @@ class ModelParameterRandomisation(Metric):
         default_plot_func: Optional[Callable] = None,
         disable_warnings: bool = False,
         display_progressbar: bool = False,
+        n_jobs: Optional[int] = None,
         **kwargs,
     ):
         """
@@ -113,6 +124,12 @@ class ModelParameterRandomisation(Metric):
             Indicates whether the warnings are printed, default=False.
         display_progressbar: boolean
             Indicates whether a tqdm-progress-bar is printed, default=False.
+        n_jobs: integer, optional
+            The number of worker processes the layers are distributed over. If None, the layers are evaluated
+            sequentially in the calling process, default=None. The threads of each worker are limited by
+            n_threads_per_worker, see Metric. If the random layer generator of the model is not
+            reproducible across processes, e.g., for cascading orders of TensorFlow models, the layers are
+            evaluated sequentially.
         kwargs: optional
             Keyword arguments.
         """
@@ -139,12 +156,15 @@ class ModelParameterRandomisation(Metric):
         self.layer_order = layer_order
         self.seed = seed
         self.return_sample_correlation = return_sample_correlation
+        self.n_jobs = n_jobs
 
         # Results are returned/saved as a dictionary not like in the super-class as a list.
         self.evaluation_scores = {}
 
         # Asserts and warnings.
         asserts.assert_layer_order(layer_order=self.layer_order)
+        if self.n_jobs is not None:
+            asserts.assert_n_jobs(n_jobs=self.n_jobs)
         if not self.disable_warnings:
             warn.warn_parameterisation(
                 metric_name=self.__class__.__name__,
@@ -185,8 +205,8 @@ class ModelParameterRandomisation(Metric):
         () on each instance, and saves results to evaluation_scores.
         Calls custom_postprocess() afterwards. Finally returns evaluation_scores.
 
-        The content of evaluation_scores will be appended to all_evaluation_scores (list) at the end of
-        the evaluation call.
+        The content of evaluation_scores will be stored in all_evaluation_scores (a ResultStore) at the end
+        of the evaluation call.
 
         Parameters
         ----------
@@ -280,40 +300,68 @@ class ModelParameterRandomisation(Metric):
         self.evaluation_scores = {}
 
         # Get number of iterations from number of layers.
-        n_layers = len(list(model.get_random_layer_generator(order=self.layer_order)))
-
-        model_iterator = tqdm(
-            model.get_random_layer_generator(order=self.layer_order, seed=self.seed),
-            total=n_layers,
-            disable=not self.display_progressbar,
-        )
-
-        for layer_name, random_layer_model in model_iterator:
-
-            similarity_scores = [None for _ in x_batch]
-
-            # Generate an explanation with perturbed model.
-            a_batch_perturbed = self.explain_func(
-                model=random_layer_model,
-                inputs=x_batch,
-                targets=y_batch,
-                **self.explain_func_kwargs,
+        n_layers = model.get_random_layer_count()
+
+        n_jobs = self.n_jobs
+        if n_jobs is not None and not model.is_random_layer_generator_reproducible(
+            order=self.layer_order
+        ):
+            warn.warn_sequential_layer_randomisation(layer_order=self.layer_order)
+            n_jobs = None
+
+        if n_jobs is None:
+            model_iterator = tqdm(
+                model.get_random_layer_generator(
+                    order=self.layer_order, seed=self.seed
+                ),
+                total=n_layers,
+                disable=not self.display_progressbar,
             )
 
-            batch_iterator = enumerate(zip(a_batch, a_batch_perturbed))
-            for instance_id, (a_instance, a_instance_perturbed) in batch_iterator:
-                result = self.evaluate_instance(
-                    model=random_layer_model,
-                    x=None,
-                    y=None,
-                    s=None,
-                    a=a_instance,
-                    a_perturbed=a_instance_perturbed,
+            for layer_name, random_layer_model in model_iterator:
+
+                # Save similarity scores in a result dictionary.
+                self.evaluation_scores[layer_name] = self.evaluate_layer(
+                    random_layer_model=random_layer_model,
+                    x_batch=x_batch,
+                    y_batch=y_batch,
+                    a_batch=a_batch,
                 )
-                similarity_scores[instance_id] = result
 
-            # Save similarity scores in a result dictionary.
-            self.evaluation_scores[layer_name] = similarity_scores
+        else:
+            layer_chunks = [
+                chunk
+                for chunk in np.array_split(np.arange(n_layers), n_jobs)
+                if len(chunk) > 0
+            ]
+            chunk_scores = [None for _ in layer_chunks]
+
+            # Forked workers can deadlock on the thread pools of torch and tensorflow, hence spawn.
+            with ProcessPoolExecutor(
+                max_workers=len(layer_chunks),
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as executor:
+                futures = {
+                    executor.submit(
+                        self.evaluate_layer_chunk,
+                        model=model,
+                        x_batch=x_batch,
+                        y_batch=y_batch,
+                        a_batch=a_batch,
+                        start=int(chunk[0]),
+                        stop=int(chunk[-1]) + 1,
+                    ): chunk_id
+                    for chunk_id, chunk in enumerate(layer_chunks)
+                }
+                with tqdm(total=n_layers, disable=not self.display_progressbar) as pbar:
+                    for future in as_completed(futures):
+                        chunk_id = futures[future]
+                        chunk_scores[chunk_id] = future.result()
+                        pbar.update(len(layer_chunks[chunk_id]))
+
+            # Merge the per-layer scores in the order of the layer generator.
+            for scores in chunk_scores:
+                self.evaluation_scores.update(scores)
 
         # Call post-processing.
         self.custom_postprocess(
@@ -338,6 +386,128 @@ class ModelParameterRandomisation(Metric):
 
         return self.evaluation_scores
 
+    def get_number_of_evaluation_units(self, n_instances: int, batch_size: int) -> int:
+        """
+        Get the number of units that a call on n_instances instances evaluates one by one. Each randomised
+        layer is explained once for all instances, see estimate_cost().
+
+        Parameters
+        ----------
+        n_instances: integer
+            The number of instances.
+        batch_size: integer
+            The batch size.
+
+        Returns
+        -------
+        integer
+            The number of evaluation units per layer, i.e., 1.
+        """
+        return 1
+
+    def evaluate_layer(
+        self,
+        random_layer_model: ModelInterface,
+        x_batch: np.ndarray,
+        y_batch: np.ndarray,
+        a_batch: np.ndarray,
+    ) -> List[float]:
+        """
+        Explain the batch with a randomised model and compare the explanations to the original ones.
+
+        Parameters
+        ----------
+        random_layer_model: torch.nn.Module, tf.keras.Model
+            The model with one or more randomised layers.
+        x_batch: np.ndarray
+            A np.ndarray which contains the input data that are explained.
+        y_batch: np.ndarray
+            A np.ndarray which contains the output labels that are explained.
+        a_batch: np.ndarray
+            A np.ndarray which contains the original attributions.
+
+        Returns
+        -------
+        list
+            The similarity score of each instance.
+        """
+        similarity_scores = [None for _ in x_batch]
+
+        # Generate an explanation with perturbed model.
+        a_batch_perturbed = self.explain_func(
+            model=random_layer_model,
+            inputs=x_batch,
+            targets=y_batch,
+            **self.explain_func_kwargs,
+        )
+
+        batch_iterator = enumerate(zip(a_batch, a_batch_perturbed))
+        for instance_id, (a_instance, a_instance_perturbed) in batch_iterator:
+            result = self.evaluate_instance(
+                model=random_layer_model,
+                x=None,
+                y=None,
+                s=None,
+                a=a_instance,
+                a_perturbed=a_instance_perturbed,
+            )
+            similarity_scores[instance_id] = result
+
+        return similarity_scores
+
+    def evaluate_layer_chunk(
+        self,
+        model: ModelInterface,
+        x_batch: np.ndarray,
+        y_batch: np.ndarray,
+        a_batch: np.ndarray,
+        start: int,
+        stop: int,
+    ) -> Dict[str, List[float]]:
+        """
+        Evaluate the layers start to stop (exclusive) of the random layer generator, run in a worker process.
+
+        The generator starts at the layer start with the same seed as in the serial evaluation. For cascading
+        orders, it randomises the preceding layers exactly as the serial evaluation does, without explaining
+        them. The torch and BLAS thread pools of the worker are limited to n_threads_per_worker threads, so
+        the workers do not oversubscribe the CPU.
+
+        Parameters
+        ----------
+        model: ModelInterface
+            The (pickled copy of the) ModelInterface that is subject to explanation.
+        x_batch: np.ndarray
+            A np.ndarray which contains the input data that are explained.
+        y_batch: np.ndarray
+            A np.ndarray which contains the output labels that are explained.
+        a_batch: np.ndarray
+            A np.ndarray which contains the original attributions.
+        start: integer
+            The index of the first layer to evaluate.
+        stop: integer
+            The index after the last layer to evaluate.
+
+        Returns
+        -------
+        dict
+            The similarity scores per layer name.
+        """
+        scores = {}
+        layer_generator = model.get_random_layer_generator(
+            order=self.layer_order, seed=self.seed, start=start
+        )
+        with utils.limit_threads(n_threads=self.n_threads_per_worker):
+            for layer_name, random_layer_model in itertools.islice(
+                layer_generator, stop - start
+            ):
+                scores[layer_name] = self.evaluate_layer(
+                    random_layer_model=random_layer_model,
+                    x_batch=x_batch,
+                    y_batch=y_batch,
+                    a_batch=a_batch,
+                )
+        return scores
+
     def evaluate_instance(
         self,
         model: ModelInterface,
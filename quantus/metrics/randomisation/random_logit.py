@@ -14,7 +14,7 @@ from quantus.helpers import warn
 from quantus.helpers.model.model_interface import ModelInterface
 from quantus.functions.normalise_func import normalise_by_max
 from quantus.functions.similarity_func import ssim
-from quantus.metrics.base import Metric
+from quantus.metrics.base_batched import BatchedMetric
 from quantus.helpers.enums import (
     ModelType,
     DataType,
@@ -23,13 +23,16 @@ from quantus.helpers.enums import (
 )
 
 
-class RandomLogit(Metric):
+class RandomLogit(BatchedMetric):
     """
     Implementation of the Random Logit Metric by Sixt et al., 2020.
 
     The Random Logit Metric computes the distance between the original explanation and a reference explanation of
     a randomly chosen non-target class.
 
+    The off-class labels of a batch are drawn at once and the whole batch is explained against them in a single
+    explain_func call.
+
     References:
         1) Leon Sixt et al.: "When Explanations Lie: Why Many Modified BP
         Attributions Fail." ICML (2020): 9046-9057.
@@ -234,9 +237,31 @@ class RandomLogit(Metric):
             softmax=softmax,
             device=device,
             model_predict_kwargs=model_predict_kwargs,
+            batch_size=batch_size,
             **kwargs,
         )
 
+    def get_off_class_labels(self, y_batch: np.ndarray) -> np.ndarray:
+        """
+        Draw an off-class label for each output label, without touching the global random state.
+
+        The offset into the remaining classes is drawn from a generator seeded with self.seed, which gives
+        the same labels as drawing from the list of the other classes after np.random.seed(self.seed).
+
+        Parameters
+        ----------
+        y_batch: np.ndarray
+            The output labels.
+
+        Returns
+        -------
+        np.ndarray
+            The off-class labels.
+        """
+        y_batch = np.asarray(y_batch).reshape(-1)
+        y_offset = np.random.RandomState(self.seed).randint(self.num_classes - 1)
+        return np.where(y_offset >= y_batch, y_offset + 1, y_offset).astype(y_batch.dtype)
+
     def evaluate_instance(
         self,
         model: ModelInterface,
@@ -244,6 +269,7 @@ class RandomLogit(Metric):
         y: np.ndarray,
         a: np.ndarray,
         s: np.ndarray,
+        **kwargs,
     ) -> float:
         """
         Evaluate instance gets model and data for a single instance as input and returns the evaluation result.
@@ -260,6 +286,8 @@ class RandomLogit(Metric):
             The explanation to be evaluated on an instance-basis.
         s: np.ndarray
             The segmentation to be evaluated on an instance-basis.
+        kwargs: optional
+            Keyword arguments.
 
         Returns
         -------
@@ -267,14 +295,7 @@ class RandomLogit(Metric):
             The evaluation results.
         """
         # Randomly select off-class labels.
-        np.random.seed(self.seed)
-        y_off = np.array(
-            [
-                np.random.choice(
-                    [y_ for y_ in list(np.arange(0, self.num_classes)) if y_ != y]
-                )
-            ]
-        )
+        y_off = self.get_off_class_labels(y_batch=np.array([y]))
 
         # Explain against a random class.
         a_perturbed = self.explain_func(
@@ -293,6 +314,71 @@ class RandomLogit(Metric):
 
         return self.similarity_func(a.flatten(), a_perturbed.flatten())
 
+    def evaluate_batch(
+        self,
+        model: ModelInterface,
+        x_batch: np.ndarray,
+        y_batch: np.ndarray,
+        a_batch: np.ndarray,
+        s_batch: np.ndarray,
+    ) -> List[float]:
+        """
+        Evaluates model and attributes on a single data batch and returns the batched evaluation result.
+
+        The batch is explained against its off-class labels with one explain_func call.
+
+        Parameters
+        ----------
+        model: ModelInterface
+            A ModelInteface that is subject to explanation.
+        x_batch: np.ndarray
+            The input to be evaluated on a batch-basis.
+        y_batch: np.ndarray
+            The output to be evaluated on a batch-basis.
+        a_batch: np.ndarray
+            The explanation to be evaluated on a batch-basis.
+        s_batch: np.ndarray
+            The segmentation to be evaluated on a batch-basis.
+
+        Returns
+        -------
+        list
+            The evaluation results.
+        """
+        # Randomly select off-class labels.
+        y_off = self.get_off_class_labels(y_batch=y_batch)
+
+        # Explain against a random class.
+        a_batch_perturbed = self.explain_func(
+            model=model.get_model(),
+            inputs=x_batch,
+            targets=y_off,
+            **self.explain_func_kwargs,
+        )
+
+        # Normalise each attribution on its own, as the default normalisers reduce over the whole array.
+        if self.normalise:
+            a_batch_perturbed = np.stack(
+                [
+                    self.normalise_func(
+                        np.expand_dims(a_perturbed, axis=0),
+                        **self.normalise_func_kwargs,
+                    )[0]
+                    for a_perturbed in a_batch_perturbed
+                ]
+            )
+
+        if self.abs:
+            a_batch_perturbed = np.abs(a_batch_perturbed)
+
+        a_batch = a_batch.reshape(len(a_batch), -1)
+        a_batch_perturbed = a_batch_perturbed.reshape(len(a_batch_perturbed), -1)
+
+        return [
+            self.similarity_func(a, a_perturbed)
+            for a, a_perturbed in zip(a_batch, a_batch_perturbed)
+        ]
+
     def custom_preprocess(
         self,
         model: ModelInterface,
@@ -14,7 +14,7 @@ from quantus.functions import norm_func
 from quantus.helpers import warn
 from quantus.helpers.model.model_interface import ModelInterface
 from quantus.functions.normalise_func import normalise_by_max
-from quantus.functions.perturb_func import uniform_noise, perturb_batch
+from quantus.functions.perturb_func import uniform_noise
 from quantus.functions.similarity_func import difference
 from quantus.metrics.base_batched import BatchedPerturbationMetric
 from quantus.helpers.enums import (
@@ -73,6 +73,7 @@ class AvgSensitivity(BatchedPerturbationMetric):
         disable_warnings: bool = False,
         display_progressbar: bool = False,
         return_nan_when_prediction_changes: bool = False,
+        perturbation_batch_size: Optional[int] = None,
         **kwargs,
     ):
         """
@@ -117,6 +118,10 @@ class AvgSensitivity(BatchedPerturbationMetric):
             Indicates whether a tqdm-progress-bar is printed, default=False.
         return_nan_when_prediction_changes: boolean
             When set to true, the metric will be evaluated to NaN if the prediction changes after the perturbation is applied.
+        perturbation_batch_size: integer, optional
+            The maximum number of perturbed inputs that are explained in one explain_func call. As many
+            samples as fit are stacked along the batch axis. If None, each sample is explained
+            separately, default=None.
         kwargs: optional
             Keyword arguments.
         """
@@ -148,6 +153,11 @@ class AvgSensitivity(BatchedPerturbationMetric):
 
         # Save metric-specific attributes.
         self.nr_samples = nr_samples
+        self.perturbation_batch_size = perturbation_batch_size
+        if self.perturbation_batch_size is not None:
+            asserts.assert_perturbation_batch_size(
+                perturbation_batch_size=self.perturbation_batch_size
+            )
 
         if similarity_func is None:
             similarity_func = difference
@@ -319,74 +329,92 @@ class AvgSensitivity(BatchedPerturbationMetric):
         batch_size = x_batch.shape[0]
         similarities = np.zeros((batch_size, self.nr_samples)) * np.nan
 
-        for step_id in range(self.nr_samples):
+        # Predict on the unperturbed input once for all samples.
+        y_pred = (
+            self.predict_reference(model=model, x_batch=x_batch)
+            if self.return_nan_when_prediction_changes
+            else None
+        )
 
-            # Perturb input.
-            x_perturbed = perturb_batch(
-                perturb_func=self.perturb_func,
-                indices=np.tile(np.arange(0, x_batch[0].size), (batch_size, 1)),
-                indexed_axes=np.arange(0, x_batch[0].ndim),
-                arr=x_batch,
-                **self.perturb_func_kwargs,
+        for sample_ids in self.get_sample_chunks(
+            nr_samples=self.nr_samples,
+            batch_size=batch_size,
+            perturbation_batch_size=self.perturbation_batch_size,
+        ):
+
+            # Perturb input, the samples of the chunk stacked along the batch axis.
+            x_perturbed_chunk = self.perturb_samples(
+                x_batch=x_batch, nr_samples=len(sample_ids)
             )
 
-            changed_prediction_indices = (
-                np.argwhere(
-                    model.predict(x_batch).argmax(axis=-1)
-                    != model.predict(x_perturbed).argmax(axis=-1)
-                ).reshape(-1)
+            y_pred_perturbed_chunk = (
+                model.predict(x_perturbed_chunk)
                 if self.return_nan_when_prediction_changes
-                else []
+                else None
             )
 
             x_input = model.shape_input(
-                x=x_perturbed,
-                shape=x_batch.shape,
+                x=x_perturbed_chunk,
+                shape=x_perturbed_chunk.shape,
                 channel_first=True,
                 batched=True,
             )
 
-            for x_instance, x_instance_perturbed in zip(x_batch, x_perturbed):
-                warn.warn_perturbation_caused_no_change(
-                    x=x_instance,
-                    x_perturbed=x_instance_perturbed,
-                )
-
-            # Generate explanation based on perturbed input x.
-            a_perturbed = self.explain_func(
+            # Generate explanations based on perturbed inputs, in one call for the chunk.
+            a_perturbed_chunk = self.explain_func(
                 model=model.get_model(),
                 inputs=x_input,
-                targets=y_batch,
+                targets=np.tile(y_batch, len(sample_ids)),
                 **self.explain_func_kwargs,
             )
 
-            if self.normalise:
-                a_perturbed = self.normalise_func(
-                    a_perturbed,
-                    **self.normalise_func_kwargs,
+            for chunk_id, step_id in enumerate(sample_ids):
+                sample_slice = slice(chunk_id * batch_size, (chunk_id + 1) * batch_size)
+                x_perturbed = x_perturbed_chunk[sample_slice]
+                a_perturbed = a_perturbed_chunk[sample_slice]
+
+                for x_instance, x_instance_perturbed in zip(x_batch, x_perturbed):
+                    warn.warn_perturbation_caused_no_change(
+                        x=x_instance,
+                        x_perturbed=x_instance_perturbed,
+                    )
+
+                changed_prediction_indices = (
+                    self.get_changed_prediction_indices(
+                        y_pred=y_pred,
+                        y_pred_perturbed=y_pred_perturbed_chunk[sample_slice],
+                    )
+                    if self.return_nan_when_prediction_changes
+                    else []
                 )
 
-            if self.abs:
-                a_perturbed = np.abs(a_perturbed)
-
-            # Measure similarity for each instance separately.
-            for instance_id in range(batch_size):
-
-                if (
-                    self.return_nan_when_prediction_changes
-                    and instance_id in changed_prediction_indices
-                ):
-                    similarities[instance_id, step_id] = np.nan
-                    continue
-
-                sensitivities = self.similarity_func(
-                    a=a_batch[instance_id].flatten(),
-                    b=a_perturbed[instance_id].flatten(),
-                )
-                numerator = self.norm_numerator(a=sensitivities)
-                denominator = self.norm_denominator(a=a_batch[instance_id].flatten())
-                sensitivities_norm = numerator / denominator
-                similarities[instance_id, step_id] = sensitivities_norm
+                if self.normalise:
+                    a_perturbed = self.normalise_func(
+                        a_perturbed,
+                        **self.normalise_func_kwargs,
+                    )
+
+                if self.abs:
+                    a_perturbed = np.abs(a_perturbed)
+
+                # Measure similarity for each instance separately.
+                for instance_id in range(batch_size):
+
+                    if (
+                        self.return_nan_when_prediction_changes
+                        and instance_id in changed_prediction_indices
+                    ):
+                        similarities[instance_id, step_id] = np.nan
+                        continue
+
+                    sensitivities = self.similarity_func(
+                        a=a_batch[instance_id].flatten(),
+                        b=a_perturbed[instance_id].flatten(),
+                    )
+                    numerator = self.norm_numerator(a=sensitivities)
+                    denominator = self.norm_denominator(a=a_batch[instance_id].flatten())
+                    sensitivities_norm = numerator / denominator
+                    similarities[instance_id, step_id] = sensitivities_norm
         mean_func = np.mean if self.return_nan_when_prediction_changes else np.nanmean
         return mean_func(similarities, axis=1)
 
@@ -11,7 +11,7 @@ import numpy as np
 
 from quantus.helpers import asserts
 from quantus.helpers import warn
-from quantus.functions.discretise_func import top_n_sign
+from quantus.functions.discretise_func import BATCH_DISCRETISE_FUNCS, top_n_sign
 from quantus.helpers.model.model_interface import ModelInterface
 from quantus.functions.normalise_func import normalise_by_max
 from quantus.metrics.base import Metric
@@ -34,6 +34,9 @@ class Consistency(Metric):
     Assumptions:
         - A used-defined discreization function is used to discretize continuous explanation spaces.
 
+    The instances are grouped by their discretised label and predicted class once per call, so each score is
+    read from the group sizes instead of comparing every label against all others.
+
     References:
          1) Sanjoy Dasgupta et al.: "Framework for Evaluating Faithfulness of Local
             Explanations." ICML (2022): 4794-4815.
@@ -244,6 +247,9 @@ class Consistency(Metric):
         i: int = None,
         a_label: np.ndarray = None,
         y_pred_classes: np.ndarray = None,
+        n_same_a: int = None,
+        n_same_a_pred: int = None,
+        a_label_batch: Optional[np.ndarray] = None,
     ) -> float:
         """
         Evaluate instance gets model and data for a single instance as input and returns the evaluation result.
@@ -263,23 +269,36 @@ class Consistency(Metric):
         i: int
             The index of the current instance.
         a_label: np.ndarray
-            The discretised attribution labels.
+            The discretised attribution label of this instance.
         y_pred_classes: np,ndarray
             The class predictions of the complete input dataset.
+        n_same_a: integer
+            The number of instances with the same discretised label, including this one. If None,
+            it is counted from a_label_batch.
+        n_same_a_pred: integer
+            The number of instances with the same discretised label and predicted class, including this one.
+        a_label_batch: np.ndarray, optional
+            The discretised attribution labels of the complete input dataset, only used if n_same_a is None.
 
         Returns
         -------
         float
             The evaluation results.
         """
+        if n_same_a is not None:
+            # An instance whose discretised label is unique has no other instance to agree with.
+            if n_same_a == 1:
+                return 0.0
+            return (n_same_a_pred - 1) / (n_same_a - 1)
+
         # Metric logic.
         pred_a = y_pred_classes[i]
-        same_a = np.argwhere(a == a_label).flatten()
+        same_a = np.flatnonzero(np.asarray(a_label_batch) == a_label)
         diff_a = same_a[same_a != i]
         pred_same_a = y_pred_classes[diff_a]
 
-        if len(same_a) == 0:
-            return 0
+        if len(diff_a) == 0:
+            return 0.0
         return np.sum(pred_same_a == pred_a) / len(diff_a)
 
     def custom_preprocess(
@@ -312,19 +331,36 @@ class Consistency(Metric):
         Returns
         -------
         dictionary[str, np.ndarray]
-            Output dictionary with 'a_label_batch' as key and discretised attributtion labels as value.
+            Output dictionary with 'a_label_batch' as key and discretised attributtion labels as value, and the
+            group sizes of each instance.
         """
         # Preprocessing.
         a_batch_flat = a_batch.reshape(a_batch.shape[0], -1)
-        a_labels = np.array(list(map(self.discretise_func, a_batch_flat)))
+        if self.discretise_func in BATCH_DISCRETISE_FUNCS:
+            a_labels = BATCH_DISCRETISE_FUNCS[self.discretise_func](a_batch_flat)
+        else:
+            a_labels = np.array(list(map(self.discretise_func, a_batch_flat)))
 
         x_input = model.shape_input(
             x_batch, x_batch[0].shape, channel_first=True, batched=True
         )
         y_pred_classes = np.argmax(model.predict(x_input), axis=1).flatten()
 
+        # Group the instances by label, and by label and predicted class, in one sort-based pass.
+        _, a_label_ids = np.unique(a_labels, return_inverse=True)
+        a_label_ids = a_label_ids.reshape(-1)
+        n_same_a = np.bincount(a_label_ids)[a_label_ids]
+        _, a_pred_ids, a_pred_counts = np.unique(
+            a_label_ids * (y_pred_classes.max() + 1) + y_pred_classes,
+            return_inverse=True,
+            return_counts=True,
+        )
+        n_same_a_pred = a_pred_counts[a_pred_ids.reshape(-1)]
+
         return {
             "i_batch": np.arange(x_batch.shape[0]),
             "a_label_batch": a_labels,
             "y_pred_classes": y_pred_classes,
+            "n_same_a_batch": n_same_a,
+            "n_same_a_pred_batch": n_same_a_pred,
         }
@@ -15,11 +15,12 @@ if TYPE_CHECKING:
     import torch
 
 
+from quantus.helpers import asserts
 from quantus.helpers.model.model_interface import ModelInterface
 from quantus.metrics.base_batched import BatchedPerturbationMetric
 from quantus.helpers.warn import warn_parameterisation
 from quantus.functions.normalise_func import normalise_by_average_second_moment_estimate
-from quantus.functions.perturb_func import uniform_noise, perturb_batch
+from quantus.functions.perturb_func import uniform_noise
 from quantus.helpers.utils import expand_attribution_channel
 from quantus.helpers.enums import (
     ModelType,
@@ -70,6 +71,7 @@ class RelativeInputStability(BatchedPerturbationMetric):
         eps_min: float = 1e-6,
         default_plot_func: Optional[Callable] = None,
         return_nan_when_prediction_changes: bool = True,
+        perturbation_batch_size: Optional[int] = None,
         **kwargs,
     ):
         """
@@ -103,6 +105,10 @@ class RelativeInputStability(BatchedPerturbationMetric):
             Small constant to prevent division by 0 in relative_stability_objective, default 1e-6.
         return_nan_when_prediction_changes: boolean
             When set to true, the metric will be evaluated to NaN if the prediction changes after the perturbation is applied, default=True.
+        perturbation_batch_size: int, optional
+            The maximum number of perturbed inputs that are explained in one explain_func call. As many
+            samples as fit are stacked along the batch axis. If None, each sample is explained
+            separately, default=None.
         """
 
         if normalise_func is None:
@@ -129,6 +135,11 @@ class RelativeInputStability(BatchedPerturbationMetric):
             **kwargs,
         )
         self._nr_samples = nr_samples
+        self.perturbation_batch_size = perturbation_batch_size
+        if self.perturbation_batch_size is not None:
+            asserts.assert_perturbation_batch_size(
+                perturbation_batch_size=self.perturbation_batch_size
+            )
         self._eps_min = eps_min
         self._return_nan_when_prediction_changes = return_nan_when_prediction_changes
 
@@ -263,7 +274,11 @@ class RelativeInputStability(BatchedPerturbationMetric):
         return nominator / denominator
 
     def generate_normalised_explanations_batch(
-        self, x_batch: np.ndarray, y_batch: np.ndarray, explain_func: Callable
+        self,
+        x_batch: np.ndarray,
+        y_batch: np.ndarray,
+        explain_func: Callable,
+        nr_samples: int = 1,
     ) -> np.ndarray:
         """
         Generate explanation, apply normalization and take absolute values if configured so during metric instantiation.
@@ -276,6 +291,9 @@ class RelativeInputStability(BatchedPerturbationMetric):
              1D tensor, representing predicted labels for the x_batch.
         explain_func: callable
             Function to generate explanations, takes only inputs,targets kwargs.
+        nr_samples: int
+            The number of perturbation samples stacked along the batch axis of x_batch,
+            each of which is normalised separately, default=1.
 
         Returns
         -------
@@ -284,7 +302,12 @@ class RelativeInputStability(BatchedPerturbationMetric):
         """
         a_batch = explain_func(inputs=x_batch, targets=y_batch)
         if self.normalise:
-            a_batch = self.normalise_func(a_batch, **self.normalise_func_kwargs)
+            a_batch = np.concatenate(
+                [
+                    self.normalise_func(a_sample, **self.normalise_func_kwargs)
+                    for a_sample in np.split(a_batch, nr_samples)
+                ]
+            )
         if self.abs:
             a_batch = np.abs(a_batch)
         return expand_attribution_channel(a_batch, x_batch)
@@ -328,41 +351,61 @@ class RelativeInputStability(BatchedPerturbationMetric):
         # Prepare output array.
         ris_batch = np.zeros(shape=[self._nr_samples, x_batch.shape[0]])
 
-        for index in range(self._nr_samples):
-            # Perturb input.
-            x_perturbed = perturb_batch(
-                perturb_func=self.perturb_func,
-                indices=np.tile(np.arange(0, x_batch[0].size), (batch_size, 1)),
-                indexed_axes=np.arange(0, x_batch[0].ndim),
-                arr=x_batch,
-                **self.perturb_func_kwargs,
+        # Predict on the unperturbed input once for all samples.
+        y_pred = (
+            self.predict_reference(model=model, x_batch=x_batch)
+            if self._return_nan_when_prediction_changes
+            else None
+        )
+
+        for sample_ids in self.get_sample_chunks(
+            nr_samples=self._nr_samples,
+            batch_size=batch_size,
+            perturbation_batch_size=self.perturbation_batch_size,
+        ):
+            # Perturb input, the samples of the chunk stacked along the batch axis.
+            x_perturbed_chunk = self.perturb_samples(
+                x_batch=x_batch, nr_samples=len(sample_ids)
             )
 
-            # Generate explanations for perturbed input.
-            a_batch_perturbed = self.generate_normalised_explanations_batch(
-                x_perturbed, y_batch, _explain_func
+            # Generate explanations for perturbed input, in one call for the chunk.
+            a_batch_perturbed_chunk = self.generate_normalised_explanations_batch(
+                x_perturbed_chunk,
+                np.tile(y_batch, len(sample_ids)),
+                _explain_func,
+                nr_samples=len(sample_ids),
             )
 
-            # Compute maximization's objective.
-            ris = self.relative_input_stability_objective(
-                x_batch, x_perturbed, a_batch, a_batch_perturbed
+            y_pred_perturbed_chunk = (
+                model.predict(x_perturbed_chunk)
+                if self._return_nan_when_prediction_changes
+                else None
             )
-            ris_batch[index] = ris
-
-            # We're done with this sample if `return_nan_when_prediction_changes`==False.
-            if not self._return_nan_when_prediction_changes:
-                continue
-
-            # If perturbed input caused change in prediction, then it's RIS=nan.
-            predicted_y = model.predict(x_batch).argmax(axis=-1)
-            predicted_y_perturbed = model.predict(x_perturbed).argmax(axis=-1)
-            changed_prediction_indices = np.argwhere(
-                predicted_y != predicted_y_perturbed
-            ).reshape(-1)
-
-            if len(changed_prediction_indices) == 0:
-                continue
-            ris_batch[index, changed_prediction_indices] = np.nan
+
+            for chunk_id, index in enumerate(sample_ids):
+                sample_slice = slice(chunk_id * batch_size, (chunk_id + 1) * batch_size)
+                x_perturbed = x_perturbed_chunk[sample_slice]
+                a_batch_perturbed = a_batch_perturbed_chunk[sample_slice]
+
+                # Compute maximization's objective.
+                ris = self.relative_input_stability_objective(
+                    x_batch, x_perturbed, a_batch, a_batch_perturbed
+                )
+                ris_batch[index] = ris
+
+                # We're done with this sample if `return_nan_when_prediction_changes`==False.
+                if not self._return_nan_when_prediction_changes:
+                    continue
+
+                # If perturbed input caused change in prediction, then it's RIS=nan.
+                changed_prediction_indices = self.get_changed_prediction_indices(
+                    y_pred=y_pred,
+                    y_pred_perturbed=y_pred_perturbed_chunk[sample_slice],
+                )
+
+                if len(changed_prediction_indices) == 0:
+                    continue
+                ris_batch[index, changed_prediction_indices] = np.nan
 
         # Compute RIS.
         result = np.max(ris_batch, axis=0)
@@ -0,0 +1,170 @@
+import datetime
+import json
+import pickle
+import platform
+import subprocess
+
+import numpy as np
+import pytest
+import torch
+
+import quantus
+from quantus.functions.mosaic_func import mosaic_creation
+from quantus.helpers.model.models import LeNetAdaptivePooling
+
+N_SAMPLES = 124
+
+
+def _image_s_batch(x_batch: np.ndarray) -> np.ndarray:
+    """A square segmentation mask in the centre of each image."""
+    height, width = x_batch.shape[2:]
+    s_batch = np.zeros((len(x_batch), 1, height, width))
+    s_batch[:, :, height // 4 : 3 * height // 4, width // 4 : 3 * width // 4] = 1.0
+    return s_batch
+
+
+@pytest.fixture(scope="session")
+def mnist_workload(load_mnist_model):
+    """LeNet on 1x28x28 MNIST digits."""
+    x_batch = (
+        np.loadtxt("tests/assets/mnist_x")
+        .astype(float)
+        .reshape((N_SAMPLES, 1, 28, 28))
+    )
+    return {
+        "model": load_mnist_model,
+        "x_batch": x_batch,
+        "y_batch": np.loadtxt("tests/assets/mnist_y").astype(int),
+        "s_batch": _image_s_batch(x_batch),
+        "features_in_step": 56,
+        "subset_size": 56,
+        "patch_size": 7,
+        "num_classes": 10,
+        "explain_func_kwargs": {"method": "Saliency"},
+    }
+
+
+@pytest.fixture(scope="session")
+def cifar_workload():
+    """LeNet with adaptive pooling on 3x32x32 inputs, with the CIFAR-10 weights of tests/assets."""
+    model = LeNetAdaptivePooling(input_shape=(3, 32, 32))
+    model.load_state_dict(
+        torch.load("tests/assets/cifar10", map_location="cpu", pickle_module=pickle)
+    )
+    model.eval()
+    rng = np.random.default_rng(42)
+    x_batch = rng.uniform(size=(N_SAMPLES, 3, 32, 32))
+    return {
+        "model": model,
+        "x_batch": x_batch,
+        "y_batch": rng.integers(0, 10, size=N_SAMPLES),
+        "s_batch": _image_s_batch(x_batch),
+        "features_in_step": 64,
+        "subset_size": 64,
+        "patch_size": 8,
+        "num_classes": 10,
+        "explain_func_kwargs": {"method": "Saliency"},
+    }
+
+
+@pytest.fixture(scope="session")
+def mosaic_workload(mnist_workload):
+    """LeNet with adaptive pooling on 1x56x56 mosaics of MNIST digits."""
+    model = LeNetAdaptivePooling(input_shape=(1, 28, 28))
+    model.load_state_dict(
+        torch.load("tests/assets/mnist", map_location="cpu", pickle_module=pickle)
+    )
+    model.eval()
+    all_mosaics, _, _, p_batch_list, target_list = mosaic_creation(
+        images=mnist_workload["x_batch"],
+        labels=mnist_workload["y_batch"],
+        mosaics_per_class=10,
+        seed=777,
+    )
+    return {
+        "model": model,
+        "x_batch": np.asarray(all_mosaics),
+        "y_batch": np.asarray(target_list),
+        "custom_batch": p_batch_list,
+        "num_classes": 10,
+        "explain_func_kwargs": {"method": "Saliency"},
+    }
+
+
+@pytest.fixture(scope="session")
+def sequence_workload(load_1d_3ch_conv_model):
+    """ConvNet1D on 3x100 sequences."""
+    rng = np.random.default_rng(42)
+    return {
+        "model": load_1d_3ch_conv_model,
+        "x_batch": rng.normal(size=(N_SAMPLES, 3, 100)),
+        "y_batch": rng.integers(0, 10, size=N_SAMPLES),
+        "features_in_step": 10,
+        "subset_size": 10,
+        "patch_size": 10,
+        "num_classes": 10,
+        "explain_func_kwargs": {"method": "Saliency"},
+    }
+
+
+@pytest.fixture(scope="session")
+def tabular_workload(titanic_model_torch, titanic_dataset):
+    """The Titanic MLP on 12 tabular features."""
+    return {
+        "model": titanic_model_torch,
+        "x_batch": titanic_dataset["x_batch"],
+        "y_batch": titanic_dataset["y_batch"],
+        "features_in_step": 1,
+        "subset_size": 4,
+        "patch_size": 1,
+        "num_classes": 2,
+        "explain_func_kwargs": {"method": "IntegratedGradients", "reduce_axes": ()},
+    }
+
+
+def _get_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+@pytest.fixture(scope="session")
+def benchmark_baseline(pytestconfig):
+    """The results of a previous benchmark run to compare to, if --benchmark-compare is given."""
+    path = pytestconfig.getoption("--benchmark-compare")
+    if path is None:
+        return None
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+@pytest.fixture(scope="session")
+def benchmark_results(pytestconfig):
+    """Collects the benchmark results, and writes them to --benchmark-json at the end of the session."""
+    results = {}
+    yield results
+
+    path = pytestconfig.getoption("--benchmark-json")
+    if path is None or not results:
+        return
+    with open(path, "w") as f:
+        json.dump(
+            {
+                "meta": {
+                    "commit": _get_commit(),
+                    "created": datetime.datetime.now().isoformat(timespec="seconds"),
+                    "platform": platform.platform(),
+                    "python": platform.python_version(),
+                    "quantus": quantus.__version__,
+                    "numpy": np.__version__,
+                    "torch": torch.__version__,
+                    "n_threads": torch.get_num_threads(),
+                },
+                "results": dict(sorted(results.items())),
+            },
+            f,
+            indent=2,
+        )
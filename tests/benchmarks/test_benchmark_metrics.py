@@ -0,0 +1,221 @@
+"""
+Benchmarks of every metric in quantus.AVAILABLE_METRICS, across workloads of different input sizes and across
+batch sizes. Per benchmark, the throughput in instances per second, the forward passes of the model and the
+peak memory are recorded, and can be written to JSON and compared to the results of another commit:
+
+    pytest tests/benchmarks --benchmark-json=benchmarks.json
+    pytest tests/benchmarks --benchmark-json=new.json --benchmark-compare=benchmarks.json
+
+Benchmarks are skipped unless --benchmark or --benchmark-json is given.
+"""
+
+import statistics
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pytest
+
+from quantus.functions.explanation_func import explain
+from quantus.helpers.constants import AVAILABLE_METRICS
+
+IMAGES = ("mnist", "cifar")
+SEQUENCES = IMAGES + ("sequence",)
+TABULAR = SEQUENCES + ("tabular",)
+
+# Per metric class: the workloads it is benchmarked on and its init parameters given a workload. The
+# parameters are light versions of those of tests/metrics, such that the suite runs in minutes.
+BENCHMARK_METRICS: Dict[str, Tuple[Tuple[str, ...], Callable[[dict], dict]]] = {
+    # Faithfulness.
+    "FaithfulnessCorrelation": (
+        SEQUENCES,
+        lambda w: {"nr_runs": 10, "subset_size": w["subset_size"], "perturb_baseline": "mean"},
+    ),
+    "FaithfulnessEstimate": (SEQUENCES, lambda w: {"features_in_step": w["features_in_step"]}),
+    "PixelFlipping": (SEQUENCES, lambda w: {"features_in_step": w["features_in_step"]}),
+    "RegionPerturbation": (
+        SEQUENCES,
+        lambda w: {"patch_size": w["patch_size"], "regions_evaluation": 10},
+    ),
+    "Monotonicity": (SEQUENCES, lambda w: {"features_in_step": w["features_in_step"]}),
+    "MonotonicityCorrelation": (
+        SEQUENCES,
+        lambda w: {"features_in_step": w["features_in_step"], "nr_samples": 10},
+    ),
+    "Selectivity": (SEQUENCES, lambda w: {"patch_size": w["patch_size"]}),
+    "SensitivityN": (SEQUENCES, lambda w: {"features_in_step": w["features_in_step"]}),
+    "IROF": (IMAGES, lambda w: {}),
+    "ROAD": (IMAGES, lambda w: {"percentages": [10, 50, 90]}),
+    "Infidelity": (IMAGES, lambda w: {"n_perturb_samples": 5}),
+    "Sufficiency": (IMAGES, lambda w: {}),
+    # Robustness.
+    "Continuity": (IMAGES, lambda w: {"nr_steps": 10, "patch_size": w["patch_size"]}),
+    "LocalLipschitzEstimate": (SEQUENCES, lambda w: {"nr_samples": 10}),
+    "MaxSensitivity": (SEQUENCES, lambda w: {"nr_samples": 10}),
+    "AvgSensitivity": (SEQUENCES, lambda w: {"nr_samples": 10}),
+    "Consistency": (IMAGES, lambda w: {}),
+    "RelativeInputStability": (SEQUENCES, lambda w: {"nr_samples": 10}),
+    "RelativeOutputStability": (SEQUENCES, lambda w: {"nr_samples": 10}),
+    "RelativeRepresentationStability": (SEQUENCES, lambda w: {"nr_samples": 10}),
+    # Localisation.
+    "PointingGame": (IMAGES, lambda w: {}),
+    "TopKIntersection": (IMAGES, lambda w: {"k": 100}),
+    "RelevanceMassAccuracy": (IMAGES, lambda w: {}),
+    "RelevanceRankAccuracy": (IMAGES, lambda w: {}),
+    "AttributionLocalisation": (IMAGES, lambda w: {}),
+    "AUC": (IMAGES, lambda w: {}),
+    "Focus": (("mosaic",), lambda w: {}),
+    # Complexity.
+    "Sparseness": (TABULAR, lambda w: {}),
+    "Complexity": (TABULAR, lambda w: {}),
+    "EffectiveComplexity": (TABULAR, lambda w: {}),
+    # Randomisation.
+    "ModelParameterRandomisation": (TABULAR, lambda w: {"layer_order": "independent"}),
+    "RandomLogit": (TABULAR, lambda w: {"num_classes": w["num_classes"]}),
+    # Axiomatic.
+    "Completeness": (SEQUENCES, lambda w: {}),
+    "NonSensitivity": (
+        SEQUENCES,
+        lambda w: {"n_samples": 1, "features_in_step": w["features_in_step"]},
+    ),
+    "InputInvariance": (SEQUENCES, lambda w: {"input_shift": -1}),
+}
+
+
+def pytest_generate_tests(metafunc):
+    if "benchmark_case" not in metafunc.fixturenames:
+        return
+    batch_sizes = [
+        int(batch_size)
+        for batch_size in metafunc.config.getoption("--benchmark-batch-sizes").split(",")
+    ]
+    cases, ids = [], []
+    for category, metrics in AVAILABLE_METRICS.items():
+        for metric_class in metrics.values():
+            workloads, _ = BENCHMARK_METRICS.get(metric_class.__name__, ((), None))
+            for workload in workloads:
+                for batch_size in batch_sizes:
+                    cases.append((category, metric_class, workload, batch_size))
+                    ids.append(f"{metric_class.__name__}-{workload}-{batch_size}")
+    metafunc.parametrize("benchmark_case", cases, ids=ids)
+
+
+def take(data: Any, n: int) -> Any:
+    """Take the first n samples of data, repeating it if it has fewer samples."""
+    indices = np.arange(n) % len(data)
+    if isinstance(data, np.ndarray):
+        return data[indices]
+    return [data[index] for index in indices]
+
+
+def compare_to_baseline(
+    result: Dict[str, Any], baseline: Optional[Dict[str, Any]], tolerance: float
+) -> List[str]:
+    """
+    Compare a benchmark result to the result of the same benchmark in a previous run.
+
+    Returns the regressions: more forward passes or forward samples than before, or a throughput that
+    dropped by more than the tolerated fraction.
+    """
+    if baseline is None:
+        return []
+    regressions = []
+    for key in ["n_forward_passes", "n_forward_samples"]:
+        if result[key] > baseline[key]:
+            regressions.append(f"{key} increased from {baseline[key]} to {result[key]}.")
+    if result["instances_per_second"] < (1 - tolerance) * baseline["instances_per_second"]:
+        regressions.append(
+            f"instances_per_second dropped from {baseline['instances_per_second']:.2f} to "
+            f"{result['instances_per_second']:.2f} (tolerance={tolerance})."
+        )
+    return regressions
+
+
+def test_benchmark_covers_available_metrics():
+    metric_classes = [
+        metric_class.__name__
+        for metrics in AVAILABLE_METRICS.values()
+        for metric_class in metrics.values()
+    ]
+    assert sorted(metric_classes) == sorted(BENCHMARK_METRICS), "Test failed."
+
+
+@pytest.mark.benchmark
+def test_benchmark_metric(
+    benchmark_case: tuple,
+    benchmark_results: dict,
+    benchmark_baseline: Optional[dict],
+    pytestconfig,
+    request,
+):
+    category, metric_class, workload_name, batch_size = benchmark_case
+    workload = request.getfixturevalue(f"{workload_name}_workload")
+    _, get_init_params = BENCHMARK_METRICS[metric_class.__name__]
+    init_params = get_init_params(workload)
+
+    model = workload["model"]
+    x_batch = take(workload["x_batch"], batch_size)
+    y_batch = take(workload["y_batch"], batch_size)
+    call_params = {
+        "model": model,
+        "x_batch": x_batch,
+        "y_batch": y_batch,
+        "a_batch": explain(
+            model=model, inputs=x_batch, targets=y_batch, **workload["explain_func_kwargs"]
+        ),
+        "explain_func": explain,
+        "explain_func_kwargs": workload["explain_func_kwargs"],
+        "batch_size": batch_size,
+    }
+    for key in ["s_batch", "custom_batch"]:
+        if key in workload:
+            call_params[key] = take(workload[key], batch_size)
+
+    def evaluate():
+        np.random.seed(42)
+        metric = metric_class(disable_warnings=True, display_progressbar=False, **init_params)
+        start = time.perf_counter()
+        metric(**call_params)
+        return metric, time.perf_counter() - start
+
+    # The warm-up call measures the peak memory, under tracemalloc, which slows down the timed calls.
+    tracemalloc.start()
+    try:
+        evaluate()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    runtimes = []
+    for _ in range(pytestconfig.getoption("--benchmark-repeats")):
+        metric, runtime = evaluate()
+        runtimes.append(runtime)
+    runtime = statistics.median(runtimes)
+    forward_passes = metric.ledger.report()
+
+    key = f"{metric_class.__name__}/{workload_name}/{batch_size}"
+    result = {
+        "category": category,
+        "metric": metric_class.__name__,
+        "workload": workload_name,
+        "input_shape": list(x_batch.shape[1:]),
+        "batch_size": batch_size,
+        "init_params": init_params,
+        "runtime": runtime,
+        "runtimes": runtimes,
+        "instances_per_second": batch_size / runtime,
+        "n_forward_passes": forward_passes["n_forward_passes"],
+        "n_forward_samples": forward_passes["n_samples"],
+        "mean_forward_batch_size": forward_passes["mean_batch_size"],
+        "forward_time": forward_passes["forward_time"],
+        "peak_bytes": peak_bytes,
+    }
+    benchmark_results[key] = result
+
+    regressions = compare_to_baseline(
+        result=result,
+        baseline=None if benchmark_baseline is None else benchmark_baseline.get(key),
+        tolerance=pytestconfig.getoption("--benchmark-tolerance"),
+    )
+    assert not regressions, f"{key} regressed: " + " ".join(regressions)
@@ -23,6 +23,52 @@ BATCH_SIZE = 124
 MINI_BATCH_SIZE = 8
 
 
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmark", "metric benchmarks (see tests/benchmarks)")
+    group.addoption(
+        "--benchmark",
+        action="store_true",
+        default=False,
+        help="Run the metric benchmarks, which are skipped otherwise.",
+    )
+    group.addoption(
+        "--benchmark-json",
+        default=None,
+        help="Write the benchmark results to this JSON file (implies --benchmark).",
+    )
+    group.addoption(
+        "--benchmark-compare",
+        default=None,
+        help="Compare the benchmark results to a JSON file written by --benchmark-json.",
+    )
+    group.addoption(
+        "--benchmark-tolerance",
+        type=float,
+        default=0.25,
+        help="The relative loss of throughput tolerated by --benchmark-compare.",
+    )
+    group.addoption(
+        "--benchmark-batch-sizes",
+        default="8,32",
+        help="Comma-separated batch sizes the metrics are benchmarked at.",
+    )
+    group.addoption(
+        "--benchmark-repeats",
+        type=int,
+        default=3,
+        help="The number of timed calls per benchmark, of which the median is kept.",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--benchmark") or config.getoption("--benchmark-json"):
+        return
+    skip = pytest.mark.skip(reason="Benchmarks run with --benchmark or --benchmark-json.")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
 @pytest.fixture(scope="session", autouse=True)
 def load_mnist_model():
     """Load a pre-trained LeNet classification model (architecture at quantus/helpers/models)."""
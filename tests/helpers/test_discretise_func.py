@@ -0,0 +1,38 @@
+from typing import Callable
+
+import pytest
+from pytest_lazyfixture import lazy_fixture
+
+from quantus.functions.discretise_func import *
+
+
+@pytest.fixture
+def atts_discretise_random():
+    return np.random.RandomState(42).uniform(-1, 1, size=(16, 50))
+
+
+@pytest.fixture
+def atts_discretise_repeated():
+    a = np.random.RandomState(42).uniform(-1, 1, size=(4, 50))
+    return np.concatenate([a, a[::-1], a[:2]])
+
+
+@pytest.mark.discretise_func
+@pytest.mark.parametrize(
+    "data,func,batch_func,params",
+    [
+        (lazy_fixture("atts_discretise_random"), floating_points, batch_floating_points, {}),
+        (lazy_fixture("atts_discretise_random"), floating_points, batch_floating_points, {"n": 1}),
+        (lazy_fixture("atts_discretise_random"), sign, batch_sign, {}),
+        (lazy_fixture("atts_discretise_random"), top_n_sign, batch_top_n_sign, {"n": 3}),
+        (lazy_fixture("atts_discretise_random"), rank, batch_rank, {}),
+        (lazy_fixture("atts_discretise_repeated"), top_n_sign, batch_top_n_sign, {}),
+        (lazy_fixture("atts_discretise_repeated"), rank, batch_rank, {}),
+    ],
+)
+def test_batch_discretise_func(
+    data: np.ndarray, func: Callable, batch_func: Callable, params: dict
+):
+    out = batch_func(a=data, **params)
+    expected = np.array([func(a=a, **params) for a in data])
+    assert np.array_equal(out, expected), "Test failed."
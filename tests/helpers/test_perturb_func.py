@@ -489,3 +489,113 @@ def test_no_perturbation(
 ):
     out = no_perturbation(arr=data, **params)
     assert (out == data).all() == expected, "Test failed."
+
+
+@pytest.mark.perturb_func
+@pytest.mark.parametrize(
+    "data,params",
+    [
+        (
+            np.random.uniform(0, 1, size=(3, 16, 16)),
+            {"nr_indices": [0, 1, 5, 100, 256]},
+        ),
+        (
+            np.random.uniform(0, 1, size=(1, 28, 28)),
+            {"nr_indices": [700, 7, 70]},
+        ),
+    ],
+)
+def test_nested_noisy_linear_imputation(data: np.ndarray, params: dict):
+    indices = np.random.permutation(data[0].size)
+    out = nested_noisy_linear_imputation(
+        arr=data, indices=indices, noise=0.0, **params
+    )
+    assert out.shape == (len(params["nr_indices"]), *data.shape), "Test failed."
+    for out_level, k in zip(out, params["nr_indices"]):
+        expected = (
+            noisy_linear_imputation(arr=data, indices=indices[:k], noise=0.0)
+            if k > 0
+            else data
+        )
+        assert np.allclose(out_level, expected), "Test failed."
+
+
+@pytest.mark.perturb_func
+@pytest.mark.parametrize(
+    "data,params",
+    [
+        (np.random.uniform(0, 1, size=(4, 3, 16, 16)), {"nr_indices": 100}),
+        (np.random.uniform(0, 1, size=(2, 1, 28, 28)), {"nr_indices": 1}),
+    ],
+)
+def test_batch_noisy_linear_imputation(data: np.ndarray, params: dict):
+    indices = np.random.permutation(data[0, 0].size)[: params["nr_indices"]]
+    out = batch_noisy_linear_imputation(arr=data, indices=indices, noise=0.0)
+    assert out.shape == data.shape, "Test failed."
+    for out_instance, instance in zip(out, data):
+        expected = noisy_linear_imputation(arr=instance, indices=indices, noise=0.0)
+        assert np.allclose(out_instance, expected), "Test failed."
+
+
+@pytest.mark.perturb_func
+def test_noisy_linear_imputation_index_tuple():
+    data = np.random.uniform(0, 1, size=(3, 16, 16))
+    indices = np.random.permutation(data[0].size)[:50]
+    out = noisy_linear_imputation(
+        arr=data, indices=np.unravel_index(indices, data.shape[1:]), noise=0.0
+    )
+    expected = noisy_linear_imputation(arr=data, indices=indices, noise=0.0)
+    assert np.allclose(out, expected), "Test failed."
+
+
+@pytest.mark.perturb_func
+def test_noisy_linear_imputation_cache():
+    data = np.random.uniform(0, 1, size=(3, 16, 16))
+    indices = np.random.permutation(data[0].size)[:50]
+
+    clear_noisy_linear_imputation_cache()
+    out = noisy_linear_imputation(arr=data, indices=indices, noise=0.0)
+    out_cached = noisy_linear_imputation(arr=data, indices=indices, noise=0.0)
+    out_other = noisy_linear_imputation(arr=data + 1, indices=indices, noise=0.0)
+
+    assert np.allclose(out, out_cached), "Test failed."
+    assert np.allclose(out_other, out + 1), "Test failed."
+
+
+@pytest.mark.perturb_func
+@pytest.mark.parametrize(
+    "params,expected",
+    [
+        ({}, {"nr_factorisations": 1, "nr_cached": 1}),
+        ({"NOISY_LINEAR_IMPUTATION_CACHE_SIZE": 0}, {"nr_factorisations": 3, "nr_cached": 0}),
+        ({"NOISY_LINEAR_IMPUTATION_CACHE_BYTES": 0}, {"nr_factorisations": 3, "nr_cached": 0}),
+    ],
+)
+def test_noisy_linear_imputation_cache_hits(params: dict, expected: dict, monkeypatch):
+    import quantus.functions.perturb_func as perturb_func
+
+    nr_factorisations = []
+
+    def splu_counted(*args, **kwargs):
+        nr_factorisations.append(1)
+        return splu(*args, **kwargs)
+
+    monkeypatch.setattr(perturb_func, "splu", splu_counted)
+    for name, value in params.items():
+        monkeypatch.setattr(perturb_func, name, value)
+
+    data = np.random.uniform(0, 1, size=(3, 16, 16))
+    indices = np.random.permutation(data[0].size)[:50]
+
+    clear_noisy_linear_imputation_cache()
+    outs = [
+        noisy_linear_imputation(arr=data + i, indices=indices, noise=0.0)
+        for i in range(3)
+    ]
+
+    assert len(nr_factorisations) == expected["nr_factorisations"], "Test failed."
+    assert (
+        len(perturb_func._NOISY_LINEAR_IMPUTATION_CACHE) == expected["nr_cached"]
+    ), "Test failed."
+    assert np.allclose(outs[2], outs[0] + 2), "Test failed."
+    clear_noisy_linear_imputation_cache()
@@ -0,0 +1,79 @@
+import json
+
+import numpy as np
+import pytest
+
+from quantus.functions.explanation_func import explain
+from quantus.helpers.profiling import Profiler
+from quantus.metrics.complexity import Sparseness
+from quantus.metrics.faithfulness import FaithfulnessEstimate
+
+
+@pytest.mark.profiling
+def test_profiler():
+    profiler = Profiler()
+    for n_samples in [2, 2, 4]:
+        with profiler.phase("outer"):
+            with profiler.phase("inner", n_samples=n_samples, n_bytes=8 * n_samples):
+                pass
+    wrapped = profiler.wrap("func", lambda inputs: inputs.sum(), sample_arg="inputs")
+    wrapped(inputs=np.ones(3))
+    assert profiler.wrap("func", wrapped).func is wrapped.func, "Test failed."
+
+    report = profiler.report()
+    assert report["outer"]["n_calls"] == 3, "Test failed."
+    assert report["inner"]["n_samples"] == 8, "Test failed."
+    assert report["inner"]["n_bytes"] == 64, "Test failed."
+    assert report["inner"]["batch_sizes"] == {2: 2, 4: 1}, "Test failed."
+    assert report["func"]["n_bytes"] == 24, "Test failed."
+    assert report["outer"]["total_time"] >= report["inner"]["total_time"], "Test failed."
+
+
+@pytest.mark.profiling
+@pytest.mark.parametrize(
+    "metric,phases",
+    [
+        (
+            FaithfulnessEstimate(
+                features_in_step=196,
+                perturb_baseline="black",
+                profile=True,
+                disable_warnings=True,
+            ),
+            {
+                "evaluate_instance": 1,
+                "model.predict": 5,
+                "perturb_func": 4,
+                "similarity_func": 1,
+            },
+        ),
+        (Sparseness(profile=True, disable_warnings=True), {"evaluate_batch": None}),
+    ],
+    ids=["instance-wise", "batch-wise"],
+)
+def test_metric_profile(metric, phases, load_mnist_model, load_mnist_images, tmp_path):
+    x_batch, y_batch = load_mnist_images["x_batch"][:4], load_mnist_images["y_batch"][:4]
+    metric(
+        model=load_mnist_model,
+        x_batch=x_batch,
+        y_batch=y_batch,
+        a_batch=None,
+        explain_func=explain,
+        explain_func_kwargs={"method": "Saliency"},
+    )
+
+    report = metric.profiler.report()
+    for phase in ["warn", "general_preprocess", "explain_func", "custom_postprocess"]:
+        assert report[phase]["n_calls"] == 1, "Test failed."
+    assert report["explain_func"]["n_samples"] == len(x_batch), "Test failed."
+    for phase, n_calls_per_instance in phases.items():
+        if n_calls_per_instance is not None:
+            assert (
+                report[phase]["n_calls"] == n_calls_per_instance * len(x_batch)
+            ), "Test failed."
+        assert report[phase]["total_time"] > 0, "Test failed."
+
+    trace = metric.profiler.to_chrome_trace(path=str(tmp_path / "trace.json"))
+    with open(tmp_path / "trace.json") as f:
+        assert json.load(f) == json.loads(json.dumps(trace)), "Test failed."
+    assert len(trace["traceEvents"]) == len(metric.profiler.events), "Test failed."
@@ -1,4 +1,6 @@
+import copy
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Union
 
 import numpy as np
@@ -7,6 +9,11 @@ import torch
 from pytest_lazyfixture import lazy_fixture
 from scipy.special import softmax
 
+from quantus.helpers.model.forward_pass_ledger import (
+    ForwardPassBudgetExceeded,
+    ForwardPassLedger,
+)
+from quantus.helpers.model.prediction_broker import PredictionBroker
 from quantus.helpers.model.pytorch_model import PyTorchModel
 
 
@@ -210,6 +217,52 @@ def test_get_random_layer_generator(load_mnist_model):
         assert layer != new_layer, "Test failed."
 
 
+@pytest.mark.pytorch_model
+def test_get_random_layer_count(load_mnist_model):
+    model = PyTorchModel(load_mnist_model, channel_first=True)
+    assert model.get_random_layer_count() == len(
+        list(model.get_random_layer_generator())
+    ), "Test failed."
+
+
+@pytest.mark.pytorch_model
+def test_get_random_layer_generator_independent(load_mnist_model):
+    model = PyTorchModel(load_mnist_model, channel_first=True)
+    original = model.state_dict()
+
+    for layer_name, random_layer_model in model.get_random_layer_generator(
+        order="independent"
+    ):
+        for name, value in random_layer_model.state_dict().items():
+            unchanged = torch.equal(value, original[name])
+            if name.startswith(layer_name + "."):
+                assert not unchanged, "Test failed."
+            else:
+                assert unchanged, "Test failed."
+
+
+@pytest.mark.pytorch_model
+@pytest.mark.parametrize("order", ["top_down", "bottom_up", "independent"])
+def test_get_random_layer_generator_start(load_mnist_model, order: str):
+    model = PyTorchModel(load_mnist_model, channel_first=True)
+
+    def state_dicts(**kwargs):
+        return [
+            (layer_name, copy.deepcopy(random_layer_model.state_dict()))
+            for layer_name, random_layer_model in model.get_random_layer_generator(
+                order=order, **kwargs
+            )
+        ]
+
+    expected = state_dicts()[2:]
+    out = state_dicts(start=2)
+
+    assert [name for name, _ in out] == [name for name, _ in expected], "Test failed."
+    for (_, state_dict), (_, expected_state_dict) in zip(out, expected):
+        for name, value in state_dict.items():
+            assert torch.equal(value, expected_state_dict[name]), "Test failed."
+
+
 @pytest.mark.pytorch_model
 @pytest.mark.parametrize(
     "params",
@@ -242,3 +295,48 @@ def test_add_mean_shift_to_first_layer(load_mnist_model):
     a1 = model.model(X)
     a2 = new_model(X_shift)
     assert torch.all(torch.isclose(a1, a2, atol=1e-04))
+
+
+@pytest.mark.pytorch_model
+@pytest.mark.parametrize("max_batch_size", [1, 4, 64])
+def test_prediction_broker(load_mnist_model, max_batch_size):
+    model = PyTorchModel(load_mnist_model, channel_first=True)
+    X = np.random.random((16, 1, 28, 28)).astype(np.float32)
+    expected = model.predict(X)
+
+    n_forward_passes = []
+    predict = model.predict
+
+    def counting_predict(x, **kwargs):
+        n_forward_passes.append(len(x))
+        return predict(x, **kwargs)
+
+    model.predict = counting_predict
+    broker = PredictionBroker(model, max_batch_size=max_batch_size, max_latency=0.1)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        result = list(executor.map(lambda x: broker.predict(x[None]), X))
+
+    assert np.allclose(np.concatenate(result), expected, atol=1e-5), "Test failed."
+    assert sum(n_forward_passes) == len(X), "Test failed."
+    assert max(n_forward_passes) <= min(max_batch_size, 8), "Test failed."
+    if max_batch_size > 1:
+        assert len(n_forward_passes) < len(X), "Test failed."
+
+
+@pytest.mark.pytorch_model
+def test_forward_pass_ledger(load_mnist_model):
+    model = PyTorchModel(load_mnist_model, channel_first=True)
+    model.ledger = ForwardPassLedger(max_samples=10)
+    X = np.random.random((4, 1, 28, 28)).astype(np.float32)
+
+    model.predict(X)
+    model.get_hidden_representations(X[:2])
+    model.predict(X)
+    with pytest.raises(ForwardPassBudgetExceeded):
+        model.predict(X[:1])
+
+    report = model.ledger.report()
+    assert report["n_forward_passes"] == 3, "Test failed."
+    assert report["n_samples"] == 10, "Test failed."
+    assert report["batch_sizes"] == {2: 1, 4: 2}, "Test failed."
+    assert report["forward_time"] <= report["elapsed"], "Test failed."
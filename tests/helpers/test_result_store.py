@@ -0,0 +1,76 @@
+import os
+from typing import Any
+
+import numpy as np
+import pytest
+
+from quantus.helpers.result_store import ResultStore
+from quantus.metrics.complexity import Sparseness
+
+
+@pytest.mark.result_store
+@pytest.mark.parametrize(
+    "scores,columns",
+    [
+        ([0.1, 0.5, 0.9], ["score"]),
+        ([[0.1, 0.2], [0.3, 0.4], [0.5, 0.6]], ["score"]),
+        ([[0.1, 0.2], [0.3], [0.5, 0.6, 0.7]], ["score"]),
+        ([{"pred_deltas": [0.1, 0.2], "att_sums": [1.0, 2.0]}] * 2, ["pred_deltas", "att_sums"]),
+        ({"conv_1": [0.1, 0.2], "fc_1": [0.3, 0.4]}, ["conv_1", "fc_1"]),
+        ({1: 0.5, 2: 0.25}, [1, 2]),
+    ],
+    ids=["floats", "curves", "ragged curves", "records", "per layer", "per percentage"],
+)
+def test_result_store_round_trip(scores: Any, columns: list, tmp_path):
+    store = ResultStore(max_calls=0, spill_dir=str(tmp_path))
+    record = store.to_record(scores)
+    assert record["keys"] == columns, "Test failed."
+    assert all(isinstance(column, np.ndarray) for column in record["columns"]), "Test failed."
+    assert store.from_record(record) == scores, "Test failed."
+
+    store.append(scores)
+    assert len(store) == 0 and len(store.spilled_paths) == 1, "Test failed."
+    assert ResultStore.load(store.spilled_paths[0]) == scores, "Test failed."
+
+
+@pytest.mark.result_store
+def test_result_store_retention(load_mnist_model, load_mnist_images):
+    x_batch, y_batch = load_mnist_images["x_batch"], load_mnist_images["y_batch"]
+    a_batch = np.random.RandomState(42).uniform(size=x_batch.shape)
+    metric = Sparseness(max_stored_calls=2, disable_warnings=True)
+
+    scores = [
+        metric(
+            model=load_mnist_model,
+            x_batch=x_batch[:n],
+            y_batch=y_batch[:n],
+            a_batch=a_batch[:n],
+        )
+        for n in [2, 3, 4]
+    ]
+
+    assert metric.all_evaluation_scores.n_calls == 3, "Test failed."
+    assert len(metric.all_evaluation_scores) == 2, "Test failed."
+    assert np.allclose(metric.all_evaluation_scores[-1], scores[-1]), "Test failed."
+
+    call_ids, instance_ids, values = metric.all_evaluation_scores.column("score")
+    assert np.array_equal(call_ids, [1, 1, 1, 2, 2, 2, 2]), "Test failed."
+    assert np.array_equal(instance_ids, [0, 1, 2, 0, 1, 2, 3]), "Test failed."
+    assert values.dtype == np.float64, "Test failed."
+
+
+@pytest.mark.result_store
+def test_result_store_shared_spill_dir(tmp_path):
+    stores = [
+        ResultStore(max_calls=0, spill_dir=str(tmp_path), name="Sparseness")
+        for _ in range(2)
+    ]
+    for id_store, store in enumerate(stores):
+        store.append([float(id_store)])
+
+    paths = [store.spilled_paths[0] for store in stores]
+    assert paths[0] != paths[1], "Test failed."
+    assert all(
+        os.path.basename(path).startswith("Sparseness_") for path in paths
+    ), "Test failed."
+    assert [ResultStore.load(path) for path in paths] == [[0.0], [1.0]], "Test failed."
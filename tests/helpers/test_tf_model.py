@@ -159,6 +159,38 @@ def test_get_random_layer_generator(load_mnist_model_tf):
     ), "Test failed."
 
 
+@pytest.mark.tf_model
+def test_get_random_layer_count(load_mnist_model_tf):
+    model = TensorFlowModel(model=load_mnist_model_tf, channel_first=False)
+    assert model.get_random_layer_count() == len(
+        list(model.get_random_layer_generator())
+    ), "Test failed."
+
+
+@pytest.mark.tf_model
+def test_get_random_layer_generator_independent(load_mnist_model_tf):
+    tf_model = load_mnist_model_tf
+    model = TensorFlowModel(model=tf_model, channel_first=False)
+    old_weights = {s.name: s.get_weights() for s in list(tf_model.layers)}
+
+    for layer_name, random_layer_model in model.get_random_layer_generator(
+        order="independent"
+    ):
+        for layer in random_layer_model.layers:
+            unchanged = reduce(
+                and_,
+                [
+                    np.allclose(x, y)
+                    for x, y in zip(old_weights[layer.name], layer.get_weights())
+                ],
+                True,
+            )
+            if layer.name == layer_name:
+                assert not unchanged, "Test failed."
+            else:
+                assert unchanged, "Test failed."
+
+
 @pytest.mark.tf_model
 @pytest.mark.parametrize(
     "params",
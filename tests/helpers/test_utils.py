@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from pytest_lazyfixture import lazy_fixture
 
@@ -144,6 +146,89 @@ def test_get_superpixel_segments(
     assert isinstance(out, expected["type"]), "Test failed."
 
 
+@pytest.mark.utils
+@pytest.mark.parametrize(
+    "data,params",
+    [
+        (lazy_fixture("segmentation_setup"), {"segmentation_method": "slic"}),
+        (lazy_fixture("segmentation_setup"), {"segmentation_method": "felzenszwalb"}),
+    ],
+)
+def test_get_cached_superpixel_segments(data: np.ndarray, params: dict):
+    clear_superpixel_cache()
+    out = get_cached_superpixel_segments(img=data, **params)
+    assert np.array_equal(out, get_superpixel_segments(img=data, **params))
+    assert get_cached_superpixel_segments(img=data.copy(), **params) is out
+    assert get_cached_superpixel_segments(img=data + 1, **params) is not out
+    clear_superpixel_cache()
+    assert get_cached_superpixel_segments(img=data, **params) is not out
+
+
+@pytest.mark.utils
+def test_get_cached_superpixel_segments_threads(segmentation_setup, monkeypatch):
+    import quantus.helpers.utils as utils_module
+
+    # With room for one segmentation, the threads evict each other's entries all the time.
+    monkeypatch.setattr(utils_module, "SEGMENTATION_CACHE_SIZE", 1)
+    imgs = [segmentation_setup[:32, :32] + k for k in range(3)]
+    expected = [get_superpixel_segments(img=img, segmentation_method="slic") for img in imgs]
+
+    clear_superpixel_cache()
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        outs = list(
+            executor.map(
+                lambda k: get_cached_superpixel_segments(
+                    img=imgs[k % 3], segmentation_method="slic"
+                ),
+                range(24),
+            )
+        )
+    clear_superpixel_cache()
+
+    for k, out in enumerate(outs):
+        assert np.array_equal(out, expected[k % 3]), "Test failed."
+
+
+@pytest.mark.utils
+@pytest.mark.parametrize(
+    "params,expected",
+    [
+        (
+            {
+                "a": np.array([[[1.0, 2.0], [3.0, 4.0]]]),
+                "segments": np.array([[0, 0], [1, 2]]),
+                "nr_segments": 3,
+            },
+            {"value": np.array([1.5, 3.0, 4.0])},
+        ),
+        (
+            {
+                "a": np.array([[[1.0, 2.0], [3.0, 4.0]], [[3.0, 2.0], [1.0, 0.0]]]),
+                "segments": np.array([[1, 1], [0, 1]]),
+                "nr_segments": 2,
+            },
+            {"value": np.array([2.0, 2.0])},
+        ),
+        (
+            {
+                "a": np.random.uniform(0, 1, size=(3, 16, 16)),
+                "segments": np.random.randint(0, 5, size=(16, 16)),
+                "nr_segments": 5,
+            },
+            {"value": "loop"},
+        ),
+    ],
+)
+def test_calculate_segment_means(params: dict, expected: Any):
+    out = calculate_segment_means(**params)
+    if isinstance(expected["value"], str):
+        a, segments = params["a"], params["segments"]
+        expected["value"] = np.array(
+            [np.mean(a[:, segments == s]) for s in range(params["nr_segments"])]
+        )
+    assert np.allclose(out, expected["value"]), f"Test failed. {out}"
+
+
 @pytest.mark.utils
 @pytest.mark.parametrize(
     "data,shape,expected",
@@ -757,6 +842,89 @@ def test_get_nr_patches(params: dict, expected: Any):
     assert out == expected["value"]
 
 
+@pytest.mark.utils
+@pytest.mark.parametrize(
+    "params,expected",
+    [
+        (
+            {
+                "a": np.ones((1, 4, 4)),
+                "patch_size": 2,
+                "indexed_axes": [1, 2],
+            },
+            {
+                "value": np.array(
+                    [[4, 4, 4, 2], [4, 4, 4, 2], [4, 4, 4, 2], [2, 2, 2, 1]]
+                )
+            },
+        ),
+        (
+            {
+                "a": np.ones((3, 4, 4)),
+                "patch_size": (2, 1),
+                "indexed_axes": [1, 2],
+            },
+            {"value": np.array([[6, 6, 6, 6]] * 3 + [[3, 3, 3, 3]])},
+        ),
+        (
+            {
+                "a": np.arange(6).reshape(1, 6),
+                "patch_size": 3,
+                "indexed_axes": [1],
+            },
+            {"value": np.array([3, 6, 9, 12, 9, 5])},
+        ),
+    ],
+)
+def test_calculate_patch_sums(params: dict, expected: Any):
+    out = calculate_patch_sums(**params)
+    assert np.allclose(out, expected["value"]), f"Test failed. {out}"
+
+
+@pytest.mark.utils
+@pytest.mark.parametrize(
+    "params,expected",
+    [
+        (
+            {
+                "order": np.arange(16),
+                "patch_size": 2,
+                "shape": (4, 4),
+            },
+            {"value": [(0, 0), (0, 2), (2, 0), (2, 2)]},
+        ),
+        (
+            {
+                "order": np.arange(16)[::-1],
+                "patch_size": 2,
+                "shape": (4, 4),
+            },
+            {"value": [(3, 3), (3, 1), (1, 3), (1, 1)]},
+        ),
+        (
+            {
+                "order": np.array([5, 0, 10, 15]),
+                "patch_size": 2,
+                "shape": (4, 4),
+                "max_patches": 2,
+            },
+            {"value": [(1, 1), (3, 3)]},
+        ),
+        (
+            {
+                "order": np.array([0, 1, 2, 3, 4]),
+                "patch_size": 2,
+                "shape": (5,),
+            },
+            {"value": [(0,), (2,), (4,)]},
+        ),
+    ],
+)
+def test_get_non_overlapping_patches(params: dict, expected: Any):
+    out = get_non_overlapping_patches(**params)
+    assert out == expected["value"], f"Test failed. {out}"
+
+
 # TODO: Change test cases (and function) for batching update, since currently single images are expected
 @pytest.mark.utils
 @pytest.mark.parametrize(
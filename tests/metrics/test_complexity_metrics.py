@@ -580,3 +580,45 @@ def test_effective_complexity(
         **call_params
     )
     assert scores is not None, "Test failed."
+
+
+@pytest.mark.complexity
+@pytest.mark.parametrize(
+    "metric,dtype,memmap",
+    [
+        (Sparseness, np.float64, False),
+        (Sparseness, np.float32, True),
+        (Complexity, np.float64, False),
+        (Complexity, np.float32, True),
+        (EffectiveComplexity, np.float64, False),
+        (EffectiveComplexity, np.float32, True),
+    ],
+)
+def test_complexity_evaluate_batch(metric, dtype, memmap: bool, tmp_path):
+    rng = np.random.RandomState(42)
+    x_batch = rng.randn(10, 1, 8, 8)
+    a_batch = rng.uniform(-1, 1, size=(10, 1, 8, 8)).astype(dtype)
+
+    metric_instance = metric(disable_warnings=True)
+    a_batch_normalised = metric_instance.normalise_attributions(a_batch=a_batch)
+    expected = [
+        metric_instance.evaluate_instance(model=None, x=x, y=None, a=a, s=None)
+        for x, a in zip(x_batch, a_batch_normalised)
+    ]
+
+    if memmap:
+        a_batch_memmap = np.memmap(
+            tmp_path / "a_batch.npy", dtype=dtype, mode="w+", shape=a_batch.shape
+        )
+        a_batch_memmap[:] = a_batch
+        a_batch = a_batch_memmap
+
+    scores = metric_instance(
+        model=None,
+        x_batch=x_batch,
+        y_batch=np.zeros(len(x_batch), dtype=int),
+        a_batch=a_batch,
+        batch_size=3,
+    )
+
+    assert np.allclose(scores, expected), "Test failed."
@@ -13,6 +13,7 @@ from quantus.functions.similarity_func import (
     correlation_spearman,
     correlation_kendall_tau,
 )
+from quantus.helpers.model.forward_pass_ledger import ForwardPassBudgetExceeded
 from quantus.helpers.model.model_interface import ModelInterface
 from quantus.metrics.faithfulness import (
     FaithfulnessCorrelation,
@@ -203,6 +204,48 @@ from quantus.metrics.faithfulness import (
             },
             {"min": -1.0, "max": 1.0},
         ),
+        (
+            lazy_fixture("load_1d_3ch_conv_model"),
+            lazy_fixture("almost_uniform_1d"),
+            {
+                "a_batch_generate": False,
+                "init": {
+                    "perturb_func": baseline_replacement_by_indices,
+                    "perturb_baseline": "mean",
+                    "nr_runs": 10,
+                    "similarity_func": correlation_spearman,
+                    "normalise": True,
+                    "subset_size": 10,
+                    "perturbation_batch_size": 64,
+                    "disable_warnings": True,
+                    "display_progressbar": False,
+                },
+                "call": {},
+            },
+            {"min": -1.0, "max": 1.0},
+        ),
+        (
+            lazy_fixture("load_mnist_model"),
+            lazy_fixture("load_mnist_images"),
+            {
+                "init": {
+                    "perturb_func": baseline_replacement_by_indices,
+                    "perturb_baseline": "mean",
+                    "nr_runs": 10,
+                    "similarity_func": correlation_spearman,
+                    "normalise": True,
+                    "subset_size": 100,
+                    "perturbation_batch_size": 7,
+                    "disable_warnings": True,
+                    "display_progressbar": False,
+                },
+                "call": {
+                    "explain_func": explain,
+                    "batch_size": 3,
+                },
+            },
+            {"min": -1.0, "max": 1.0},
+        ),
         (
             lazy_fixture("load_1d_3ch_conv_model"),
             lazy_fixture("almost_uniform_1d"),
@@ -532,6 +575,27 @@ def test_faithfulness_estimate(
             },
             {"min": 0.0, "max": 80.0},
         ),
+        (
+            lazy_fixture("load_mnist_model"),
+            lazy_fixture("load_mnist_images"),
+            {
+                "init": {
+                    "perturb_baseline": "mean",
+                    "segmentation_method": "felzenszwalb",
+                    "cache_segmentation": False,
+                    "normalise": True,
+                    "disable_warnings": True,
+                    "display_progressbar": False,
+                },
+                "call": {
+                    "explain_func": explain,
+                    "explain_func_kwargs": {
+                        "method": "Saliency",
+                    },
+                },
+            },
+            {"min": 0.0, "max": 80.0},
+        ),
         (
             lazy_fixture("load_1d_3ch_conv_model"),
             lazy_fixture("almost_uniform_1d"),
@@ -1025,6 +1089,45 @@ def test_monotonicity_correlation(
             },
             {"min": 0.0, "max": 10.0},
         ),
+        (
+            lazy_fixture("load_mnist_model"),
+            lazy_fixture("load_mnist_images"),
+            {
+                "a_batch_generate": True,
+                "init": {
+                    "perturb_baseline": "mean",
+                    "features_in_step": 28,
+                    "perturbation_batch_size": 10,
+                    "normalise": True,
+                    "abs": True,
+                    "disable_warnings": True,
+                },
+                "call": {
+                    "explain_func": explain,
+                    "explain_func_kwargs": {
+                        "method": "Saliency",
+                    },
+                    "batch_size": 3,
+                },
+            },
+            {"min": 0.0, "max": 1.0},
+        ),
+        (
+            lazy_fixture("load_1d_3ch_conv_model"),
+            lazy_fixture("almost_uniform_1d"),
+            {
+                "a_batch_generate": False,
+                "init": {
+                    "features_in_step": 10,
+                    "perturbation_batch_size": 64,
+                    "normalise": False,
+                    "perturb_baseline": "mean",
+                    "disable_warnings": True,
+                },
+                "call": {},
+            },
+            {"min": 0.0, "max": 1.0},
+        ),
     ],
 )
 def test_pixel_flipping(
@@ -1074,6 +1177,63 @@ def test_pixel_flipping(
     ), "Test failed."
 
 
+@pytest.mark.faithfulness
+@pytest.mark.parametrize(
+    "model,data,params",
+    [
+        (
+            lazy_fixture("load_mnist_model"),
+            lazy_fixture("load_mnist_images"),
+            {
+                "init": {
+                    "perturb_baseline": "mean",
+                    "features_in_step": 28,
+                    "normalise": True,
+                    "abs": True,
+                    "disable_warnings": True,
+                },
+                "perturbation_batch_size": 7,
+            },
+        ),
+        (
+            lazy_fixture("load_1d_3ch_conv_model"),
+            lazy_fixture("almost_uniform_1d"),
+            {
+                "init": {
+                    "features_in_step": 10,
+                    "normalise": False,
+                    "perturb_baseline": "black",
+                    "return_auc_per_sample": True,
+                    "disable_warnings": True,
+                },
+                "perturbation_batch_size": 1000,
+            },
+        ),
+    ],
+)
+def test_pixel_flipping_batched_predictions(
+    model,
+    data: np.ndarray,
+    params: dict,
+):
+    x_batch, y_batch = data["x_batch"], data["y_batch"]
+    a_batch = data.get("a_batch")
+    if a_batch is None:
+        a_batch = explain(
+            model=model, inputs=x_batch, targets=y_batch, method="Saliency"
+        )
+
+    init_params = params["init"]
+    scores = PixelFlipping(**init_params)(
+        model=model, x_batch=x_batch, y_batch=y_batch, a_batch=a_batch
+    )
+    scores_batched = PixelFlipping(
+        **init_params, perturbation_batch_size=params["perturbation_batch_size"]
+    )(model=model, x_batch=x_batch, y_batch=y_batch, a_batch=a_batch, batch_size=3)
+
+    assert np.allclose(scores, scores_batched, atol=1e-5), "Test failed."
+
+
 @pytest.mark.faithfulness
 @pytest.mark.parametrize(
     "model,data,params,expected",
@@ -1779,6 +1939,28 @@ def test_infidelity(
             },
             {"min": 0.0, "max": 1.0},
         ),
+        (
+            lazy_fixture("load_mnist_model"),
+            lazy_fixture("load_mnist_images"),
+            {
+                "init": {
+                    "normalise": True,
+                    "abs": True,
+                    "disable_warnings": True,
+                    "display_progressbar": False,
+                    "percentages": list(range(1, 100, 10)),
+                    "perturbation_batch_size": 16,
+                },
+                "call": {
+                    "explain_func": explain,
+                    "explain_func_kwargs": {
+                        "method": "Saliency",
+                    },
+                    "batch_size": 5,
+                },
+            },
+            {"min": 0.0, "max": 1.0},
+        ),
     ],
 )
 def test_ROAD(
@@ -1821,6 +2003,62 @@ def test_ROAD(
     ), "Test failed."
 
 
+@pytest.mark.faithfulness
+@pytest.mark.parametrize(
+    "model,data,params",
+    [
+        (
+            lazy_fixture("load_mnist_model"),
+            lazy_fixture("load_mnist_images"),
+            {
+                "init": {
+                    "noise": 0.0,
+                    "normalise": True,
+                    "abs": True,
+                    "disable_warnings": True,
+                    "percentages": [50, 1, 20, 90],
+                },
+                "perturbation_batch_size": 9,
+            },
+        ),
+        (
+            lazy_fixture("load_mnist_model"),
+            lazy_fixture("load_mnist_images"),
+            {
+                "init": {
+                    "perturb_func": baseline_replacement_by_indices,
+                    "perturb_func_kwargs": {
+                        "perturb_baseline": "black",
+                        "indexed_axes": [0, 1, 2],
+                    },
+                    "normalise": True,
+                    "disable_warnings": True,
+                    "percentages": list(range(1, 100, 25)),
+                },
+                "perturbation_batch_size": 100,
+            },
+        ),
+    ],
+)
+def test_ROAD_batched_predictions(
+    model,
+    data: np.ndarray,
+    params: dict,
+):
+    x_batch, y_batch = data["x_batch"], data["y_batch"]
+    a_batch = explain(model=model, inputs=x_batch, targets=y_batch, method="Saliency")
+
+    init_params = params["init"]
+    scores = ROAD(**init_params)(
+        model=model, x_batch=x_batch, y_batch=y_batch, a_batch=a_batch
+    )
+    scores_batched = ROAD(
+        **init_params, perturbation_batch_size=params["perturbation_batch_size"]
+    )(model=model, x_batch=x_batch, y_batch=y_batch, a_batch=a_batch, batch_size=3)
+
+    assert scores == scores_batched, "Test failed."
+
+
 @pytest.mark.faithfulness
 @pytest.mark.parametrize(
     "model,data,params,expected",
@@ -1915,3 +2153,212 @@ def test_sufficiency(
         **call_params,
     )[0]
     assert (scores >= expected["min"]) & (scores <= expected["max"]), "Test failed."
+
+
+@pytest.mark.faithfulness
+@pytest.mark.parametrize(
+    "model,data,params",
+    [
+        (
+            lazy_fixture("load_mnist_model"),
+            lazy_fixture("load_mnist_images"),
+            {"threshold": 0.6, "distance_func": "seuclidean", "neighbourhood_batch_size": 7},
+        ),
+        (
+            lazy_fixture("load_mnist_model"),
+            lazy_fixture("load_mnist_images"),
+            {"threshold": 0.2, "distance_func": "euclidean", "neighbourhood_batch_size": 1},
+        ),
+    ],
+)
+def test_sufficiency_neighbourhood_batch_size(
+    model: ModelInterface,
+    data: np.ndarray,
+    params: dict,
+):
+    x_batch, y_batch = data["x_batch"], data["y_batch"]
+    a_batch = explain(model=model, inputs=x_batch, targets=y_batch, method="Saliency")
+
+    scores = {}
+    for neighbourhood_batch_size in [None, params["neighbourhood_batch_size"]]:
+        scores[neighbourhood_batch_size] = Sufficiency(
+            threshold=params["threshold"],
+            distance_func=params["distance_func"],
+            neighbourhood_batch_size=neighbourhood_batch_size,
+            disable_warnings=True,
+        )(
+            model=model,
+            x_batch=x_batch,
+            y_batch=y_batch,
+            a_batch=a_batch,
+        )
+
+    assert np.allclose(
+        scores[None], scores[params["neighbourhood_batch_size"]]
+    ), "Test failed."
+
+
+@pytest.mark.faithfulness
+@pytest.mark.parametrize(
+    "model,data",
+    [(lazy_fixture("load_mnist_model"), lazy_fixture("load_mnist_images"))],
+)
+def test_instance_kwargs_none_batch(model: ModelInterface, data: dict):
+    x_batch, y_batch = data["x_batch"][:4], data["y_batch"][:4]
+    a_batch = explain(model=model, inputs=x_batch, targets=y_batch, method="Saliency")
+    metric = FaithfulnessEstimate(
+        features_in_step=196, perturb_baseline="black", disable_warnings=True
+    )
+
+    # Values of '_batch' keys that are not sequences are passed to each instance without the suffix.
+    single_value_kwargs, batched_value_kwargs = metric.get_instance_kwargs(
+        data={"x_batch": x_batch, "s_batch": None, "custom_batch": None}
+    )
+    assert single_value_kwargs == {"s": None, "custom": None}, "Test failed."
+    assert list(batched_value_kwargs) == ["x"], "Test failed."
+
+    scores = metric(
+        model=model, x_batch=x_batch, y_batch=y_batch, a_batch=a_batch, s_batch=None
+    )
+    assert len(scores) == len(x_batch), "Test failed."
+
+
+@pytest.mark.faithfulness
+@pytest.mark.parametrize(
+    "model,data,executor",
+    [
+        (lazy_fixture("load_mnist_model"), lazy_fixture("load_mnist_images"), "thread"),
+        (lazy_fixture("load_mnist_model"), lazy_fixture("load_mnist_images"), "process"),
+    ],
+)
+def test_executor(model: ModelInterface, data: dict, executor: str):
+    x_batch, y_batch = data["x_batch"][:8], data["y_batch"][:8]
+    a_batch = explain(model=model, inputs=x_batch, targets=y_batch, method="Saliency")
+
+    scores = {}
+    for executor_ in ["serial", executor]:
+        scores[executor_] = FaithfulnessEstimate(
+            features_in_step=28,
+            perturb_baseline="black",
+            executor=executor_,
+            n_workers=2,
+            disable_warnings=True,
+        )(
+            model=model,
+            x_batch=x_batch,
+            y_batch=y_batch,
+            a_batch=a_batch,
+        )
+
+    assert np.allclose(scores["serial"], scores[executor]), "Test failed."
+
+
+@pytest.mark.faithfulness
+@pytest.mark.parametrize(
+    "model,data,on_budget_exceeded",
+    [
+        (lazy_fixture("load_mnist_model"), lazy_fixture("load_mnist_images"), "nan"),
+        (lazy_fixture("load_mnist_model"), lazy_fixture("load_mnist_images"), "raise"),
+    ],
+)
+def test_forward_pass_budget(model: ModelInterface, data: dict, on_budget_exceeded: str):
+    x_batch, y_batch = data["x_batch"][:4], data["y_batch"][:4]
+    a_batch = explain(model=model, inputs=x_batch, targets=y_batch, method="Saliency")
+    params = {"features_in_step": 196, "perturb_baseline": "black", "disable_warnings": True}
+
+    # Each instance takes 5 forward passes of 1 sample.
+    metric = FaithfulnessEstimate(**params)
+    expected = metric(model=model, x_batch=x_batch, y_batch=y_batch, a_batch=a_batch)
+    assert metric.ledger.report()["n_samples"] == 20, "Test failed."
+
+    metric = FaithfulnessEstimate(
+        max_forward_samples=12, on_budget_exceeded=on_budget_exceeded, **params
+    )
+    if on_budget_exceeded == "raise":
+        with pytest.raises(ForwardPassBudgetExceeded):
+            metric(model=model, x_batch=x_batch, y_batch=y_batch, a_batch=a_batch)
+        return
+
+    scores = metric(model=model, x_batch=x_batch, y_batch=y_batch, a_batch=a_batch)
+    assert np.allclose(scores[:2], expected[:2]), "Test failed."
+    assert np.isnan(scores[2:]).all(), "Test failed."
+    assert metric.ledger.report()["n_samples"] == 12, "Test failed."
+
+
+@pytest.mark.faithfulness
+@pytest.mark.parametrize(
+    "model,data",
+    [(lazy_fixture("load_mnist_model"), lazy_fixture("load_mnist_images"))],
+)
+def test_estimate_cost(model: ModelInterface, data: dict):
+    x_batch, y_batch = data["x_batch"][:4], data["y_batch"][:4]
+    metric = FaithfulnessEstimate(
+        features_in_step=196, perturb_baseline="black", disable_warnings=True
+    )
+    np.random.seed(42)
+    random_state = np.random.get_state()[1].copy()
+
+    # Each instance takes 5 forward passes of 1 sample, the attributions are explained once per call.
+    cost = metric.estimate_cost(
+        model=model,
+        x_batch=x_batch,
+        y_batch=y_batch,
+        n_instances=100,
+        explain_func=explain,
+        explain_func_kwargs={"method": "Saliency"},
+    )
+
+    assert cost["probe"]["forward_passes"]["n_samples"] == 10, "Test failed."
+    assert cost["n_forward_passes"] == 500, "Test failed."
+    assert cost["n_forward_samples"] == 500, "Test failed."
+    assert cost["n_explain_calls"] == 1, "Test failed."
+    assert cost["n_explain_samples"] == 100, "Test failed."
+    assert cost["peak_bytes"] >= x_batch[:1].nbytes * 100, "Test failed."
+    assert cost["runtime"] > cost["probe"]["runtime"], "Test failed."
+
+    # The dry run leaves no trace on the metric and the random state.
+    assert len(metric.all_evaluation_scores) == 0, "Test failed."
+    assert metric.evaluation_scores == [], "Test failed."
+    assert np.array_equal(np.random.get_state()[1], random_state), "Test failed."
+
+
+@pytest.mark.faithfulness
+@pytest.mark.parametrize(
+    "model,data,perturbation_batch_size,expected",
+    [
+        (lazy_fixture("load_mnist_model"), lazy_fixture("load_mnist_images"), None, 32),
+        (lazy_fixture("load_mnist_model"), lazy_fixture("load_mnist_images"), 32, 1),
+    ],
+    ids=["per instance", "chunked"],
+)
+def test_estimate_cost_pixel_flipping(
+    model: ModelInterface, data: dict, perturbation_batch_size, expected: int
+):
+    x_batch, y_batch = data["x_batch"], data["y_batch"]
+    a_batch = explain(model=model, inputs=x_batch, targets=y_batch, method="Saliency")
+    metric = PixelFlipping(
+        features_in_step=196,
+        perturb_baseline="black",
+        disable_warnings=True,
+        perturbation_batch_size=perturbation_batch_size,
+    )
+
+    # Each instance takes 4 perturbation steps, predicted one by one or in one chunk per batch.
+    cost = metric.estimate_cost(
+        model=model,
+        x_batch=x_batch,
+        y_batch=y_batch,
+        a_batch=a_batch,
+        batch_size=len(x_batch),
+    )
+    metric(
+        model=model,
+        x_batch=x_batch,
+        y_batch=y_batch,
+        a_batch=a_batch,
+        batch_size=len(x_batch),
+    )
+
+    assert metric.ledger.report()["n_forward_passes"] == expected, "Test failed."
+    assert cost["n_forward_passes"] == expected, "Test failed."
+    assert cost["n_forward_samples"] == metric.ledger.report()["n_samples"], "Test failed."
@@ -298,6 +298,61 @@ def test_model_parameter_randomisation(
         ), "Test failed."
 
 
+@pytest.mark.randomisation
+@pytest.mark.parametrize(
+    "model,data,params",
+    [
+        (
+            lazy_fixture("load_mnist_model"),
+            lazy_fixture("load_mnist_images"),
+            {"layer_order": "independent", "explain_func_kwargs": {"method": "Saliency"}},
+        ),
+        (
+            lazy_fixture("load_mnist_model"),
+            lazy_fixture("load_mnist_images"),
+            {"layer_order": "top_down", "explain_func_kwargs": {"method": "Saliency"}},
+        ),
+        (
+            lazy_fixture("load_mnist_model_tf"),
+            lazy_fixture("load_mnist_images_tf"),
+            {
+                "layer_order": "independent",
+                "explain_func_kwargs": {"method": "VanillaGradients"},
+            },
+        ),
+    ],
+)
+def test_model_parameter_randomisation_n_jobs(
+    model: ModelInterface,
+    data: np.ndarray,
+    params: dict,
+):
+    x_batch, y_batch = data["x_batch"][:8], data["y_batch"][:8]
+    a_batch = explain(
+        model=model, inputs=x_batch, targets=y_batch, **params["explain_func_kwargs"]
+    )
+
+    scores = {}
+    for n_jobs in [None, 2]:
+        scores[n_jobs] = ModelParameterRandomisation(
+            layer_order=params["layer_order"],
+            n_jobs=n_jobs,
+            disable_warnings=True,
+        )(
+            model=model,
+            x_batch=x_batch,
+            y_batch=y_batch,
+            a_batch=a_batch,
+            explain_func=explain,
+            explain_func_kwargs=params["explain_func_kwargs"],
+        )
+
+    assert list(scores[None].keys()) == list(scores[2].keys()), "Test failed."
+    assert all(
+        np.allclose(scores[None][layer], scores[2][layer]) for layer in scores[None]
+    ), "Test failed."
+
+
 @pytest.mark.randomisation
 @pytest.mark.parametrize(
     "model,data,params,expected",
@@ -501,3 +556,23 @@ def test_random_logit(
     else:
         assert all(s > expected["min"] for s in scores), "Test failed."
         assert all(s < expected["max"] for s in scores), "Test failed."
+
+
+@pytest.mark.randomisation
+@pytest.mark.parametrize("num_classes,seed", [(2, 42), (10, 42), (10, 0), (1000, 7)])
+def test_random_logit_off_class_labels(num_classes: int, seed: int):
+    y_batch = np.arange(num_classes)
+
+    expected = []
+    for y in y_batch:
+        np.random.seed(seed)
+        expected.append(
+            np.random.choice([y_ for y_ in range(num_classes) if y_ != y])
+        )
+
+    y_off = RandomLogit(
+        num_classes=num_classes, seed=seed, disable_warnings=True
+    ).get_off_class_labels(y_batch=y_batch)
+
+    assert np.all(y_off != y_batch), "Test failed."
+    assert np.array_equal(y_off, expected), "Test failed."
@@ -245,3 +245,59 @@ def test_return_nan(
         explain_func=explain,
     )
     assert np.isnan(result).any(), "Test Failed"
+
+
+@pytest.mark.robustness
+@pytest.mark.parametrize(
+    "metric",
+    [RIS_CONSTRUCTOR, ROS_CONSTRUCTOR, RRS_CONSTRUCTOR],
+    ids=["RIS", "ROS", "RRS"],
+)
+def test_reference_prediction_once_per_batch(
+    metric, load_mnist_model_tf, load_mnist_images_tf, mocker
+):
+    from quantus.helpers.model.tf_model import TensorFlowModel
+
+    x_batch = load_mnist_images_tf["x_batch"]
+    y_batch = predict(load_mnist_model_tf, x_batch)
+
+    predict_spy = mocker.spy(TensorFlowModel, "predict")
+    metric()(
+        model=load_mnist_model_tf,
+        x_batch=x_batch,
+        y_batch=y_batch,
+        explain_func=explain,
+        batch_size=len(x_batch),
+    )
+    # One prediction on the unperturbed batch and one per perturbed sample.
+    assert predict_spy.call_count == 1 + 5, "Test Failed"
+
+
+@pytest.mark.robustness
+@pytest.mark.parametrize(
+    "metric",
+    [RIS_CONSTRUCTOR, ROS_CONSTRUCTOR, RRS_CONSTRUCTOR],
+    ids=["RIS", "ROS", "RRS"],
+)
+@pytest.mark.parametrize("perturbation_batch_size", [8, 1000])
+def test_stacked_sample_explanations(
+    metric, perturbation_batch_size, load_mnist_model, load_mnist_images
+):
+    x_batch = load_mnist_images["x_batch"]
+    y_batch = predict(load_mnist_model, x_batch)
+    call_kwargs = {
+        "explain_func": explain,
+        "explain_func_kwargs": {"method": "Saliency"},
+        "batch_size": 4,
+    }
+
+    np.random.seed(42)
+    result = metric(normalise=True)(
+        model=load_mnist_model, x_batch=x_batch, y_batch=y_batch, **call_kwargs
+    )
+    np.random.seed(42)
+    result_stacked = metric(
+        normalise=True, perturbation_batch_size=perturbation_batch_size
+    )(model=load_mnist_model, x_batch=x_batch, y_batch=y_batch, **call_kwargs)
+
+    assert np.allclose(result, result_stacked, equal_nan=True), "Test Failed"
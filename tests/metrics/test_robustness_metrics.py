@@ -6,6 +6,7 @@ import numpy as np
 from quantus.functions.explanation_func import explain
 from quantus.functions.discretise_func import floating_points, rank, sign, top_n_sign
 from quantus.helpers.model.model_interface import ModelInterface
+from quantus.helpers.model.pytorch_model import PyTorchModel
 from quantus.metrics.robustness import (
     AvgSensitivity,
     Consistency,
@@ -892,6 +893,75 @@ def test_consistency(
     assert (scores >= expected["min"]) & (scores <= expected["max"]), "Test failed."
 
 
+@pytest.mark.robustness
+@pytest.mark.parametrize(
+    "model,data,groups",
+    [
+        (
+            lazy_fixture("load_mnist_model"),
+            lazy_fixture("load_mnist_images"),
+            [0, 0, 0, 1, 1, 2, 3, 3],
+        ),
+        (
+            lazy_fixture("load_mnist_model"),
+            lazy_fixture("load_mnist_images"),
+            [0, 1, 2, 3, 4, 5, 6, 7],
+        ),
+    ],
+    ids=["groups", "unique labels"],
+)
+def test_consistency_groups(model: ModelInterface, data: dict, groups: list):
+    x_batch, y_batch = data["x_batch"], data["y_batch"]
+    groups = np.array(groups)
+
+    # Attributions with the same sign pattern share their discretised label.
+    rng = np.random.RandomState(42)
+    patterns = rng.choice([-1.0, 1.0], size=(groups.max() + 1, *x_batch.shape[1:]))
+    a_batch = patterns[groups] * rng.uniform(0.5, 1.0, size=x_batch.shape)
+
+    y_pred_classes = np.argmax(
+        PyTorchModel(model, channel_first=True).predict(x_batch), axis=1
+    )
+    expected = []
+    for i, group in enumerate(groups):
+        others = np.flatnonzero((groups == group) & (np.arange(len(groups)) != i))
+        expected.append(
+            np.mean(y_pred_classes[others] == y_pred_classes[i]) if len(others) else 0.0
+        )
+
+    scores = {}
+    for name, discretise_func in [("built-in", sign), ("custom", lambda a: sign(a))]:
+        metric = Consistency(
+            discretise_func=discretise_func,
+            abs=False,
+            normalise=False,
+            disable_warnings=True,
+        )
+        scores[name] = metric(
+            model=model, x_batch=x_batch, y_batch=y_batch, a_batch=a_batch
+        )
+    assert np.allclose(scores["built-in"], expected), "Test failed."
+    assert np.allclose(scores["custom"], expected), "Test failed."
+
+    # Direct calls without the group sizes compare the labels of all instances.
+    a_label_batch = np.array([sign(a) for a in a_batch.reshape(len(a_batch), -1)])
+    scores_instance = [
+        metric.evaluate_instance(
+            model=None,
+            x=x,
+            y=y,
+            a=a,
+            s=None,
+            i=i,
+            a_label=a_label_batch[i],
+            y_pred_classes=y_pred_classes,
+            a_label_batch=a_label_batch,
+        )
+        for i, (x, y, a) in enumerate(zip(x_batch, y_batch, a_batch))
+    ]
+    assert np.allclose(scores_instance, expected), "Test failed."
+
+
 @pytest.mark.robustness
 @pytest.mark.parametrize(
     "metric,model,data,params",
@@ -999,3 +1069,93 @@ def test_return_nan_when_prediction_changes_continuity(
         # Last element of scores is output logits, obviously they're not nan.
         for v in values[:-1]:
             assert np.isnan(v).any()
+
+
+@pytest.mark.robustness
+@pytest.mark.parametrize(
+    "metric",
+    [AvgSensitivity, LocalLipschitzEstimate, MaxSensitivity],
+)
+def test_reference_prediction_once_per_batch(
+    metric, load_mnist_model, load_mnist_images, mocker
+):
+    from quantus.helpers.model.pytorch_model import PyTorchModel
+
+    predict_spy = mocker.spy(PyTorchModel, "predict")
+    metric_instance = metric(
+        disable_warnings=True,
+        nr_samples=3,
+        return_nan_when_prediction_changes=True,
+    )
+    metric_instance(
+        load_mnist_model,
+        load_mnist_images["x_batch"],
+        load_mnist_images["y_batch"],
+        explain_func=explain,
+        explain_func_kwargs={
+            "method": "Saliency",
+        },
+        batch_size=len(load_mnist_images["x_batch"]),
+    )
+    # One prediction on the unperturbed batch and one per perturbed sample.
+    assert predict_spy.call_count == 1 + 3, "Test failed."
+
+
+@pytest.mark.robustness
+@pytest.mark.parametrize(
+    "metric,perturbation_batch_size",
+    [
+        (AvgSensitivity, 10),
+        (LocalLipschitzEstimate, 25),
+        (MaxSensitivity, 1000),
+    ],
+)
+def test_stacked_sample_explanations(
+    metric, perturbation_batch_size, load_mnist_model, load_mnist_images
+):
+    x_batch, y_batch = load_mnist_images["x_batch"], load_mnist_images["y_batch"]
+    call_kwargs = {
+        "explain_func": explain,
+        "explain_func_kwargs": {"method": "Saliency"},
+        "batch_size": 5,
+    }
+
+    np.random.seed(42)
+    scores = metric(nr_samples=4, normalise=True, disable_warnings=True)(
+        load_mnist_model, x_batch, y_batch, **call_kwargs
+    )
+    np.random.seed(42)
+    scores_stacked = metric(
+        nr_samples=4,
+        normalise=True,
+        disable_warnings=True,
+        perturbation_batch_size=perturbation_batch_size,
+    )(load_mnist_model, x_batch, y_batch, **call_kwargs)
+
+    assert np.allclose(scores, scores_stacked, atol=1e-5), "Test failed."
+
+
+@pytest.mark.robustness
+def test_estimate_cost_max_sensitivity(load_mnist_model, load_mnist_images):
+    x_batch, y_batch = load_mnist_images["x_batch"], load_mnist_images["y_batch"]
+    metric = MaxSensitivity(
+        disable_warnings=True,
+        nr_samples=3,
+        return_nan_when_prediction_changes=True,
+    )
+    call_kwargs = {
+        "explain_func": explain,
+        "explain_func_kwargs": {"method": "Saliency"},
+        "batch_size": 4,
+    }
+
+    # Each batch takes one prediction on the unperturbed batch and one per perturbed sample.
+    cost = metric.estimate_cost(
+        model=load_mnist_model, x_batch=x_batch, y_batch=y_batch, **call_kwargs
+    )
+    metric(load_mnist_model, x_batch, y_batch, **call_kwargs)
+
+    assert metric.ledger.report()["n_forward_passes"] == 2 * (1 + 3), "Test failed."
+    assert (
+        cost["n_forward_passes"] == metric.ledger.report()["n_forward_passes"]
+    ), "Test failed."
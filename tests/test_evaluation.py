@@ -3,11 +3,14 @@ from typing import Union
 import pytest
 from pytest_lazyfixture import lazy_fixture
 import numpy as np
-from quantus.evaluation import evaluate
+from quantus.evaluation import evaluate, evaluate_stream
+from quantus.functions.discretise_func import sign
 from quantus.functions.explanation_func import explain
+from quantus.helpers import utils
 
 from quantus.metrics.complexity import Sparseness
-from quantus.metrics.robustness import MaxSensitivity
+from quantus.metrics.faithfulness import FaithfulnessEstimate
+from quantus.metrics.robustness import Consistency, MaxSensitivity
 
 
 @pytest.mark.evaluate_func
@@ -167,3 +170,160 @@ def test_evaluate_func(
             ][list(eval(params["call_kwargs"]).keys())[0]]
             <= expected["max"]
         ), "Test failed."
+
+
+@pytest.mark.evaluate_func
+@pytest.mark.parametrize("stream", ["memmap", "batches"])
+def test_evaluate_stream(load_mnist_model, load_mnist_images, tmp_path, stream: str):
+    x_batch, y_batch = load_mnist_images["x_batch"], load_mnist_images["y_batch"]
+    a_batch = explain(
+        model=load_mnist_model, inputs=x_batch, targets=y_batch, method="Saliency"
+    )
+    metrics = {
+        "Sparseness": Sparseness(disable_warnings=True),
+        "FaithfulnessEstimate": FaithfulnessEstimate(
+            features_in_step=28, perturb_baseline="black", disable_warnings=True
+        ),
+    }
+
+    if stream == "memmap":
+        np.save(tmp_path / "x_batch.npy", x_batch)
+        data = {"x_batch": str(tmp_path / "x_batch.npy"), "y_batch": y_batch}
+    else:
+        data = [
+            (x_batch[start : start + 3], y_batch[start : start + 3])
+            for start in range(0, len(x_batch), 3)
+        ]
+
+    expected = evaluate(
+        metrics=metrics,
+        xai_methods={"Saliency": a_batch},
+        model=load_mnist_model,
+        x_batch=x_batch,
+        y_batch=y_batch,
+    )
+    results = evaluate_stream(
+        metrics=metrics,
+        xai_methods={"Saliency": a_batch},
+        model=load_mnist_model,
+        data=data,
+        chunk_size=3,
+    )
+
+    for metric in metrics:
+        assert np.allclose(
+            results["Saliency"][metric]["call_kwargs_empty"],
+            expected["Saliency"][metric]["call_kwargs_empty"],
+        ), "Test failed."
+        assert len(metrics[metric].all_evaluation_scores) == 2, "Test failed."
+
+    with pytest.raises(TypeError):
+        evaluate_stream(
+            metrics=metrics,
+            xai_methods={"Saliency": a_batch},
+            model=load_mnist_model,
+            data=iter(data),
+        )
+
+
+@pytest.mark.evaluate_func
+def test_evaluate_stream_checkpoint(load_mnist_model, load_mnist_images, tmp_path):
+    x_batch, y_batch = load_mnist_images["x_batch"], load_mnist_images["y_batch"]
+    a_batch = explain(
+        model=load_mnist_model, inputs=x_batch, targets=y_batch, method="Saliency"
+    )
+    data = [
+        (x_batch[start : start + 2], y_batch[start : start + 2], a_batch[start : start + 2])
+        for start in range(0, 8, 2)
+    ]
+    call_kwargs = {
+        "explain_func": explain,
+        "explain_func_kwargs": {"method": "Saliency"},
+    }
+
+    def interrupted(n_chunks: int):
+        yield from data[:n_chunks]
+        raise KeyboardInterrupt
+
+    metric = MaxSensitivity(nr_samples=3, disable_warnings=True)
+    np.random.seed(42)
+    expected = metric.evaluate_stream(model=load_mnist_model, data=data, **call_kwargs)
+
+    checkpoint_path = tmp_path / "checkpoint.pkl"
+    np.random.seed(42)
+    with pytest.raises(KeyboardInterrupt):
+        metric.evaluate_stream(
+            model=load_mnist_model,
+            data=interrupted(3),
+            checkpoint_path=checkpoint_path,
+            **call_kwargs,
+        )
+    assert checkpoint_path.exists(), "Test failed."
+
+    # The resumed evaluation skips the saved chunks and continues their random state.
+    np.random.seed(0)
+    scores = metric.evaluate_stream(
+        model=load_mnist_model,
+        data=data,
+        checkpoint_path=checkpoint_path,
+        **call_kwargs,
+    )
+    assert np.allclose(scores, expected), "Test failed."
+
+    # A completed evaluation is returned from the checkpoint.
+    assert (
+        metric.evaluate_stream(
+            model=None, data=[], checkpoint_path=checkpoint_path, **call_kwargs
+        )
+        == scores
+    ), "Test failed."
+
+    # If all chunks were saved but not the final scores, the last chunk is evaluated anew from its
+    # saved random state.
+    checkpoint = utils.load_checkpoint(path=checkpoint_path)
+    checkpoint["evaluation_scores"] = None
+    utils.save_checkpoint(path=checkpoint_path, checkpoint=checkpoint)
+    np.random.seed(0)
+    scores = metric.evaluate_stream(
+        model=load_mnist_model,
+        data=data,
+        checkpoint_path=checkpoint_path,
+        **call_kwargs,
+    )
+    assert np.allclose(scores, expected), "Test failed."
+
+
+@pytest.mark.evaluate_func
+def test_evaluate_checkpoint_dir(load_mnist_model, load_mnist_images, tmp_path):
+    x_batch, y_batch = load_mnist_images["x_batch"], load_mnist_images["y_batch"]
+    a_batch = explain(
+        model=load_mnist_model, inputs=x_batch, targets=y_batch, method="Saliency"
+    )
+    kwargs = {
+        "metrics": {"Consistency": Consistency(disable_warnings=True)},
+        "xai_methods": {"Saliency": a_batch},
+        "model": load_mnist_model,
+        "x_batch": x_batch,
+        "y_batch": y_batch,
+    }
+
+    # Consistency relates the instances to each other, the checkpointed call evaluates them together.
+    expected = evaluate(**kwargs)
+    results = evaluate(checkpoint_dir=str(tmp_path), **kwargs)
+    assert np.allclose(
+        results["Saliency"]["Consistency"]["call_kwargs_empty"],
+        expected["Saliency"]["Consistency"]["call_kwargs_empty"],
+    ), "Test failed."
+
+    # A completed evaluation is returned from its checkpoint.
+    assert len(list(tmp_path.iterdir())) == 1, "Test failed."
+    assert evaluate(checkpoint_dir=str(tmp_path), **kwargs) == results, "Test failed."
+
+    # A checkpoint of another run is not returned.
+    for run_kwargs in [
+        {"x_batch": x_batch[::-1].copy()},
+        {"x_batch": x_batch[:4], "y_batch": y_batch[:4], "xai_methods": {"Saliency": a_batch[:4]}},
+        {"metrics": {"Consistency": Consistency(discretise_func=sign, disable_warnings=True)}},
+    ]:
+        with pytest.raises(ValueError):
+            evaluate(checkpoint_dir=str(tmp_path), **{**kwargs, **run_kwargs})